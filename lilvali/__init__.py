@@ -1,15 +1,30 @@
 from .validate import (
     validate,
     validator,
+    strip,
+    stripped,
+    defer,
+    deferred,
     ValidatorFunction,
     TypeValidator,
 )
-from . import errors
+from .binding import Format, Shape, Range
+from . import errors, ingest, metrics, trace
 
 __all__ = [
     "validate",
     "validator",
+    "strip",
+    "stripped",
+    "defer",
+    "deferred",
     "TypeValidator",
     "ValidatorFunction",
+    "Format",
+    "Shape",
+    "Range",
     "errors",
+    "ingest",
+    "metrics",
+    "trace",
 ]
@@ -1,9 +1,58 @@
+import argparse, sys
+
 from . import *
 
 
-def main():
-    pass
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="lilvali")
+    # a bare `lilvali` prints the help and succeeds, the pre-push hook runs it
+    parser.set_defaults(print_help=parser.print_help)
+    commands = parser.add_subparsers(dest="command")
+
+    bench = commands.add_parser(
+        "bench", help="Benchmark validated functions against undecorated ones."
+    )
+    bench.add_argument(
+        "scenario", nargs="*", help="Scenarios to run, all of them by default."
+    )
+    bench.add_argument("--json", help="Write the results to this file.")
+    bench.add_argument("--baseline", help="Compare against results saved with --json.")
+    bench.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Allowed relative growth of an overhead ratio over the baseline.",
+    )
+    bench.add_argument("--number", type=int, help="Calls per timing, auto by default.")
+    bench.add_argument("--repeat", type=int, default=5, help="Timings per scenario.")
+
+    stats = commands.add_parser(
+        "stats", help="Run a script with validation metrics on and print them."
+    )
+    stats.add_argument("--json", help="Write the metrics to this file.")
+    stats.add_argument("script", help="The Python script to run.")
+    stats.add_argument(
+        "args", nargs=argparse.REMAINDER, help="Arguments of the script."
+    )
+
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if args.command is None:
+        args.print_help()
+        return 0
+    elif args.command == "bench":
+        from . import bench
+
+        return bench.main(args)
+    elif args.command == "stats":
+        from . import metrics
+
+        return metrics.main(args)
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,366 @@
+"""Benchmarks of validated functions against their undecorated counterparts.
+
+```bash
+$ lilvali bench --json results.json
+$ lilvali bench --baseline results.json  # exits 1 if any overhead regressed
+```
+"""
+import dataclasses, json, platform, timeit, typing
+from array import array
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from functools import cache
+from typing import (
+    Annotated,
+    Callable,
+    Iterable,
+    Optional,
+)
+
+
+from . import ingest
+from .binding import Format, Shape, Range
+from .errors import ValidationError
+from .validate import validate, validator, strip, stripped, defer, deferred
+
+
+# A scenario builds an undecorated function, its validated twin and the args to call with.
+SCENARIOS: dict[str, Callable[[], tuple[Callable, Callable, tuple]]] = {}
+
+
+def scenario(name: str):
+    """Register a scenario builder under `name`."""
+
+    def register(build):
+        SCENARIOS[name] = build
+        return build
+
+    return register
+
+
+@scenario("scalar")
+def _scalar():
+    def f(a: int, b: str, c: float) -> int:
+        return a
+
+    return f, validate(f), (1, "b", 1.0)
+
+
+@scenario("generic")
+def _generic():
+    def f[T: (int, float)](x: T, y: T) -> T:
+        return x
+
+    return f, validate(f), (1, 2)
+
+
+@scenario("union")
+def _union():
+    def f(a: int | str | None | list[int]) -> int | str | None | list[int]:
+        return a
+
+    return f, validate(f), ([1, 2, 3],)
+
+
+def _nested(n: int):
+    def build():
+        def f(records: list[dict[str, list[int]]]) -> int:
+            return len(records)
+
+        records = [{"a": [1, 2], "b": [3]} for _ in range(n)]
+        return f, validate(f), (records,)
+
+    return build
+
+
+for _n in (10, 1_000, 100_000):
+    scenario(f"nested[{_n}]")(_nested(_n))
+
+
+type JSON = dict[str, JSON] | list[JSON] | str | int | float | bool | None
+
+
+def _json(doc, config: Optional[dict] = None):
+    def build():
+        def f(doc: JSON) -> int:
+            return 0
+
+        return f, validate(f, config=config), (doc,)
+
+    return build
+
+
+_WIDE = [
+    {"id": i, "name": "n", "tags": ["a", "b"], "score": 0.5, "meta": {"ok": True}}
+    for i in range(1_000)
+]
+_DEEP = 0
+for _i in range(5_000):
+    _DEEP = [_DEEP] if _i % 2 else {"k": _DEEP}
+
+scenario("json[wide]")(_json(_WIDE))
+scenario("json[wide,iterative]")(_json(_WIDE, {"iterative": True}))
+# too deep for the recursive engine
+scenario("json[deep,iterative]")(_json(_DEEP, {"iterative": True}))
+
+
+@scenario("abc")
+def _abc():
+    def f(a: Sequence[int], b: Mapping[str, float]) -> Sequence[int]:
+        return a
+
+    return f, validate(f), (list(range(10)), {"a": 1.0, "b": 2.0})
+
+
+def _buffer(*constraints):
+    def build():
+        def f(points: memoryview) -> int:
+            return len(points)
+
+        def g(points: Annotated[memoryview, *constraints]) -> int:
+            return len(points)
+
+        points = (
+            memoryview(array("d", bytes(8 * 30_000))).cast("B").cast("d", (10_000, 3))
+        )
+        return f, validate(g), (points,)
+
+    return build
+
+
+scenario("buffer")(_buffer(Format("d"), Shape(..., 3)))
+# reads the elements, vectorized by NumPy if it's installed
+scenario("buffer[range]")(_buffer(Format("d"), Shape(..., 3), Range(0, 1)))
+
+
+@scenario("validator")
+def _validator():
+    def is_even(arg):
+        return arg % 2 == 0
+
+    def f(a: int, b: int) -> int:
+        return a
+
+    def g(a: validator(is_even), b: validator(is_even)) -> int:
+        return a
+
+    return f, validate(g), (2, 4)
+
+
+@scenario("dataclass")
+def _dataclass():
+    def make():
+        @dataclass
+        class Point:
+            x: int
+            y: int
+            label: str = ""
+
+        return Point
+
+    return make(), validate(make()), (1, 2, "p")
+
+
+@scenario("stripped")
+def _stripped():
+    was = stripped()
+    strip()
+    try:
+
+        @validate
+        def g(a: validator(lambda a: a > 0), b: str, c: float) -> int:
+            return a
+
+    finally:
+        strip(was)
+
+    def f(a: int, b: str, c: float) -> int:
+        return a
+
+    return f, g, (1, "b", 1.0)
+
+
+@cache
+def _hints(cls: type) -> dict:
+    return typing.get_type_hints(cls)
+
+
+def _from_dict(cls: type, value: dict):
+    """A type hint driven dict to dataclass conversion, like dataclass_wizard's `from_dict`."""
+    return cls(**{k: _convert(_hints(cls)[k], v) for k, v in value.items()})
+
+
+def _convert(hint, value):
+    if dataclasses.is_dataclass(hint):
+        return _from_dict(hint, value)
+
+    origin, args = typing.get_origin(hint), typing.get_args(hint)
+    if origin is list:
+        return [_convert(args[0], v) for v in value]
+    elif origin is dict:
+        return {k: _convert(args[1], v) for k, v in value.items()}
+    return value
+
+
+def _ingest(bad_at: Optional[int] = None):
+    """Records of a multi-MB document, decoded then converted then validated (the plain
+    pipeline) against `ingest.loads`, optionally with an invalid record at `bad_at`."""
+
+    def build():
+        @validate
+        @dataclass
+        class Tag:
+            name: str
+            weight: float = 1.0
+
+        @validate
+        @dataclass
+        class Record:
+            id: int
+            name: str
+            tags: list[Tag]
+            scores: dict[str, int]
+
+        records = [
+            {
+                "id": i,
+                "name": f"record {i}",
+                "tags": [{"name": "a", "weight": 0.5}, {"name": "b"}],
+                "scores": {"x": i, "y": 2},
+            }
+            for i in range(20_000)
+        ]
+        if bad_at is not None:
+            records[bad_at]["tags"][0]["name"] = 0
+        payload = json.dumps(records).encode()
+
+        def pipeline(payload):
+            try:
+                return [_from_dict(Record, r) for r in json.loads(payload)]
+            except ValidationError:
+                pass
+
+        def loads(payload):
+            try:
+                return ingest.loads(payload, list[Record])
+            except ValidationError:
+                pass
+
+        return pipeline, loads, (payload,)
+
+    return build
+
+
+scenario("ingest[records]")(_ingest())
+scenario("ingest[records,invalid]")(_ingest(bad_at=100))
+
+
+def _import(n: int, lazy: bool = False):
+    """Executing the body of a module defining `n` functions, as importing it would."""
+
+    def build():
+        source = "\n".join(
+            f"@validate\ndef f{i}[T](a: int, b: list[str], *args: T, c: dict[str, int] | None = None) -> T:\n    return b\n"
+            for i in range(n)
+        )
+        plain = compile(source.replace("@validate\n", ""), "<plain>", "exec")
+        validated = compile(source, "<validated>", "exec")
+
+        def load_plain():
+            exec(plain, {})
+
+        def load_validated():
+            was = deferred()
+            defer(lazy)
+            try:
+                exec(validated, {"validate": validate})
+            finally:
+                defer(was)
+
+        return load_plain, load_validated, ()
+
+    return build
+
+
+scenario("import[10000]")(_import(10_000))
+scenario("import[10000,lazy]")(_import(10_000, lazy=True))
+
+
+def _per_call(fn: Callable, args: tuple, number: Optional[int], repeat: int) -> float:
+    timer = timeit.Timer(lambda: fn(*args))
+    if number is None:
+        number, _ = timer.autorange()
+    return min(timer.repeat(repeat, number)) / number
+
+
+def run(
+    names: Optional[Iterable[str]] = None,
+    number: Optional[int] = None,
+    repeat: int = 5,
+) -> dict:
+    """Time each scenario, undecorated and validated, in seconds per call.
+
+    `number` calls are timed `repeat` times, by default enough calls for 0.2s.
+    """
+    results = {}
+    for name in names or SCENARIOS:
+        plain, validated, args = SCENARIOS[name]()
+        base = _per_call(plain, args, number, repeat)
+        t = _per_call(validated, args, number, repeat)
+        results[name] = {"plain": base, "validated": t, "overhead": t / base}
+
+    return {"python": platform.python_version(), "results": results}
+
+
+def compare(report: dict, baseline: dict, tolerance: float = 0.25) -> dict:
+    """Scenarios whose overhead ratio grew by more than `tolerance` over the baseline.
+
+    Ratios are compared rather than times, so baselines carry across machines reasonably.
+    """
+    regressions = {}
+    for name, result in report["results"].items():
+        before = baseline["results"].get(name)
+        if before is not None and result["overhead"] > before["overhead"] * (
+            1 + tolerance
+        ):
+            regressions[name] = (before["overhead"], result["overhead"])
+
+    return regressions
+
+
+def format_report(report: dict) -> str:
+    width = max([16, *map(len, report["results"])])
+    lines = [f"{'scenario':<{width}} {'plain':>10} {'validated':>10} {'overhead':>9}"]
+    for name, r in report["results"].items():
+        lines.append(
+            f"{name:<{width}} {r['plain'] * 1e6:8.2f}us {r['validated'] * 1e6:8.2f}us {r['overhead']:8.1f}x"
+        )
+    return "\n".join(lines)
+
+
+def main(args) -> int:
+    """Entry point of `lilvali bench`, see `lilvali bench --help`."""
+    names = args.scenario or None
+    unknown = set(names or ()) - SCENARIOS.keys()
+    if unknown:
+        print(f"Unknown scenarios {sorted(unknown)}, choose from {list(SCENARIOS)}")
+        return 2
+
+    report = run(names, number=args.number, repeat=args.repeat)
+    print(format_report(report))
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+        regressions = compare(report, baseline, args.tolerance)
+        for name, (before, after) in regressions.items():
+            print(f"REGRESSION {name}: {before:.1f}x -> {after:.1f}x")
+        if regressions:
+            return 1
+
+    return 0
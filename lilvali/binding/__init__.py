@@ -1,7 +1,20 @@
 from ..errors import BindingError, InvalidType, ValidationError
 
+from .buffers import Format, Shape, Range
 from .checker import BindChecker
+from .compiler import BindCompiler
 from .config import BindCheckerConfig
-from .struct import GenericBinding, GenericBindings
+from .result import Failure, raise_failure
+from .struct import GenericBindings
 
-__all__ = ["BindChecker", "BindCheckerConfig", "GenericBinding", "GenericBindings"]
+__all__ = [
+    "BindChecker",
+    "BindCompiler",
+    "BindCheckerConfig",
+    "Failure",
+    "raise_failure",
+    "GenericBindings",
+    "Format",
+    "Shape",
+    "Range",
+]
@@ -0,0 +1,285 @@
+"""Constraints on buffers and arrays, checked from their metadata without copying them.
+
+```python
+from typing import Annotated
+from lilvali import Format, Shape, Range
+
+@validate
+def centroid(points: Annotated[memoryview, Format("d"), Shape(..., 3)]): ...
+
+@validate
+def blend(image: Annotated[np.ndarray, Format("float32"), Shape(None, None, 3), Range(0, 1)]): ...
+```
+
+Buffers like `bytes`, `bytearray`, `memoryview` and `array.array` report their struct format
+and shape through a `memoryview`, arrays with a `dtype` and a `shape` like NumPy's report
+those. `Format` and `Shape` only look at that, so they cost the same for any size. `Range`
+reads the elements, vectorized by NumPy when it's installed.
+"""
+import array, math
+from functools import cache
+from typing import Any
+
+
+from ..errors import *
+
+
+# Classes known to be buffers without a `dtype`, they skip the attribute lookup.
+_BUFFERS = frozenset({bytes, bytearray, memoryview, array.array})
+
+# Struct formats of floats, whose NaNs min and max don't see.
+_FLOATS = frozenset({"e", "f", "d"})
+
+# Bounds the dtypes a Format remembers its verdict for.
+_MAX_DTYPES = 64
+
+
+@cache
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def layout(arg) -> tuple[Any, tuple[int, ...]] | None:
+    """The element format and the shape of a buffer or array, None if `arg` is neither.
+
+    Buffers report their struct format, like "d", arrays their dtype. Nothing is copied.
+    """
+    if type(arg) not in _BUFFERS:
+        dtype = getattr(arg, "dtype", None)
+        if dtype is not None and (shape := getattr(arg, "shape", None)) is not None:
+            return dtype, tuple(shape)
+
+    try:
+        view = memoryview(arg)
+    except (TypeError, ValueError):
+        return None
+    return view.format, view.shape
+
+
+class BufferConstraint:
+    """`Annotated` metadata checked against the layout of a buffer or array."""
+
+    __slots__ = ()
+
+    # Raised when the constraint fails.
+    error = ValidationError
+
+    def failure(self, arg, format_, shape: tuple[int, ...]) -> str | None:
+        """Why `arg`, of format `format_` and shape `shape`, fails, None if it doesn't."""
+        raise NotImplementedError
+
+    def _key(self) -> tuple:
+        raise NotImplementedError
+
+    def __eq__(self, other):
+        return type(other) is type(self) and other._key() == self._key()
+
+    def __hash__(self):
+        return hash((type(self), self._key()))
+
+    def __repr__(self):
+        args = ", ".join("..." if a is Ellipsis else repr(a) for a in self._key())
+        return f"{type(self).__name__}({args})"
+
+
+class Format(BufferConstraint):
+    """The elements are of one of `formats`.
+
+    Struct format codes like "d" match buffers, native byte order is implied. Arrays match a
+    format their dtype compares equal to, like "d", "float64" or `np.float64`.
+    """
+
+    __slots__ = ("formats", "codes", "dtypes")
+
+    error = InvalidType
+
+    def __init__(self, *formats):
+        if not formats:
+            raise ValueError("Format needs at least one format")
+        self.formats = formats
+        self.codes = frozenset(f.lstrip("@") for f in formats if isinstance(f, str))
+        # verdicts of the dtypes seen so far, dtypes are hashable and immutable
+        self.dtypes = {}
+
+    def _key(self) -> tuple:
+        return self.formats
+
+    def failure(self, arg, format_, shape):
+        if isinstance(format_, str):
+            if format_.lstrip("@") in self.codes:
+                return None
+        elif self._matches_dtype(format_):
+            return None
+        return (
+            f"{type(arg).__name__} of format {format_!s} is not one of {self.formats}"
+        )
+
+    def _matches_dtype(self, dtype) -> bool:
+        try:
+            return self.dtypes[dtype]
+        except KeyError:
+            pass
+        except TypeError:
+            return self._compare_dtype(dtype)
+
+        verdict = self._compare_dtype(dtype)
+        if len(self.dtypes) < _MAX_DTYPES:
+            self.dtypes[dtype] = verdict
+        return verdict
+
+    def _compare_dtype(self, dtype) -> bool:
+        for f in self.formats:
+            try:
+                if dtype == f:
+                    return True
+            except (TypeError, ValueError):
+                pass
+        return False
+
+
+class Shape(BufferConstraint):
+    """The shape matches `dims`.
+
+    A dimension is a size, None for any size, or `...` once for any number of dimensions:
+    `Shape(..., 3)` matches `(3,)`, `(10, 3)` and `(2, 5, 3)`.
+    """
+
+    __slots__ = ("dims", "ndim", "variadic", "sizes")
+
+    error = InvalidType
+
+    def __init__(self, *dims):
+        for d in dims:
+            if (
+                d is not None
+                and d is not Ellipsis
+                and not (isinstance(d, int) and d >= 0)
+            ):
+                raise ValueError(f"{d!r} is not a dimension of a Shape")
+        if dims.count(Ellipsis) > 1:
+            raise ValueError("A Shape takes at most one `...`")
+
+        self.dims = dims
+        self.variadic = Ellipsis in dims
+        self.ndim = len(dims) - self.variadic
+
+        # the (index, size) pairs to compare, dimensions after `...` index from the end
+        at = dims.index(Ellipsis) if self.variadic else len(dims)
+        self.sizes = tuple((i, d) for i, d in enumerate(dims[:at]) if d is not None)
+        self.sizes += tuple(
+            (i - len(dims), d) for i, d in enumerate(dims) if i > at and d is not None
+        )
+
+    def _key(self) -> tuple:
+        return self.dims
+
+    def failure(self, arg, format_, shape):
+        ndim = len(shape)
+        valid = ndim >= self.ndim if self.variadic else ndim == self.ndim
+        if valid:
+            for i, size in self.sizes:
+                if shape[i] != size:
+                    valid = False
+                    break
+
+        if not valid:
+            return f"{type(arg).__name__} of shape {shape} doesn't match {self!r}"
+
+
+class Range(BufferConstraint):
+    """All elements are within `[lo, hi]`, either bound can be None.
+
+    Elements are read once, by NumPy's min and max when it's installed, without copying
+    buffers. NaNs are out of any range.
+    """
+
+    __slots__ = ("lo", "hi")
+
+    def __init__(self, lo=None, hi=None):
+        if lo is not None and hi is not None and lo > hi:
+            raise ValueError(f"Empty Range({lo!r}, {hi!r})")
+        self.lo, self.hi = lo, hi
+
+    def _key(self) -> tuple:
+        return self.lo, self.hi
+
+    def failure(self, arg, format_, shape):
+        lo, hi = self.lo, self.hi
+        if lo is None and hi is None:
+            return None
+
+        try:
+            extrema = _extrema(arg)
+        except (TypeError, ValueError, NotImplementedError) as e:
+            return f"The elements of {type(arg).__name__} can't be read: {e}"
+        if extrema is None:
+            return None
+
+        least, most = extrema
+        if (lo is not None and not lo <= least) or (hi is not None and not most <= hi):
+            return f"{type(arg).__name__} has elements in [{least}, {most}], out of {self!r}"
+
+
+def _extrema(arg) -> tuple | None:
+    """The least and the most element of a buffer or array, None if it's empty.
+
+    Either is NaN if any element is.
+    """
+    numpy = _numpy()
+    if numpy is not None:
+        values = numpy.asarray(memoryview(arg) if type(arg) in _BUFFERS else arg)
+        if values.size == 0:
+            return None
+        return values.min(), values.max()
+
+    view = memoryview(arg)
+    if view.ndim == 0:
+        flat = [view.tolist()]
+    elif view.ndim == 1:
+        flat = view
+    elif view.c_contiguous:
+        flat = view.cast("B").cast(view.format)
+    else:
+        flat = list(_flatten(view.tolist(), view.ndim))
+
+    if not len(flat):
+        return None
+    least, most = min(flat), max(flat)
+    # min and max skip NaNs, but a sum carries them
+    if view.format.lstrip("@") in _FLOATS and math.isnan(sum(flat)):
+        if any(math.isnan(v) for v in flat):
+            return math.nan, math.nan
+    return least, most
+
+
+def _flatten(nested: list, ndim: int):
+    if ndim == 1:
+        yield from nested
+    else:
+        for sub in nested:
+            yield from _flatten(sub, ndim - 1)
+
+
+def constraints_of(metadata: tuple) -> tuple[BufferConstraint, ...]:
+    """The buffer constraints among the metadata of an `Annotated`, others are ignored."""
+    return tuple(m for m in metadata if isinstance(m, BufferConstraint))
+
+
+def buffer_failure(constraints: tuple, arg) -> tuple[type, str] | None:
+    """The error and message of the first of `constraints` failed by `arg`, if any."""
+    if not constraints:
+        return None
+
+    found = layout(arg)
+    if found is None:
+        return InvalidType, f"{type(arg).__name__} is not a buffer or an array"
+
+    format_, shape = found
+    for constraint in constraints:
+        if (message := constraint.failure(arg, format_, shape)) is not None:
+            return constraint.error, message
+    return None
@@ -0,0 +1,195 @@
+import abc
+
+
+# isinstance implementations whose answer only depends on the argument's type.
+_TYPE_ONLY_INSTANCECHECKS = (type.__instancecheck__, abc.ABCMeta.__instancecheck__)
+
+# Immutable types whose equal instances of the same exact type always validate alike.
+# Floats are left out, -0.0 == 0.0.
+_ATOMS = frozenset({str, bytes, int, bool, type(None)})
+
+# Tuples and frozensets with more elements than this aren't worth keying.
+_MAX_KEY_ELEMENTS = 64
+
+# Bounds the concrete classes remembered per ABC.
+_MAX_ABC_MEMBERS = 256
+
+# Bounds the argument types a Union remembers candidate members for.
+_MAX_UNION_INDEX = 256
+
+
+class VerdictCache:
+    """Bounded LRU cache of check verdicts.
+
+    Checkers keep the verdicts of leaf annotations keyed on (annotation, exact argument
+    type) in one, and with `value_cache_size` the values that passed in another.
+
+    Lock-free: concurrent updates can at worst turn a hit into a miss. ABC registrations
+    change `abc.get_cache_token()`, which drops every cached verdict.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self.hits = self.misses = self.evictions = 0
+
+        self._data = {}
+        self._token = abc.get_cache_token()
+
+    def get(self, key):
+        if self._token != abc.get_cache_token():
+            self.clear()
+
+        try:
+            # dicts keep insertion order, re-inserting makes this the most recent entry
+            verdict = self._data[key] = self._data.pop(key)
+        except KeyError:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return verdict
+
+    def put(self, key, verdict):
+        if not self.maxsize:
+            return
+
+        data = self._data
+        data[key] = verdict
+        while len(data) > self.maxsize:
+            try:
+                del data[next(iter(data))]
+                self.evictions += 1
+            except (KeyError, RuntimeError, StopIteration):
+                break
+
+    def clear(self):
+        self._data = {}
+        self._token = abc.get_cache_token()
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+        }
+
+
+class AbcMembership:
+    """Which concrete classes are instances of an ABC, remembered per class.
+
+    isinstance against an ABC goes through `ABCMeta.__instancecheck__`, several times the
+    cost of a dict lookup. Members can't be unregistered, so only the classes found not to
+    be members are forgotten when `abc.get_cache_token()` changes.
+    """
+
+    __slots__ = ("abc", "members", "_token")
+
+    def __init__(self, abc_: type):
+        self.abc = abc_
+        # concrete class -> bool, checkers can look members up themselves
+        self.members = {}
+        self._token = abc.get_cache_token()
+
+    def __call__(self, arg) -> bool:
+        cls = type(arg)
+        found = self.members.get(cls)
+        if found is True:
+            return True
+        if arg.__class__ is not cls:
+            # a proxy, isinstance also looks at its __class__
+            return isinstance(arg, self.abc)
+
+        if found is None or self._token != abc.get_cache_token():
+            found = self._resolve(cls)
+        return found
+
+    def _resolve(self, cls: type) -> bool:
+        members = self.members
+        if self._token != abc.get_cache_token():
+            # cleared in place, checkers hold on to the dict
+            for c in [c for c, member in members.items() if not member]:
+                members.pop(c, None)
+            self._token = abc.get_cache_token()
+
+        found = issubclass(cls, self.abc)
+        if len(members) < _MAX_ABC_MEMBERS:
+            members[cls] = found
+        return found
+
+
+class UnionIndex:
+    """The members of a Union an argument could possibly bind to, remembered per class.
+
+    `filters` holds the classes an argument must subclass to bind to each member, None if
+    unknown. ABC registrations change `abc.get_cache_token()`, which drops the index.
+    """
+
+    __slots__ = ("members", "filters", "index", "_token")
+
+    def __init__(self, members: tuple, filters: tuple):
+        self.members, self.filters = members, filters
+        self.index = {}
+        self._token = abc.get_cache_token()
+
+    def __call__(self, arg) -> tuple:
+        cls = type(arg)
+        if arg.__class__ is not cls:
+            # a proxy, isinstance also looks at its __class__
+            return self.members
+
+        if self._token != abc.get_cache_token():
+            self.index = {}
+            self._token = abc.get_cache_token()
+
+        found = self.index.get(cls)
+        if found is None:
+            found = tuple(
+                member
+                for member, f in zip(self.members, self.filters)
+                if f is None or issubclass(cls, f)
+            )
+            if len(self.index) < _MAX_UNION_INDEX:
+                self.index[cls] = found
+        return found
+
+
+# The membership of each ABC used in a parametrized annotation.
+_memberships = {}
+
+
+def abc_membership(abc_: type) -> AbcMembership:
+    """The shared membership cache of `abc_`, it doesn't depend on any config."""
+    found = _memberships.get(abc_)
+    if found is None:
+        found = _memberships[abc_] = AbcMembership(abc_)
+    return found
+
+
+def type_determines_instance(ann) -> bool:
+    """True if `isinstance(arg, ann)` only depends on `type(arg)`.
+
+    Runtime protocols look at the instance's attributes, so their verdicts aren't cached.
+    """
+    return type(ann).__instancecheck__ in _TYPE_ONLY_INSTANCECHECKS
+
+
+def value_key(arg):
+    """A hashable key standing for the immutable `arg` in a value cache, None if it has none.
+
+    Keys carry the exact type of every element, so `1`, `True` and `(1,)`, `(True,)` differ.
+    """
+    cls = type(arg)
+    if cls in _ATOMS:
+        return (cls, arg)
+
+    if (cls is tuple or cls is frozenset) and len(arg) <= _MAX_KEY_ELEMENTS:
+        keys = []
+        for e in arg:
+            if (key := value_key(e)) is None:
+                return None
+            keys.append(key)
+        return (cls, tuple(keys) if cls is tuple else frozenset(keys))
+
+    return None
@@ -1,6 +1,7 @@
 from dataclasses import dataclass, field
 from functools import singledispatchmethod
-import types, typing, logging
+import abc, collections, inspect, types, typing, logging
+from collections.abc import Collection, Iterable, Mapping
 from typing import (
     Any,
     Callable,
@@ -8,29 +9,150 @@ from typing import (
 
 
 from ..errors import *
-from .struct import GenericBindings
+from .buffers import buffer_failure, constraints_of
+from .struct import GenericBindings, allocate_slot
+from .cache import VerdictCache, type_determines_instance
 from .config import BindCheckerConfig
+from .sampling import ElementBudget
+from .stream import stream_origin, reiterable
 
 
 log = logging.getLogger(__name__)
 
+# Leaf verdicts, what a (annotation, argument type) pair resolves to.
+VALID, INVALID, CUSTOM, STRICT_ANY = "valid", "invalid", "custom", "strict_any"
+
+# What is checked of a parametrized collection beyond list, dict, tuple and set, see
+# `collection_origin`.
+MAPPING_ORIGIN, COLLECTION_ORIGIN, INSTANCE_ORIGIN = "mapping", "collection", "instance"
+
+# Concrete classes, besides list, dict, tuple and set, whose type parameters are their
+# elements or items.
+_ELEMENT_ORIGINS = frozenset(
+    {frozenset, collections.deque, collections.ChainMap, types.MappingProxyType}
+)
+
+
+def collection_origin(origin: type, nargs: int) -> str | None:
+    """How instances of a parametrized `origin` are checked, None if they aren't.
+
+    Mappings check their items and collections their elements, only for `collections.abc`
+    and the stdlib classes whose parameters are known to be those. Other ABCs, like
+    `Container[int]` or user generics subclassing `Mapping`, only check the instance.
+    Protocols aren't checked.
+    """
+    if getattr(origin, "_is_protocol", False):
+        return None
+    elif origin.__module__ == "collections.abc" or origin in _ELEMENT_ORIGINS:
+        if issubclass(origin, Mapping) and nargs == 2:
+            return MAPPING_ORIGIN
+        elif issubclass(origin, Collection) and nargs == 1:
+            return COLLECTION_ORIGIN
+    if isinstance(origin, abc.ABCMeta):
+        return INSTANCE_ORIGIN
+    return None
+
+
+def variadic_tuple(args: tuple) -> bool:
+    """True for the arguments of `tuple[X, ...]`."""
+    return len(args) == 2 and args[1] is Ellipsis
+
+
+def takes_binds(handler) -> bool:
+    """True if `handler` takes the binding context, as `(self, ann, arg, binds)`.
+
+    Handlers written before per-call bindings take `(self, ann, arg)`.
+    """
+    try:
+        params = inspect.signature(handler).parameters.values()
+    except (TypeError, ValueError):
+        return True
+    positional = 0
+    for p in params:
+        if p.kind is p.VAR_POSITIONAL:
+            return True
+        if p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD):
+            positional += 1
+    return positional >= 4
+
+
+def typevars_in(ann, seen: set = None):
+    """The TypeVars and TypeVarTuples nested in `ann`, through type aliases too."""
+    seen = set() if seen is None else seen
+    if id(ann) in seen:
+        return
+    seen.add(id(ann))
+
+    if isinstance(ann, typing.TypeVar | typing.TypeVarTuple):
+        yield ann
+        return
+    elif isinstance(ann, typing.TypeAliasType):
+        nested = (ann.__value__,)
+    elif isinstance(ann, (list, set, tuple)):
+        nested = ann
+    elif isinstance(ann, dict):
+        nested = ann.get("arg_types") or ()
+    elif isinstance(ann, typing._TypedDictMeta):
+        nested = ann.__annotations__.values()
+    else:
+        nested = getattr(ann, "__args__", None)
+        if not isinstance(nested, tuple):
+            return
+
+    for a in nested:
+        yield from typevars_in(a, seen)
+
 
 class BindChecker:
     """Checks if a value can bind to a type annotation given some already bound states."""
 
     def __init__(self, config: dict | BindCheckerConfig):
-        self.Gbinds = None
+        if not isinstance(config, BindCheckerConfig):
+            config = BindCheckerConfig(**(config or {}))
         self.config = config
 
         self.custom_validators = {}
+        # the binding slot of every TypeVar seen by this checker
+        self.generic_slots = {}
+        self.verdicts = VerdictCache(config.verdict_cache_size)
+        self.values = VerdictCache(config.value_cache_size)
+
+        self.config.watch(self.invalidate)
+
+    def invalidate(self):
+        """Forget everything derived from the validation rules, they changed."""
+        self.verdicts.maxsize = self.config.verdict_cache_size
+        self.verdicts.clear()
+        self.values.maxsize = self.config.value_cache_size
+        self.values.clear()
+
+    def new_bindings(self, generics=()):
+        """Create a fresh binding context for one validated call."""
+        for g in generics:
+            self.slot_of(g)
+        return GenericBindings(self.generic_slots)
+
+    def slot_of(self, ann) -> int:
+        """The binding slot of a TypeVar, allocated on first sight."""
+        return allocate_slot(self.generic_slots, ann)
+
+    def register_validator(
+        self, ty, handler: Callable[[type, Any, GenericBindings], None]
+    ):
+        """Register a handler for a type annotation.
+
+        It's called as `handler(self, ann, arg, binds)`, or `handler(self, ann, arg)` if it
+        only takes three arguments, the contract before per-call bindings.
+        """
+        if not takes_binds(handler):
+            legacy = handler
 
-    def new_bindings(self, generics):
-        self.Gbinds = GenericBindings(generics)
+            def handler(self, ann, arg, binds):
+                return legacy(self, ann, arg)
 
-    def register_validator(self, ty, handler: Callable[[type, Any], None]):
-        """Register a handler for a type annotation."""
-        self.check.register(ty)(handler)
-        log.debug(f"Registered {handler=} for {ty=}")
+        self._check.register(ty)(handler)
+        log.debug("Registered handler=%r for ty=%r", handler, ty)
+        self.invalidate()
 
     def register_custom_validator(self, ty, handler: Callable[[type, Any], None]):
         """Register a handler for a type annotation.
@@ -39,13 +161,46 @@ class BindChecker:
             Should only use on primitive types.
         """
         self.custom_validators.setdefault(ty, []).append(handler)
-        log.debug(f"Registered custom {handler=} for {ty=}")
+        log.debug("Registered custom handler=%r for ty=%r", handler, ty)
+        self.invalidate()
+
+    def _leaf_verdict(self, ann, arg):
+        """Resolve a leaf annotation against `type(arg)` to a (verdict, base annotation).
+
+        Verdicts are cached on (annotation, exact argument type) when that pair decides them.
+        """
+        cls = type(arg)
+        try:
+            key = (ann, cls)
+            verdict = self.verdicts.get(key)
+        except TypeError:
+            key = verdict = None
 
-    @property
-    def checked(self):
-        return [val.can_bind_generic for val in self.Gbinds.values()]
+        if verdict is not None:
+            return verdict
 
-    def __check_with_custom_validators(self, ty, value):
+        if type(ann) == typing._AnyMeta:
+            verdict = (STRICT_ANY if self.config.strict else VALID, ann)
+        else:
+            # if newtype we need to check against the base type
+            base = ann.__supertype__ if hasattr(ann, "__supertype__") else ann
+
+            if not isinstance(arg, base):
+                verdict = (INVALID, base)
+            elif self.config.use_custom_validators and self.custom_validators.get(base):
+                verdict = (CUSTOM, base)
+            else:
+                verdict = (VALID, base)
+
+            if not type_determines_instance(base) or arg.__class__ is not cls:
+                key = None
+
+        if key is not None:
+            self.verdicts.put(key, verdict)
+
+        return verdict
+
+    def _check_with_custom_validators(self, ty, value):
         """Check a value against custom validators."""
         if not self.config.use_custom_validators:
             return
@@ -56,75 +211,138 @@ class BindChecker:
                 if valid is not None and not valid:
                     raise ValidationError(f"{value=} failed to bind to {ty=}")
 
+    def check(self, ann, arg: Any, binds: GenericBindings = None):
+        """Check if a value can bind to a type annotation.
+
+        `binds` is the binding context of the current call, a fresh one is used if omitted.
+        """
+        if binds is None:
+            binds = self.new_bindings()
+
+        self._check(ann, arg, binds)
+
     @singledispatchmethod
-    def check(
+    def _check(
         self,
         ann: int | float | str | bool | bytes | type(None) | type | typing._AnyMeta,
         arg: Any,
+        binds: GenericBindings,
     ):
-        """Check if a value can bind to a type annotation."""
-        log.debug(f"Base: {ann=} {arg=}")
+        log.debug("Base: ann=%r arg=%r", ann, arg)
 
-        if type(ann) == typing._AnyMeta:
-            if self.config.strict:
-                raise ValidationError(
-                    f"Type {type(ann)} for `{arg}: {ann=}` must be validated, it cannot be left un-annotated! Disable strict validation to allow this."
-                )
-            else:
-                return
-
-        # if newtype we need to check against the base type
-        if hasattr(ann, "__supertype__"):
-            ann = ann.__supertype__
+        verdict, ann = self._leaf_verdict(ann, arg)
+        if verdict is VALID:
+            return
 
-        if not isinstance(arg, ann):
+        if verdict is STRICT_ANY:
+            raise ValidationError(
+                f"Type {type(ann)} for `{arg}: {ann=}` must be validated, it cannot be left un-annotated! Disable strict validation to allow this."
+            )
+        elif verdict is INVALID:
             raise InvalidType(f"{ann=} can not validate {arg=}")
 
-        self.__check_with_custom_validators(ann, arg)
+        self._check_with_custom_validators(ann, arg)
 
-    @check.register
+    @_check.register
     def _(
         self,
         ann: types.GenericAlias | typing._GenericAlias | typing._SpecialGenericAlias,
         arg: Any,
+        binds: GenericBindings,
     ):
-        log.debug(f"GenericAlias: {ann=} {arg=}")
-
-        if hasattr(ann, "__args__") and len(ann.__args__):
-            # TODO: These are really hacky...using {} and []...etc.. :(
-            if issubclass(ann.__origin__, dict):
-                self.check({"arg_types": ann.__args__}, arg)
-            elif issubclass(ann.__origin__, list):
-                self.check([*ann.__args__], arg)
-            elif issubclass(ann.__origin__, tuple):
-                self.check(ann.__args__, arg)
-            elif issubclass(ann.__origin__, set):
-                self.check(set(ann.__args__), arg)
-
-    @check.register
-    def _(self, ann: typing.TypeVar, arg: Any):
+        log.debug("GenericAlias: ann=%r arg=%r", ann, arg)
+
+        origin, args = ann.__origin__, getattr(ann, "__args__", ())
+        if not args:
+            # bare aliases like typing.Sequence stand for their origin
+            if isinstance(origin, type):
+                self._check(origin, arg, binds)
+            return
+
+        # TODO: These are really hacky...using {} and []...etc.. :(
+        if not isinstance(origin, type):
+            return
+        elif issubclass(origin, dict):
+            self._check({"arg_types": args}, arg, binds)
+        elif issubclass(origin, list):
+            self._check([*args], arg, binds)
+        elif issubclass(origin, tuple):
+            if variadic_tuple(args):
+                self._check_collection(tuple, COLLECTION_ORIGIN, args[:1], arg, binds)
+            else:
+                self._check(args, arg, binds)
+        elif issubclass(origin, set):
+            self._check(set(args), arg, binds)
+        elif (stream := stream_origin(ann)) is not None:
+            self._check_stream(stream, args[0], arg, binds)
+        elif (kind := collection_origin(origin, len(args))) is not None:
+            self._check_collection(origin, kind, args, arg, binds)
+
+    @_check.register
+    def _(self, ann: typing._AnnotatedAlias, arg: Any, binds: GenericBindings):
+        log.debug("AnnotatedAlias: ann=%r arg=%r", ann, arg)
+
+        self._check(ann.__origin__, arg, binds)
+        if (found := buffer_failure(constraints_of(ann.__metadata__), arg)) is not None:
+            error, message = found
+            raise error(message)
+
+    def _check_collection(self, origin: type, kind: str, args: tuple, arg, binds):
+        """Check an instance of `origin` and, depending on its `kind`, its contents."""
+        if not isinstance(arg, origin):
+            raise InvalidType(f"{arg=} is not a {origin.__name__}")
+
+        config = self.config
+        if kind is MAPPING_ORIGIN and not (config.no_dict_check or config.performance):
+            for k, v in ElementBudget(config).select(arg, items=True):
+                self._check(args[0], k, binds)
+                self._check(args[1], v, binds)
+        elif kind is COLLECTION_ORIGIN:
+            skip = config.no_tuple_check if origin is tuple else config.no_list_check
+            if not (skip or config.performance):
+                for a in ElementBudget(config).select(arg):
+                    self._check(args[0], a, binds)
+
+    def _check_stream(self, origin: type, elem, arg: Any, binds: GenericBindings):
+        """Check an Iterator, Iterable or Generator without consuming it.
+
+        Only the elements of re-iterable Iterables are checked here, streams are checked
+        lazily as they are consumed, see `BindCompiler.compile_stream`.
+        """
+        if not isinstance(arg, origin):
+            raise InvalidType(f"{arg=} is not an {origin.__name__}")
+
+        if self.config.no_list_check or self.config.performance:
+            return
+
+        if origin is Iterable and reiterable(arg):
+            for a in arg:
+                self._check(elem, a, binds)
+
+    @_check.register
+    def _(self, ann: typing.TypeVar, arg: Any, binds: GenericBindings):
         """Handle TypeVars"""
         log.debug(
-            f"TypeVar: {ann=} {arg=}\n{ann.__constraints__=}, {type(arg)=}, {type(arg) in [c for c in ann.__constraints__]=}"
+            "TypeVar: ann=%r arg=%r constraints=%r", ann, arg, ann.__constraints__
         )
 
         if len(ann.__constraints__):
             constraint_types = [type(c) for c in ann.__constraints__]
             if type(arg) in constraint_types:
                 # check against constraints
-                self.check(type(arg), arg)
+                self._check(type(arg), arg, binds)
             elif type(arg) not in ann.__constraints__:
                 raise ValidationError(
                     f"{arg=} is not valid for {ann=} with constraints {ann.__constraints__}"
                 )
 
         if not self.config.ignore_generics:
-            self.Gbinds.try_bind_new_arg(ann, arg)
+            binds.try_bind_new_arg(ann, arg)
 
-    @check.register
-    def _(self, ann: list, arg: Any):
+    @_check.register
+    def _(self, ann: list, arg: Any, binds: GenericBindings):
         """Handle generic sequences"""
-        log.debug(f"list: {ann=} {arg=}")
+        log.debug("list: ann=%r arg=%r", ann, arg)
 
         if not isinstance(arg, list):
             raise InvalidType(f"{arg=} is not a list")
@@ -134,13 +352,13 @@ class BindChecker:
 
         # list like list[T] or list[X]
         if len(ann) == 1:
-            for a in arg:
-                self.check(ann[0], a)
+            for a in ElementBudget(self.config).select(arg):
+                self._check(ann[0], a, binds)
 
-    @check.register
-    def _(self, ann: set, arg: Any):
+    @_check.register
+    def _(self, ann: set, arg: Any, binds: GenericBindings):
         """Handle generic sets"""
-        log.debug(f"set: {ann=} {arg=}")
+        log.debug("set: ann=%r arg=%r", ann, arg)
 
         if not isinstance(arg, set):
             raise InvalidType(f"{arg=} is not a set")
@@ -151,12 +369,12 @@ class BindChecker:
         # set like set[T] or set[X]
         if len(ann) == 1:
             set_type = next(iter(ann))
-            for a in arg:
-                self.check(set_type, a)
+            for a in ElementBudget(self.config).select(arg):
+                self._check(set_type, a, binds)
 
-    @check.register
-    def _(self, ann: tuple, arg: Any):
-        log.debug(f"tuple: {ann=} {arg=}")
+    @_check.register
+    def _(self, ann: tuple, arg: Any, binds: GenericBindings):
+        log.debug("tuple: ann=%r arg=%r", ann, arg)
 
         if not isinstance(arg, tuple):
             raise InvalidType(f"{arg=} is not a tuple")
@@ -167,11 +385,11 @@ class BindChecker:
         if len(ann) == len(arg):
             # each arg in tuple must bind to each ann in tuple
             for a, b in zip(ann, arg):
-                self.check(a, b)
+                self._check(a, b, binds)
 
-    @check.register
-    def _(self, ann: dict, arg: Any):
-        log.debug(f"dict: {ann=} {arg=}")
+    @_check.register
+    def _(self, ann: dict, arg: Any, binds: GenericBindings):
+        log.debug("dict: ann=%r arg=%r", ann, arg)
 
         if not isinstance(arg, dict):
             raise InvalidType(f"{arg=} is not a dict")
@@ -180,74 +398,80 @@ class BindChecker:
             return
 
         if ann["arg_types"] is not None:
-            for k, v in arg.items():
-                self.check(ann["arg_types"][0], k)
-                self.check(ann["arg_types"][1], v)
+            for k, v in ElementBudget(self.config).select(arg, items=True):
+                self._check(ann["arg_types"][0], k, binds)
+                self._check(ann["arg_types"][1], v, binds)
 
-    @check.register
-    def _(self, ann: types.UnionType | typing._UnionGenericAlias, arg: Any):
+    @_check.register
+    def _(
+        self,
+        ann: types.UnionType | typing._UnionGenericAlias,
+        arg: Any,
+        binds: GenericBindings,
+    ):
         """Handle union types"""
-        log.debug(f"Union: {ann=} {arg=}")
+        log.debug("Union: ann=%r arg=%r", ann, arg)
 
         for a in ann.__args__:
+            # a member could bind and then fail, so roll back any bound remnants.
+            snapshot = binds.snapshot()
             try:
-                # TODO: This probably will cause a bug as it could bind and then fail, leaving some bound remnants.
-                self.check(a, arg)  # , update_bindings=False) # ?
+                self._check(a, arg, binds)
                 return
             except ValidationError:
-                pass
+                binds.restore(snapshot)
 
         raise ValidationError(f"{arg=} failed to bind to {ann=}")
 
-    @check.register
-    def _(self, ann: typing._UnpackGenericAlias, arg: Any):
+    @_check.register
+    def _(self, ann: typing.TypeAliasType, arg: Any, binds: GenericBindings):
+        """Handle type aliases"""
+        self._check(ann.__value__, arg, binds)
+
+    @_check.register
+    def _(self, ann: typing._UnpackGenericAlias, arg: Any, binds: GenericBindings):
         """Handle unpacked generic types"""
-        log.debug(
-            f"UnpackGenericAlias: {ann=} {arg=}, {ann.__origin__=} {ann.__args__=}"
-        )
+        log.debug("UnpackGenericAlias: ann=%r arg=%r", ann, arg)
 
         # support for single type like list[int]
         if len(ann.__args__) == 1:
-            log.debug(
-                f"UnpackGenericAlias: {self.Gbinds} {ann.__args__[0]=} {type(ann.__args__[0])=}, {type(arg)=}"
-            )
-            self.Gbinds.try_bind_new_arg(ann.__args__[0], arg)
-            log.debug(f"UnpackGenericAlias: {self.Gbinds}")
+            binds.try_bind_new_arg(ann.__args__[0], arg)
+            log.debug("UnpackGenericAlias: binds=%r", binds)
 
-    @check.register
-    def _(self, ann: typing.TypeVarTuple, arg: Any):
+    @_check.register
+    def _(self, ann: typing.TypeVarTuple, arg: Any, binds: GenericBindings):
         """Handle TypeVarTuples"""
-        log.debug(f"TypeVarTuple: {ann=} {arg=}")
+        log.debug("TypeVarTuple: ann=%r arg=%r", ann, arg)
 
         if self.config.no_tuple_check or self.config.performance:
             return
 
         for e in arg:
-            self.Gbinds.try_bind_new_arg(ann, e)
+            binds.try_bind_new_arg(ann, e)
 
-    @check.register
-    def _(self, ann: typing._TypedDictMeta, arg: Any):
+    @_check.register
+    def _(self, ann: typing._TypedDictMeta, arg: Any, binds: GenericBindings):
         """Handle TypedDicts"""
-        log.debug(f"TypedDictMeta: {ann=} {arg=}")
+        log.debug("TypedDictMeta: ann=%r arg=%r", ann, arg)
 
         if self.config.no_dict_check or self.config.performance:
             return
 
         for k, v in arg.items():
-            self.check(ann.__annotations__[k], v)
+            self._check(ann.__annotations__[k], v, binds)
 
-    @check.register
-    def _(self, ann: typing._LiteralGenericAlias, arg: Any):
+    @_check.register
+    def _(self, ann: typing._LiteralGenericAlias, arg: Any, binds: GenericBindings):
         """Handle Literal types"""
-        log.debug(f"LiteralGenericAlias: {ann=} {arg=}")
+        log.debug("LiteralGenericAlias: ann=%r arg=%r", ann, arg)
 
         if arg not in ann.__args__:
             raise ValidationError(f"{arg=} failed to bind to {ann=}")
 
-    @check.register
-    def _(self, ann: typing._CallableGenericAlias, arg: Any):
+    @_check.register
+    def _(self, ann: typing._CallableGenericAlias, arg: Any, binds: GenericBindings):
         """Handle Callable types"""
-        log.debug(f"CallableGenericAlias: {ann=} {arg=}")
+        log.debug("CallableGenericAlias: ann=%r arg=%r", ann, arg)
 
         if not callable(arg):
             raise ValidationError(f"{arg=} failed to bind to {ann=}")
@@ -266,9 +490,9 @@ class BindChecker:
 
                     if ann_ret is not None:
                         # Assuming return type is the last in __args__
-                        self.check(ann_ret, ann.__args__[-1]())
+                        self._check(ann_ret, ann.__args__[-1](), binds)
 
                     if len(ann_args):
                         for idx, (arg_name, arg_type) in enumerate(ann_args.items()):
                             expected_type = ann.__args__[idx]
-                            self.check(expected_type, arg_type())
+                            self._check(expected_type, arg_type(), binds)
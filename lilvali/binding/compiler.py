@@ -0,0 +1,932 @@
+from functools import singledispatchmethod
+import abc, types, typing, logging, weakref
+from collections.abc import AsyncGenerator, AsyncIterator, Generator, Iterable, Iterator
+from typing import (
+    Any,
+    Callable,
+)
+
+
+from ..errors import *
+from .buffers import buffer_failure, constraints_of
+from .cache import UnionIndex, abc_membership, type_determines_instance, value_key
+from .checker import (
+    BindChecker,
+    INVALID,
+    CUSTOM,
+    MAPPING_ORIGIN,
+    COLLECTION_ORIGIN,
+    collection_origin,
+    typevars_in,
+    variadic_tuple,
+)
+from .parallel import compile_chunked
+from .result import Failure
+from .struct import bind_failure
+from .sampling import ElementBudget
+from .walk import build, walk, LEAF, TYPE
+from .stream import (
+    stream_origin,
+    reiterable,
+    CheckedIterator,
+    CheckedIterable,
+    CheckedGenerator,
+    CheckedAsyncIterator,
+    CheckedAsyncIterable,
+    CheckedAsyncGenerator,
+)
+
+
+log = logging.getLogger(__name__)
+
+
+# A compiled checker takes the value and the binding context and returns None if it's
+# valid. Failures are returned, not raised, so Unions and containers don't pay for
+# unwinding; the exception is only built once the failure reaches the caller.
+Checker = Callable[[Any, Any], Failure | None]
+
+
+# Marks list and set annotations whose elements aren't checked.
+_NO_ELEMENTS = object()
+
+# Bounds the subclasses a bulk check remembers as valid for its element class.
+_MAX_ACCEPTED_TYPES = 32
+
+
+def _pass(arg, binds):
+    """Checker for annotations which accept anything."""
+
+
+def run_validators(validators, arg, ty) -> Failure | None:
+    """Run the custom validators of `ty` on an instance of it."""
+    for handler in validators:
+        try:
+            valid = handler(arg)
+        except ValidationError as e:
+            return Failure(e)
+
+        if valid is not None and not valid:
+            value = arg
+            return Failure(ValidationError, lambda: f"{value=} failed to bind to {ty=}")
+
+
+class BindCompiler(BindChecker):
+    """Compiles type annotations into trees of specialized checker closures.
+
+    `check` stays the reference behavior. `compile` does its dispatch, probing and config
+    lookups once, ahead of time, so the returned closure only does the per-value work.
+    """
+
+    def __init__(self, config):
+        self.custom_compilers = {}
+        self._custom_checks = set()
+        self._listeners = []
+        # type aliases being compiled, to break the recursion of self-referring ones
+        self._aliases = {}
+
+        super().__init__(config=config)
+
+    def register_validator(self, ty, handler: Callable[[type, Any, Any], None]):
+        self._custom_checks.add(ty)
+        super().register_validator(ty, handler)
+
+    def register_compiler(self, ty, handler: Callable[[Any], Checker]):
+        """Register a compiler for annotations of type `ty`, the counterpart of `register_validator`."""
+        self.custom_compilers[ty] = handler
+        self.invalidate()
+
+    def subscribe(self, callback: Callable[[], None]):
+        """Call the bound method `callback` whenever previously compiled plans become stale."""
+        self._listeners.append(weakref.WeakMethod(callback))
+
+    def invalidate(self):
+        """Notify subscribers that the rules changed and their plans must be recompiled."""
+        super().invalidate()
+
+        self._listeners = [ref for ref in self._listeners if ref() is not None]
+        for ref in self._listeners:
+            ref()()
+
+    def compile(self, ann) -> Checker:
+        """Compile a type annotation into a checker closure taking `(arg, binds)`."""
+        for ty in type(ann).__mro__:
+            if ty in self.custom_compilers:
+                return self.custom_compilers[ty](ann)
+            if ty in self._custom_checks:
+                return self._compile_reference(ann)
+
+        # dispatched directly, going through the singledispatchmethod builds a wrapper per call
+        return _dispatch_compile(ann.__class__)(self, ann)
+
+    def _compile_reference(self, ann) -> Checker:
+        """Defer to the reference `check` for annotations we don't know how to compile."""
+        check = self.check
+        # calls only look the slots of their TypeVars up
+        for tv in typevars_in(ann):
+            self.slot_of(tv)
+
+        def check_reference(arg, binds):
+            try:
+                check(ann, arg, binds)
+            except ValidationError as e:
+                return Failure(e)
+
+        return check_reference
+
+    @singledispatchmethod
+    def _compile(self, ann: Any) -> Checker:
+        if type(ann) == typing._AnyMeta:
+            if not self.config.strict:
+                return _pass
+
+            def check_any(arg, binds):
+                return Failure(
+                    ValidationError,
+                    lambda: f"Type {type(ann)} for `{arg}: {ann=}` must be validated, it cannot be left un-annotated! Disable strict validation to allow this.",
+                )
+
+            return check_any
+
+        # if newtype we need to check against the base type
+        if hasattr(ann, "__supertype__"):
+            ann = ann.__supertype__
+
+        if not isinstance(ann, type):
+            return self._compile_reference(ann)
+
+        validators = ()
+        if self.config.use_custom_validators:
+            validators = tuple(self.custom_validators.get(ann, ()))
+
+        # isinstance against a plain class is cheaper than any cache, others use verdicts.
+        if type(ann) is not type and self.verdicts.maxsize:
+            leaf_verdict = self._leaf_verdict
+
+            def check_instance_cached(arg, binds):
+                verdict, ty = leaf_verdict(ann, arg)
+                if verdict is INVALID:
+                    return Failure(
+                        InvalidType, lambda: f"{ann=} can not validate {arg=}"
+                    )
+
+                if verdict is CUSTOM:
+                    return run_validators(validators, arg, ty)
+
+            return check_instance_cached
+
+        if not validators:
+
+            def check_instance(arg, binds):
+                if not isinstance(arg, ann):
+                    return Failure(
+                        InvalidType, lambda: f"{ann=} can not validate {arg=}"
+                    )
+
+            return check_instance
+
+        def check_instance_custom(arg, binds):
+            if not isinstance(arg, ann):
+                return Failure(InvalidType, lambda: f"{ann=} can not validate {arg=}")
+
+            return run_validators(validators, arg, ann)
+
+        return check_instance_custom
+
+    @_compile.register
+    def _(
+        self,
+        ann: types.GenericAlias | typing._GenericAlias | typing._SpecialGenericAlias,
+    ) -> Checker:
+        origin, args = ann.__origin__, getattr(ann, "__args__", ())
+        if not args:
+            # bare aliases like typing.Sequence stand for their origin
+            return self.compile(origin) if isinstance(origin, type) else _pass
+
+        if not isinstance(origin, type):
+            return self._compile_reference(ann)
+
+        if issubclass(origin, dict):
+            return self.compile({"arg_types": args})
+        elif issubclass(origin, list):
+            return self.compile([*args])
+        elif issubclass(origin, tuple):
+            if variadic_tuple(args):
+                skip = self.config.no_tuple_check or self.config.performance
+                return self._compile_collection(
+                    tuple, _NO_ELEMENTS if skip else args[0]
+                )
+            return self.compile(args)
+        elif issubclass(origin, set):
+            return self.compile(set(args))
+        elif (stream := stream_origin(ann)) is not None:
+            return self._compile_stream_type(stream, args[0])
+        elif (kind := collection_origin(origin, len(args))) is not None:
+            return self._compile_abstract(origin, kind, args)
+
+        return _pass
+
+    @_compile.register
+    def _(self, ann: typing._AnnotatedAlias) -> Checker:
+        check = self.compile(ann.__origin__)
+        constraints = constraints_of(ann.__metadata__)
+        if not constraints:
+            return check
+
+        def check_buffer(arg, binds):
+            if (failure := check(arg, binds)) is not None:
+                return failure
+            if (found := buffer_failure(constraints, arg)) is not None:
+                return Failure(*found)
+
+        return check_buffer
+
+    def _compile_abstract(self, origin: type, kind: str, args: tuple) -> Checker:
+        """Checker for a parametrized collection other than list, dict, tuple and set.
+
+        The contents are checked like those of a list or dict. An ABC's membership is looked
+        up per concrete class, a concrete origin is checked with isinstance.
+        """
+        config = self.config
+        abstract = isinstance(origin, abc.ABCMeta)
+        container = object if abstract else origin
+
+        if kind is MAPPING_ORIGIN and not (config.no_dict_check or config.performance):
+            check = self._compile_mapping(container, args)
+        elif kind is COLLECTION_ORIGIN and not (
+            config.no_list_check or config.performance
+        ):
+            check = self._compile_collection(container, args[0])
+        elif abstract:
+            check = None
+        else:
+            return self._compile_collection(container, _NO_ELEMENTS)
+
+        if not abstract:
+            return check
+
+        membership = abc_membership(origin)
+        members, name = membership.members, origin.__name__
+
+        if check is None:
+
+            def check_abstract_type(arg, binds):
+                if members.get(type(arg)) is not True and not membership(arg):
+                    return Failure(InvalidType, lambda: f"{arg=} is not a {name}")
+
+            return check_abstract_type
+
+        def check_abstract(arg, binds):
+            if members.get(type(arg)) is not True and not membership(arg):
+                return Failure(InvalidType, lambda: f"{arg=} is not a {name}")
+            return check(arg, binds)
+
+        return check_abstract
+
+    def _compile_stream_type(self, origin: type, elem) -> Checker:
+        """Checker for an Iterator, Iterable or Generator, which doesn't consume it."""
+        name = origin.__name__
+
+        def check_stream_type(arg, binds):
+            if not isinstance(arg, origin):
+                return Failure(InvalidType, lambda: f"{arg=} is not an {name}")
+
+        if (
+            origin is not Iterable
+            or self.config.no_list_check
+            or self.config.performance
+        ):
+            return check_stream_type
+
+        check_elem = self.compile(elem)
+
+        def check_iterable(arg, binds):
+            if not isinstance(arg, origin):
+                return Failure(InvalidType, lambda: f"{arg=} is not an {name}")
+
+            if reiterable(arg):
+                for a in arg:
+                    if (failure := check_elem(a, binds)) is not None:
+                        return failure
+
+        return check_iterable
+
+    def compile_stream(self, ann) -> Callable[[Any, Any], Any] | None:
+        """Compile a wrapper which checks a stream's elements lazily, as they're consumed.
+
+        The wrapper takes `(arg, binds)` of a value which already passed `compile(ann)` and
+        returns the value to use in its place. None if `ann` isn't a parametrized (async)
+        Iterator, Iterable or Generator annotation.
+        """
+        origin = stream_origin(ann)
+        if origin is None or not getattr(ann, "__args__", None):
+            return None
+        if self.config.no_list_check or self.config.performance:
+            return None
+
+        args = ann.__args__
+        check_yield = self.compile(args[0])
+        fork = self._binds_generics(ann)
+
+        if origin is Generator:
+            check_send = self.compile(args[1]) if len(args) > 1 else None
+            check_return = self.compile(args[2]) if len(args) > 2 else None
+
+            def wrap_generator(arg, binds):
+                binds = binds.fork() if fork else binds
+                return CheckedGenerator(
+                    arg, check_yield, check_send, check_return, binds
+                )
+
+            return wrap_generator
+
+        if origin is AsyncGenerator:
+            check_send = self.compile(args[1]) if len(args) > 1 else None
+
+            def wrap_async_generator(arg, binds):
+                binds = binds.fork() if fork else binds
+                return CheckedAsyncGenerator(arg, check_yield, check_send, binds)
+
+            return wrap_async_generator
+
+        if origin is not Iterator and origin is not Iterable:
+
+            def wrap_async_stream(arg, binds):
+                binds = binds.fork() if fork else binds
+                if isinstance(arg, AsyncGenerator):
+                    # keeps asend, athrow and aclose, like context managers use
+                    return CheckedAsyncGenerator(arg, check_yield, None, binds)
+                elif isinstance(arg, AsyncIterator):
+                    return CheckedAsyncIterator(arg, check_yield, binds)
+                return CheckedAsyncIterable(arg, check_yield, binds)
+
+            return wrap_async_stream
+
+        def wrap_stream(arg, binds):
+            if isinstance(arg, Generator):
+                # keeps send, throw and close, like context managers use
+                binds = binds.fork() if fork else binds
+                return CheckedGenerator(arg, check_yield, None, None, binds)
+            elif isinstance(arg, Iterator):
+                binds = binds.fork() if fork else binds
+                return CheckedIterator(arg, check_yield, binds)
+            elif reiterable(arg):
+                # already checked eagerly
+                return arg
+
+            binds = binds.fork() if fork else binds
+            return CheckedIterable(arg, check_yield, binds)
+
+        return wrap_stream
+
+    @_compile.register
+    def _(self, ann: typing.TypeVar) -> Checker:
+        constraints = ann.__constraints__
+        constraint_types = [type(c) for c in constraints]
+        check_custom = self._check_with_custom_validators
+        bind = not self.config.ignore_generics
+        slots, i = self.generic_slots, self.slot_of(ann)
+
+        def check_typevar(arg, binds):
+            if constraints:
+                if type(arg) in constraint_types:
+                    # check against constraints
+                    try:
+                        check_custom(type(arg), arg)
+                    except ValidationError as e:
+                        return Failure(e)
+                elif type(arg) not in constraints:
+                    return Failure(
+                        ValidationError,
+                        lambda: f"{arg=} is not valid for {ann=} with constraints {ann.__constraints__}",
+                    )
+
+            if bind:
+                if binds.slots is not slots or i >= len(binds):
+                    return binds.bind(ann, arg)
+
+                ty = binds[i]
+                if ty is None:
+                    binds[i] = type(arg)
+                elif ty is not type(arg):
+                    return bind_failure(ty, type(arg))
+
+        return check_typevar
+
+    @_compile.register
+    def _(self, ann: list) -> Checker:
+        skip = self.config.no_list_check or self.config.performance
+        # list like list[T] or list[X]
+        elem = ann[0] if len(ann) == 1 and not skip else _NO_ELEMENTS
+        return self._compile_collection(list, elem)
+
+    @_compile.register
+    def _(self, ann: set) -> Checker:
+        skip = self.config.no_list_check or self.config.performance
+        # set like set[T] or set[X]
+        elem = next(iter(ann)) if len(ann) == 1 and not skip else _NO_ELEMENTS
+        return self._compile_collection(set, elem)
+
+    def _compile_collection(self, container: type, elem) -> Checker:
+        """Checker for a list, set or other collection whose elements must bind to `elem`."""
+        name = container.__name__
+
+        if elem is _NO_ELEMENTS:
+
+            def check_collection_type(arg, binds):
+                if not isinstance(arg, container):
+                    return Failure(InvalidType, lambda: f"{arg=} is not a {name}")
+
+            return check_collection_type
+
+        check_elem = self.compile(elem)
+        budget = ElementBudget(self.config)
+        scalar = self._scalar_type(elem)
+
+        if scalar is not None and budget.time_budget is None:
+            all_of = self._compile_bulk(scalar)
+            select = budget.select if budget.active else None
+
+            def check_collection_bulk(arg, binds):
+                if not isinstance(arg, container):
+                    return Failure(InvalidType, lambda: f"{arg=} is not a {name}")
+
+                values = arg if select is None else select(arg)
+                if not all_of(values):
+                    # let the per-element check produce the precise error
+                    for a in values:
+                        if (failure := check_elem(a, binds)) is not None:
+                            return failure
+
+            return check_collection_bulk
+
+        parallel = (
+            None if budget.active else self._compile_parallel((elem,), (check_elem,))
+        )
+        if parallel is not None:
+            threshold = self.config.parallel_threshold
+
+            def check_collection_parallel(arg, binds):
+                if not isinstance(arg, container):
+                    return Failure(InvalidType, lambda: f"{arg=} is not a {name}")
+
+                if len(arg) >= threshold:
+                    return parallel(arg, binds)
+
+                for a in arg:
+                    if (failure := check_elem(a, binds)) is not None:
+                        return failure
+
+            return check_collection_parallel
+
+        if budget.active:
+            select = budget.select
+
+            def check_collection_sampled(arg, binds):
+                if not isinstance(arg, container):
+                    return Failure(InvalidType, lambda: f"{arg=} is not a {name}")
+
+                for a in select(arg):
+                    if (failure := check_elem(a, binds)) is not None:
+                        return failure
+
+            return check_collection_sampled
+
+        def check_collection(arg, binds):
+            if not isinstance(arg, container):
+                return Failure(InvalidType, lambda: f"{arg=} is not a {name}")
+
+            for a in arg:
+                if (failure := check_elem(a, binds)) is not None:
+                    return failure
+
+        return check_collection
+
+    def compile_walk(self, ann) -> Checker:
+        """Compile `ann` into a checker walking nested values iteratively, see `walk`."""
+        root = build(self, ann)
+        if root.kind is LEAF or root.kind is TYPE:
+            return self.compile(ann)
+
+        def check_walk(arg, binds):
+            return walk(root, arg, binds)
+
+        return check_walk
+
+    def compile_parameter(self, ann) -> Checker:
+        """The checker of a whole parameter annotated with `ann`.
+
+        With `iterative`, nested values are walked iteratively. With `value_cache_size`, the
+        hashable immutable values that passed are remembered, but not for annotations that
+        could bind generics since a hit would skip their bindings. Failures aren't cached.
+        """
+        check = self.compile_walk(ann) if self.config.iterative else self.compile(ann)
+        if not self.config.value_cache_size or self._binds_generics(ann):
+            return check
+
+        # keys hold the token, so it's unique to this checker closure for as long as they live
+        values, token = self.values, object()
+
+        def check_cached(arg, binds):
+            key = value_key(arg)
+            if key is None:
+                return check(arg, binds)
+
+            key = (token, key)
+            if values.get(key) is not None:
+                return None
+            if (failure := check(arg, binds)) is None:
+                values.put(key, True)
+            return failure
+
+        return check_cached
+
+    def compile_bulk(self, ann) -> Callable[[Any], bool] | None:
+        """Compile a check of many values at once, True if all of them are valid for `ann`.
+
+        Only annotations with a C-level fast path get one, others return None.
+        """
+        ty = self._scalar_type(ann)
+        return None if ty is None else self._compile_bulk(ty)
+
+    def _compile_parallel(
+        self, anns: tuple, checks: tuple, items: bool = False
+    ) -> Checker | None:
+        """Checker of container elements across worker processes, see `parallel_threshold`."""
+        if self.config.parallel_threshold is None:
+            return None
+
+        return compile_chunked(self, anns, checks, items)
+
+    def _scalar_type(self, ann) -> type | None:
+        """The class `ann` compiles to a plain isinstance check against, if it does.
+
+        Only classes with a plain `type` metaclass qualify, so `issubclass` on the value's
+        type is equivalent to `isinstance`, and only without custom validators or checks.
+        """
+        if hasattr(ann, "__supertype__"):
+            ann = ann.__supertype__
+
+        if type(ann) is not type:
+            return None
+        if type in self.custom_compilers or type in self._custom_checks:
+            return None
+        if self.config.use_custom_validators and self.custom_validators.get(ann):
+            return None
+
+        return ann
+
+    def _compile_bulk(self, ty: type) -> Callable[[Any], bool]:
+        """True if all of many values are instances of `ty`, checked in one C-level pass."""
+        accepted = {ty}
+
+        def all_of(values):
+            types_ = set(map(type, values))
+            if types_ <= accepted:
+                return True
+
+            if all(issubclass(t, ty) for t in types_):
+                if len(accepted) < _MAX_ACCEPTED_TYPES:
+                    accepted.update(types_)
+                return True
+
+            return False
+
+        return all_of
+
+    @_compile.register
+    def _(self, ann: tuple) -> Checker:
+        skip = self.config.no_tuple_check or self.config.performance
+        checks = () if skip else tuple(self.compile(a) for a in ann)
+        n = len(ann)
+
+        if not checks:
+
+            def check_tuple_type(arg, binds):
+                if not isinstance(arg, tuple):
+                    return Failure(InvalidType, lambda: f"{arg=} is not a tuple")
+
+            return check_tuple_type
+
+        def check_tuple(arg, binds):
+            if not isinstance(arg, tuple):
+                return Failure(InvalidType, lambda: f"{arg=} is not a tuple")
+
+            # each arg in tuple must bind to each ann in tuple
+            if len(arg) == n:
+                for check, a in zip(checks, arg):
+                    if (failure := check(a, binds)) is not None:
+                        return failure
+
+        return check_tuple
+
+    @_compile.register
+    def _(self, ann: dict) -> Checker:
+        skip = self.config.no_dict_check or self.config.performance
+        arg_types = ann.get("arg_types")
+
+        if arg_types is not None and len(arg_types) != 2:
+            return self._compile_reference(ann)
+
+        if skip or arg_types is None:
+
+            def check_dict_type(arg, binds):
+                if not isinstance(arg, dict):
+                    return Failure(InvalidType, lambda: f"{arg=} is not a dict")
+
+            return check_dict_type
+
+        return self._compile_mapping(dict, arg_types)
+
+    def _compile_mapping(self, container: type, arg_types) -> Checker:
+        """Checker for a dict or other mapping whose items must bind to `arg_types`."""
+        name = container.__name__
+        check_key, check_value = self.compile(arg_types[0]), self.compile(arg_types[1])
+        budget = ElementBudget(self.config)
+        key_scalar = self._scalar_type(arg_types[0])
+        value_scalar = self._scalar_type(arg_types[1])
+
+        parallel = None
+        if not budget.active and not (key_scalar and value_scalar):
+            parallel = self._compile_parallel(
+                tuple(arg_types), (check_key, check_value), items=True
+            )
+
+        if parallel is not None:
+            threshold = self.config.parallel_threshold
+
+            def check_mapping_parallel(arg, binds):
+                if not isinstance(arg, container):
+                    return Failure(InvalidType, lambda: f"{arg=} is not a {name}")
+
+                if len(arg) >= threshold:
+                    return parallel(arg, binds)
+
+                for k, v in arg.items():
+                    if failure := check_key(k, binds) or check_value(v, binds):
+                        return failure
+
+            return check_mapping_parallel
+
+        if not budget.active and (key_scalar or value_scalar):
+            keys_ok = self._compile_bulk(key_scalar) if key_scalar else None
+            values_ok = self._compile_bulk(value_scalar) if value_scalar else None
+
+            def check_mapping_bulk(arg, binds):
+                if not isinstance(arg, container):
+                    return Failure(InvalidType, lambda: f"{arg=} is not a {name}")
+
+                if (keys_ok is None or keys_ok(arg.keys())) and (
+                    values_ok is None or values_ok(arg.values())
+                ):
+                    if keys_ok is None:
+                        for k in arg:
+                            if (failure := check_key(k, binds)) is not None:
+                                return failure
+                    elif values_ok is None:
+                        for v in arg.values():
+                            if (failure := check_value(v, binds)) is not None:
+                                return failure
+                    return
+
+                # let the per-item check produce the precise error
+                for k, v in arg.items():
+                    if failure := check_key(k, binds) or check_value(v, binds):
+                        return failure
+
+            return check_mapping_bulk
+
+        if budget.active:
+            select = budget.select
+
+            def check_mapping_sampled(arg, binds):
+                if not isinstance(arg, container):
+                    return Failure(InvalidType, lambda: f"{arg=} is not a {name}")
+
+                for k, v in select(arg, items=True):
+                    if failure := check_key(k, binds) or check_value(v, binds):
+                        return failure
+
+            return check_mapping_sampled
+
+        def check_mapping(arg, binds):
+            if not isinstance(arg, container):
+                return Failure(InvalidType, lambda: f"{arg=} is not a {name}")
+
+            for k, v in arg.items():
+                if failure := check_key(k, binds) or check_value(v, binds):
+                    return failure
+
+        return check_mapping
+
+    @_compile.register
+    def _(self, ann: types.UnionType | typing._UnionGenericAlias) -> Checker:
+        members = tuple(
+            (self.compile(a), self._binds_generics(a)) for a in ann.__args__
+        )
+        candidates_of = UnionIndex(
+            members, tuple(self._type_filter(a) for a in ann.__args__)
+        )
+
+        def check_union(arg, binds):
+            for check, transactional in candidates_of(arg):
+                # a member could bind and then fail, so roll back any bound remnants.
+                if transactional:
+                    snapshot = binds.snapshot()
+                if check(arg, binds) is None:
+                    return None
+                if transactional:
+                    binds.restore(snapshot)
+
+            return Failure(ValidationError, lambda: f"{arg=} failed to bind to {ann=}")
+
+        return check_union
+
+    def _type_filter(self, ann) -> tuple | None:
+        """Classes an argument must subclass to possibly bind to `ann`, None if unknown."""
+        for ty in type(ann).__mro__:
+            if ty in self.custom_compilers or ty in self._custom_checks:
+                return None
+
+        if hasattr(ann, "__supertype__"):
+            ann = ann.__supertype__
+
+        if isinstance(ann, typing.TypeAliasType):
+            return self._type_filter(ann.__value__)
+        elif isinstance(ann, (list, set, tuple, dict)):
+            return (type(ann),)
+        elif isinstance(ann, types.UnionType | typing._UnionGenericAlias):
+            filters = [self._type_filter(a) for a in ann.__args__]
+            if None in filters:
+                return None
+            return tuple(cls for f in filters for cls in f)
+        elif isinstance(ann, typing.TypeVar):
+            if not ann.__constraints__:
+                return None
+            constraints = [type(c) for c in ann.__constraints__]
+            constraints += [c for c in ann.__constraints__ if isinstance(c, type)]
+            return tuple(constraints)
+        elif isinstance(ann, typing._AnnotatedAlias):
+            return self._type_filter(ann.__origin__)
+        elif isinstance(ann, types.GenericAlias | typing._GenericAlias) and not (
+            isinstance(ann, typing._LiteralGenericAlias | typing._CallableGenericAlias)
+        ):
+            origin = getattr(ann, "__origin__", None)
+            if not getattr(ann, "__args__", None) or not isinstance(origin, type):
+                return None
+            for container in (dict, list, tuple, set):
+                if issubclass(origin, container):
+                    return (container,)
+            if stream_origin(ann) is None and collection_origin(
+                origin, len(ann.__args__)
+            ):
+                return (origin,)
+            return None
+        elif (
+            isinstance(ann, type)
+            and type(ann) != typing._AnyMeta
+            and type_determines_instance(ann)
+        ):
+            return (ann,)
+
+        return None
+
+    def _binds_generics(self, ann) -> bool:
+        """True if checking against `ann` could bind generics, conservatively."""
+        if hasattr(ann, "__supertype__"):
+            return False
+        elif isinstance(ann, typing.TypeVar | typing.TypeVarTuple):
+            return True
+        elif ann is Ellipsis:
+            return False
+        elif isinstance(ann, typing.TypeAliasType):
+            return bool(ann.__type_params__)
+        elif isinstance(ann, (list, set, tuple)):
+            return any(self._binds_generics(a) for a in ann)
+        elif isinstance(ann, dict):
+            return any(self._binds_generics(a) for a in ann.get("arg_types") or ())
+        elif isinstance(ann, typing._TypedDictMeta):
+            return any(self._binds_generics(a) for a in ann.__annotations__.values())
+        elif isinstance(ann, typing._LiteralGenericAlias):
+            return False
+        elif hasattr(ann, "__args__"):
+            return any(self._binds_generics(a) for a in ann.__args__)
+
+        return not isinstance(ann, type) and type(ann) not in self.custom_compilers
+
+    @_compile.register
+    def _(self, ann: typing._UnpackGenericAlias) -> Checker:
+        # support for single type like list[int]
+        if len(ann.__args__) != 1:
+            return _pass
+
+        target = ann.__args__[0]
+        self.slot_of(target)
+
+        def check_unpack(arg, binds):
+            return binds.bind(target, arg)
+
+        return check_unpack
+
+    @_compile.register
+    def _(self, ann: typing.TypeVarTuple) -> Checker:
+        if self.config.no_tuple_check or self.config.performance:
+            return _pass
+        self.slot_of(ann)
+
+        def check_typevartuple(arg, binds):
+            for e in arg:
+                if (failure := binds.bind(ann, e)) is not None:
+                    return failure
+
+        return check_typevartuple
+
+    @_compile.register
+    def _(self, ann: typing._TypedDictMeta) -> Checker:
+        if self.config.no_dict_check or self.config.performance:
+            return _pass
+
+        checks = {k: self.compile(v) for k, v in ann.__annotations__.items()}
+
+        def check_typeddict(arg, binds):
+            for k, v in arg.items():
+                if (failure := checks[k](v, binds)) is not None:
+                    return failure
+
+        return check_typeddict
+
+    @_compile.register
+    def _(self, ann: typing.TypeAliasType) -> Checker:
+        # a recursive alias refers to itself through a trampoline to its own checker
+        entry = self._aliases.get(ann)
+        if entry is not None:
+            entry[1] = True
+            return entry[0]
+
+        target = None
+
+        def check_alias(arg, binds):
+            return target(arg, binds)
+
+        entry = self._aliases[ann] = [check_alias, False]
+        try:
+            target = self.compile(ann.__value__)
+        finally:
+            del self._aliases[ann]
+
+        return check_alias if entry[1] else target
+
+    @_compile.register
+    def _(self, ann: typing._LiteralGenericAlias) -> Checker:
+        values = ann.__args__
+
+        def check_literal(arg, binds):
+            if arg not in values:
+                return Failure(
+                    ValidationError, lambda: f"{arg=} failed to bind to {ann=}"
+                )
+
+        return check_literal
+
+    @_compile.register
+    def _(self, ann: typing._CallableGenericAlias) -> Checker:
+        # The arg's own annotations are only known per call, so those go through `check`.
+        check = self.check
+        implied_lambdas = self.config.implied_lambdas
+
+        def check_callable(arg, binds):
+            if not callable(arg):
+                return Failure(
+                    ValidationError, lambda: f"{arg=} failed to bind to {ann=}"
+                )
+
+            if not len(ann.__args__):
+                return None
+
+            if arg.__name__ == "<lambda>" and not implied_lambdas:
+                return Failure(
+                    ValidationError,
+                    lambda: f"lambda {arg=} cannot have the required annotations, use a def",
+                )
+
+            if not hasattr(arg, "__annotations__"):
+                return None
+
+            try:
+                ann_args = {
+                    k: v for (k, v) in arg.__annotations__.items() if k != "return"
+                }
+                ann_ret = arg.__annotations__.get("return")
+
+                if ann_ret is not None:
+                    # Assuming return type is the last in __args__
+                    check(ann_ret, ann.__args__[-1](), binds)
+
+                for idx, (arg_name, arg_type) in enumerate(ann_args.items()):
+                    check(ann.__args__[idx], arg_type(), binds)
+            except ValidationError as e:
+                return Failure(e)
+
+        return check_callable
+
+
+_dispatch_compile = BindCompiler.__dict__["_compile"].dispatcher.dispatch
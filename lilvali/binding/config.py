@@ -1,5 +1,10 @@
+import weakref
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, Callable, Optional
+
+
+# Fields read on every call rather than baked into compiled plans.
+_RUNTIME_FIELDS = frozenset({"disabled", "ret_validation"})
 
 
 @dataclass
@@ -16,9 +21,56 @@ class BindCheckerConfig(dict):
     no_tuple_check: bool = False
     no_dict_check: bool = False
 
+    # Budgets for list, set and dict elements, see ElementBudget.
+    max_elements: Optional[int] = None
+    sample_rate: Optional[float] = None
+    sample_mode: str = "stride"  # or "random"
+    time_budget: Optional[float] = None  # seconds, then degrade to sampling
+
+    # Lists, sets and dicts with at least this many elements are checked in chunks across
+    # a shared pool of `parallel_workers` processes (all cores by default).
+    parallel_threshold: Optional[int] = None
+    parallel_workers: Optional[int] = None
+
     ignore_generics: bool = False
 
+    # Walk nested lists, sets, dicts, tuples and TypedDicts with an explicit stack instead
+    # of nested checkers: any depth, and failures note the path they happened at.
+    iterative: bool = False
+
+    # Record per-function calls, failures and timings, see `lilvali.metrics`.
+    metrics: bool = False
+
+    # Bound of the (annotation, argument type) verdict cache, 0 disables it.
+    verdict_cache_size: int = 1024
+
+    # Bound of the cache of hashable immutable values (str, bytes, int, bool, None, and
+    # tuples and frozensets of them) that passed their annotation, 0 disables it. Assumes
+    # custom validators are pure functions of the value.
+    value_cache_size: int = 0
+
     def __getitem__(self, __key: Any) -> Any:
         if __key not in self:
             return None
         return super().__getitem__(__key)
+
+    def __setattr__(self, name: str, value: Any):
+        super().__setattr__(name, value)
+
+        if name not in _RUNTIME_FIELDS and "_watchers" in self.__dict__:
+            self._notify()
+
+    def watch(self, callback: Callable[[], None]):
+        """Call the bound method `callback` whenever a field compiled plans depend on changes.
+
+        Only a weak reference is kept so watching doesn't keep checkers alive.
+        """
+        self.__dict__.setdefault("_watchers", []).append(weakref.WeakMethod(callback))
+
+    def _notify(self):
+        watchers = self.__dict__["_watchers"]
+        alive = [ref for ref in watchers if ref() is not None]
+        watchers[:] = alive
+
+        for ref in alive:
+            ref()()
@@ -0,0 +1,182 @@
+"""Validation of very large containers across a shared process pool.
+
+Containers with at least `parallel_threshold` elements are split into chunks which are
+checked in worker processes. Each worker compiles the element annotation once and reuses
+it for every chunk it receives. TypeVars are shipped by value, so PEP 695 TypeVars work,
+and the types they bind to in each chunk are merged back into the call's bindings. Values
+that can't be pickled are checked in process instead.
+"""
+import io, logging, os, pickle, threading, typing
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+from typing import Any
+
+
+from .result import Failure
+
+
+log = logging.getLogger(__name__)
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+# Chunks handed out per worker, more than one so uneven chunks balance out.
+CHUNKS_PER_WORKER = 4
+
+# What pickling a value that can't be pickled raises.
+_PICKLING_ERRORS = (pickle.PicklingError, TypeError, AttributeError)
+
+
+def _make_typevar(name, bound, constraints):
+    return typing.TypeVar(name, *constraints, bound=bound)
+
+
+class _Pickler(pickle.Pickler):
+    """Pickles TypeVars by value, collecting them in the order they are found."""
+
+    def __init__(self, file):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.typevars = []
+
+    def reducer_override(self, obj):
+        if isinstance(obj, typing.TypeVar):
+            self.typevars.append(obj)
+            return _make_typevar, (obj.__name__, obj.__bound__, obj.__constraints__)
+        return NotImplemented
+
+
+def _dumps(obj) -> tuple[bytes, list]:
+    buffer = io.BytesIO()
+    pickler = _Pickler(buffer)
+    pickler.dump(obj)
+    return buffer.getvalue(), pickler.typevars
+
+
+def pool(workers: int | None) -> ProcessPoolExecutor:
+    """The shared pool of `workers` processes, created on first use."""
+    with _pools_lock:
+        executor = _pools.get(workers)
+        if executor is None:
+            executor = _pools[workers] = ProcessPoolExecutor(max_workers=workers)
+        return executor
+
+
+def compile_chunked(checker, anns: tuple, checks: tuple, items: bool = False):
+    """Compile a parallel checker of container elements against `anns`.
+
+    `anns` is `(elem,)` for lists and sets, or `(key, value)` for dict items, and `checks`
+    are their compiled checkers, used in process for elements that can't be pickled.
+    Returns None if the annotations, config or custom validators can't be sent to a worker.
+    """
+    config = {**asdict(checker.config), "parallel_threshold": None}
+    custom_validators = (
+        checker.custom_validators if config["use_custom_validators"] else {}
+    )
+
+    try:
+        typevars = list(dict.fromkeys(_dumps(anns)[1]))
+        # one dump, so the TypeVars in `anns` stay the same objects as in `typevars`
+        payload, _ = _dumps((type(checker), config, custom_validators, anns, typevars))
+    except _PICKLING_ERRORS as e:
+        log.debug("Can't check anns=%r in parallel: %r", anns, e)
+        return None
+
+    workers = checker.config.parallel_workers
+
+    def check_chunked(arg, binds):
+        values = list(arg.items() if items else arg)
+        n = len(values)
+        size = max(1, -(-n // ((workers or os.cpu_count() or 1) * CHUNKS_PER_WORKER)))
+
+        futures = [
+            (
+                start,
+                pool(workers).submit(
+                    _check_chunk, payload, values[start : start + size], items
+                ),
+            )
+            for start in range(0, n, size)
+        ]
+
+        failure = None
+        for start, future in futures:
+            if failure is not None:
+                future.cancel()
+                continue
+
+            try:
+                index, error, bound = future.result()
+            except _PICKLING_ERRORS as e:
+                # chunks are pickled in the background, their futures get the errors
+                log.debug("Checking anns=%r in process: %r", anns, e)
+                for _, f in futures:
+                    f.cancel()
+                return _check_values(checks, values, items, binds)
+            if error is not None:
+                error.add_note(f"first failing element at index {start + index}")
+                failure = Failure(error)
+                continue
+
+            # merge the chunk's bindings as if its elements had been checked here
+            for i, ty in bound.items():
+                if (failure := binds.bind_type(typevars[i], ty)) is not None:
+                    break
+
+        return failure
+
+    return check_chunked
+
+
+def _check_values(checks: tuple, values: list, items: bool, binds) -> Failure | None:
+    if items:
+        check_key, check_value = checks
+        for k, v in values:
+            if failure := check_key(k, binds) or check_value(v, binds):
+                return failure
+    else:
+        (check,) = checks
+        for e in values:
+            if (failure := check(e, binds)) is not None:
+                return failure
+
+
+# The compiled checks of a worker process, by payload.
+_plans = {}
+
+
+def _load(payload: bytes):
+    checker_cls, config, custom_validators, anns, typevars = pickle.loads(payload)
+
+    checker = checker_cls(config=config)
+    for ty, handlers in custom_validators.items():
+        for handler in handlers:
+            checker.register_custom_validator(ty, handler)
+
+    return checker, tuple(checker.compile(a) for a in anns), typevars
+
+
+def _check_chunk(payload: bytes, chunk: list, items: bool) -> tuple[int, Any, dict]:
+    """Check a chunk in a worker, returning `(index, error, bound)`.
+
+    `bound` maps the index of each TypeVar bound by the chunk to its type.
+    """
+    plan = _plans.get(payload)
+    if plan is None:
+        plan = _plans[payload] = _load(payload)
+    checker, checks, typevars = plan
+
+    binds = checker.new_bindings()
+    if items:
+        check_key, check_value = checks
+        for i, (k, v) in enumerate(chunk):
+            if failure := check_key(k, binds) or check_value(v, binds):
+                return i, failure.exception(), None
+    else:
+        (check,) = checks
+        for i, e in enumerate(chunk):
+            if (failure := check(e, binds)) is not None:
+                return i, failure.exception(), None
+
+    bound = binds.bound()
+    bound = {i: bound[tv] for i, tv in enumerate(typevars) if tv in bound}
+    return 0, None, bound
@@ -0,0 +1,39 @@
+from typing import Callable
+
+
+from ..errors import ValidationError
+
+
+class Failure:
+    """A failed check, returned by compiled checkers instead of raising.
+
+    `error` is the ValidationError subclass to raise, or an exception that was already
+    raised by user code. The message is only formatted if the failure is ever raised.
+    """
+
+    __slots__ = ("error", "message")
+
+    def __init__(
+        self,
+        error: type[ValidationError] | ValidationError,
+        message: str | Callable[[], str] = "",
+    ):
+        self.error = error
+        self.message = message
+
+    def exception(self) -> ValidationError:
+        """The exception the reference `check` would have raised for this failure."""
+        if isinstance(self.error, BaseException):
+            return self.error
+
+        message = self.message() if callable(self.message) else self.message
+        return self.error(message)
+
+    def __repr__(self):
+        return f"Failure({self.exception()!r})"
+
+
+def raise_failure(result: Failure | None):
+    """Raise the exception for a compiled checker's result, if it failed."""
+    if result is not None:
+        raise result.exception()
@@ -0,0 +1,80 @@
+import math, random
+from itertools import islice
+from time import perf_counter
+from typing import Iterable
+
+
+# How many more elements a container gets checked for once its time budget ran out.
+DEGRADED_SAMPLES = 1000
+
+
+class ElementBudget:
+    """Chooses which elements of a large container get checked.
+
+    Driven by `max_elements`, `sample_rate`, `sample_mode` and `time_budget` from
+    BindCheckerConfig. Without any of them set every element is checked.
+    """
+
+    def __init__(self, config):
+        self.max_elements = config.max_elements
+        self.sample_rate = config.sample_rate
+        self.random = config.sample_mode == "random"
+        self.time_budget = config.time_budget
+
+        if config.sample_mode not in ("stride", "random"):
+            raise ValueError(f"{config.sample_mode=} must be 'stride' or 'random'")
+
+    @property
+    def active(self) -> bool:
+        return (
+            self.max_elements is not None
+            or self.sample_rate is not None
+            or self.time_budget is not None
+        )
+
+    def sample_size(self, n: int) -> int:
+        k = n
+        if self.sample_rate is not None:
+            k = max(1, math.ceil(n * self.sample_rate))
+        if self.max_elements is not None:
+            k = min(k, self.max_elements)
+        return k
+
+    def select(self, arg, items: bool = False) -> Iterable:
+        """The elements (or dict items) of `arg` to check."""
+        n = len(arg)
+        it = arg.items() if items else arg
+
+        k = self.sample_size(n)
+        if k < n:
+            it = self._sample(it, n, k)
+
+        if self.time_budget is not None:
+            it = self._timed(it, k)
+
+        return it
+
+    def _sample(self, it, n, k):
+        if self.random and isinstance(it, list):
+            return [it[i] for i in sorted(random.sample(range(n), k))]
+
+        step = -(-n // k)
+        start = random.randrange(step) if self.random else 0
+        if isinstance(it, list):
+            return it[start::step]
+        return list(islice(it, start, None, step))
+
+    def _timed(self, it, n):
+        """Check everything until the time budget runs out, then only a stride of the rest."""
+        deadline = perf_counter() + self.time_budget
+        it = iter(it)
+
+        for i, e in enumerate(it, 1):
+            yield e
+            if not i & 0xFF and perf_counter() > deadline:
+                break
+        else:
+            return
+
+        step = max(1, (n - i) // DEGRADED_SAMPLES)
+        yield from islice(it, step - 1, None, step)
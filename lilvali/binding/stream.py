@@ -0,0 +1,177 @@
+from collections.abc import (
+    AsyncGenerator,
+    AsyncIterable,
+    AsyncIterator,
+    Collection,
+    Generator,
+    Iterable,
+    Iterator,
+)
+from typing import Any
+
+
+from .result import Failure
+from .struct import GenericBindings
+
+
+# Stream annotation origins.
+STREAMS = (
+    Generator,
+    Iterator,
+    Iterable,
+    AsyncGenerator,
+    AsyncIterator,
+    AsyncIterable,
+)
+
+
+def stream_origin(ann) -> type | None:
+    """The stream ABC `ann` parametrizes, if it is a (async) Iterator, Iterable or Generator."""
+    origin = getattr(ann, "__origin__", None)
+    return origin if origin in STREAMS else None
+
+
+def reiterable(arg) -> bool:
+    """True if iterating `arg` doesn't consume it, so its elements can be checked eagerly."""
+    return isinstance(arg, Collection) and not isinstance(arg, Iterator)
+
+
+class CheckedIterator:
+    """Iterator checking each element as it is consumed."""
+
+    __slots__ = ("_it", "_check", "_binds")
+
+    def __init__(self, it: Iterator, check, binds: GenericBindings):
+        self._it = it
+        self._check = check
+        self._binds = binds
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        value = next(self._it)
+        if (failure := self._check(value, self._binds)) is not None:
+            raise failure.exception()
+        return value
+
+
+class CheckedIterable:
+    """Iterable whose iterators check each element as it is consumed."""
+
+    __slots__ = ("_iterable", "_check", "_binds")
+
+    def __init__(self, iterable: Iterable, check, binds: GenericBindings):
+        self._iterable = iterable
+        self._check = check
+        self._binds = binds
+
+    def __iter__(self):
+        return CheckedIterator(iter(self._iterable), self._check, self._binds)
+
+
+class CheckedGenerator(Generator):
+    """Generator checking what it yields, what is sent to it and what it returns."""
+
+    __slots__ = ("_gen", "_yield", "_send", "_return", "_binds")
+
+    def __init__(self, gen: Generator, check_yield, check_send, check_return, binds):
+        self._gen = gen
+        self._yield = check_yield
+        self._send = check_send
+        self._return = check_return
+        self._binds = binds
+
+    def __next__(self):
+        return self._resume(self._gen.__next__)
+
+    def send(self, value: Any):
+        if self._send is not None:
+            if (failure := self._send(value, self._binds)) is not None:
+                raise failure.exception()
+        return self._resume(self._gen.send, value)
+
+    def throw(self, *args):
+        return self._resume(self._gen.throw, *args)
+
+    def close(self):
+        self._gen.close()
+
+    def _resume(self, step, *args):
+        try:
+            value = step(*args)
+        except StopIteration as stop:
+            if self._return is not None:
+                if (failure := self._return(stop.value, self._binds)) is not None:
+                    raise failure.exception() from None
+            raise
+
+        if (failure := self._yield(value, self._binds)) is not None:
+            raise failure.exception()
+        return value
+
+
+class CheckedAsyncIterator:
+    """Async iterator checking each element as it is consumed."""
+
+    __slots__ = ("_it", "_check", "_binds")
+
+    def __init__(self, it: AsyncIterator, check, binds: GenericBindings):
+        self._it = it
+        self._check = check
+        self._binds = binds
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        value = await anext(self._it)
+        if (failure := self._check(value, self._binds)) is not None:
+            raise failure.exception()
+        return value
+
+
+class CheckedAsyncIterable:
+    """Async iterable whose iterators check each element as it is consumed."""
+
+    __slots__ = ("_iterable", "_check", "_binds")
+
+    def __init__(self, iterable: AsyncIterable, check, binds: GenericBindings):
+        self._iterable = iterable
+        self._check = check
+        self._binds = binds
+
+    def __aiter__(self):
+        return CheckedAsyncIterator(aiter(self._iterable), self._check, self._binds)
+
+
+class CheckedAsyncGenerator(AsyncGenerator):
+    """Async generator checking what it yields and what is sent to it."""
+
+    __slots__ = ("_gen", "_yield", "_send", "_binds")
+
+    def __init__(self, gen: AsyncGenerator, check_yield, check_send, binds):
+        self._gen = gen
+        self._yield = check_yield
+        self._send = check_send
+        self._binds = binds
+
+    async def __anext__(self):
+        return self._yielded(await self._gen.__anext__())
+
+    async def asend(self, value: Any):
+        if self._send is not None:
+            if (failure := self._send(value, self._binds)) is not None:
+                raise failure.exception()
+        return self._yielded(await self._gen.asend(value))
+
+    async def athrow(self, *args):
+        return self._yielded(await self._gen.athrow(*args))
+
+    async def aclose(self):
+        await self._gen.aclose()
+
+    def _yielded(self, value):
+        if (failure := self._yield(value, self._binds)) is not None:
+            raise failure.exception()
+        return value
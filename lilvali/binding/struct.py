@@ -1,46 +1,87 @@
-from dataclasses import dataclass, field
+import threading
+
 
 from ..errors import BindingError
+from .result import Failure
+
+
+# Slots are allocated once per TypeVar, normally when annotations are compiled.
+_slots_lock = threading.Lock()
 
 
-@dataclass
-class GenericBinding:
-    """Represents a Generic type binding state."""
+def allocate_slot(slots: dict, ann) -> int:
+    """The slot of `ann` in the `slots` table, allocated if it has none."""
+    i = slots.get(ann)
+    if i is None:
+        # two TypeVars must never get the same index, even without a GIL
+        with _slots_lock:
+            i = slots.setdefault(ann, len(slots))
+    return i
 
-    ty: type = None
-    instances: list = field(default_factory=list)
 
-    @property
-    def is_bound(self):
-        """True if the GenericBinding is unbound"""
-        return self.ty is not None
+class GenericBindings(list):
+    """The Generic type bindings of a single validated call.
 
-    @property
-    def none_bound(self):
-        return len(self.instances) == 0
+    One slot per TypeVar, holding the type it is bound to or None. The slot of each TypeVar
+    is resolved once, in the checker's `slots` table, and compiled checks index straight
+    into it. Only types are stored, never the arguments that bound them.
+    """
 
-    @property
-    def can_bind_generic(self):
-        """True if the GenericBinding can bind to a new arg."""
-        return self.is_bound or self.none_bound
+    __slots__ = ("slots",)
 
-    def can_new_arg_bind(self, arg):
-        """True if a given arg can be bound to the current GenericBinding context."""
-        return not self.is_bound or self.ty == type(arg)
+    def __init__(self, slots: dict = None):
+        self.slots = {} if slots is None else slots
+        super().__init__([None] * len(self.slots))
 
-    def try_bind_new_arg(self, arg):
-        if self.can_new_arg_bind(arg):
-            self.ty = type(arg)
-            self.instances.append(arg)
-        else:
-            raise BindingError(
-                f"Generic bound to different types: {self.ty}, but arg is {type(arg)}"
-            )
+    def slot(self, ann) -> int:
+        """The slot of `ann`, allocated if it wasn't when its annotation was compiled."""
+        i = self.slots.get(ann)
+        if i is None:
+            i = allocate_slot(self.slots, ann)
+        if i >= len(self):
+            self.extend([None] * (i + 1 - len(self)))
+        return i
 
+    def bind_type(self, ann, ty: type) -> Failure | None:
+        """Bind `ann` to `ty`, returning a Failure instead of raising if it can't."""
+        i = self.slot(ann)
+        bound = self[i]
+        if bound is None:
+            self[i] = ty
+        elif bound is not ty:
+            return bind_failure(bound, ty)
 
-class GenericBindings(dict):
-    def __init__(self, generics):
-        super().__init__({G: GenericBinding() for G in generics})
+    def bind(self, ann, arg) -> Failure | None:
+        return self.bind_type(ann, type(arg))
 
     def try_bind_new_arg(self, ann, arg):
-        self.setdefault(ann, GenericBinding()).try_bind_new_arg(arg)
+        if (failure := self.bind(ann, arg)) is not None:
+            raise failure.exception()
+
+    def bound(self) -> dict:
+        """The bound TypeVars and their types."""
+        return {
+            ann: self[i]
+            for ann, i in self.slots.items()
+            if i < len(self) and self[i] is not None
+        }
+
+    def fork(self) -> "GenericBindings":
+        """An independent copy, for checks that outlive the call, like streams."""
+        forked = GenericBindings(self.slots)
+        forked[: len(self)] = self
+        return forked
+
+    def snapshot(self):
+        """Capture the bindings so a failed speculative check can be rolled back."""
+        return self[:]
+
+    def restore(self, snapshot):
+        self[:] = snapshot
+
+
+def bind_failure(bound: type, ty: type) -> Failure:
+    return Failure(
+        BindingError,
+        lambda: f"Generic bound to different types: {bound}, but arg is {ty}",
+    )
@@ -0,0 +1,303 @@
+"""Iterative checking of nested containers, see `BindCheckerConfig.iterative`.
+
+An annotation is built into a graph of nodes that `walk` checks a value against with an
+explicit stack instead of nested checker calls. Documents of any depth can be checked, and
+a failure is noted with the path of keys and indices it happened at. Annotations without a
+node kind of their own are compiled as usual and checked as leaves.
+"""
+import types, typing
+
+
+from ..errors import *
+from .cache import UnionIndex
+from .checker import variadic_tuple
+from .result import Failure
+from .sampling import ElementBudget
+from .stream import stream_origin
+
+
+# Node kinds.
+LEAF, TYPE, SEQUENCE, MAPPING, TUPLE, TYPEDDICT, UNION = range(7)
+
+
+class Node:
+    """A node of a walk graph, the fields used depend on its kind.
+
+    `exact` holds the classes whose instances pass the node without side effects, elements
+    of those classes aren't even pushed on the stack.
+    """
+
+    __slots__ = (
+        "kind",
+        "ann",
+        "exact",
+        "check",
+        "types",
+        "all_of",
+        "container",
+        "elem",
+        "key",
+        "value",
+        "items",
+        "fields",
+        "members",
+        "candidates",
+    )
+
+    def __init__(self, kind: int, ann, **fields):
+        self.kind, self.ann, self.exact = kind, ann, frozenset()
+        for name, value in fields.items():
+            setattr(self, name, value)
+
+    def become(self, other: "Node"):
+        """Turn a placeholder into `other`, for type aliases referring to themselves."""
+        for name in Node.__slots__:
+            if hasattr(other, name):
+                setattr(self, name, getattr(other, name))
+
+
+class _Key:
+    """A dict key on a path, as opposed to the value under it."""
+
+    __slots__ = ("key",)
+
+    def __init__(self, key):
+        self.key = key
+
+
+# Path entry of set elements, they have no index.
+_MEMBER = object()
+
+
+def build(compiler, ann) -> Node:
+    """The walk graph of `ann` for `compiler`."""
+    config = compiler.config
+    skip_lists = config.no_list_check or config.performance
+    skip_tuples = config.no_tuple_check or config.performance
+    skip_dicts = config.no_dict_check or config.performance
+    # budgeted and parallel containers keep their compiled checkers
+    budgeted = ElementBudget(config).active or config.parallel_threshold is not None
+    aliases = {}
+
+    def leaf(ann) -> Node:
+        return Node(LEAF, ann, check=compiler.compile(ann))
+
+    def sequence(ann, container: type, elem) -> Node:
+        skip = skip_tuples if container is tuple else skip_lists
+        if skip or budgeted:
+            return leaf(ann)
+        return Node(SEQUENCE, ann, container=container, elem=node(elem))
+
+    def mapping(ann, key, value) -> Node:
+        if skip_dicts or budgeted:
+            return leaf(ann)
+        return Node(MAPPING, ann, key=node(key), value=node(value))
+
+    def node(ann) -> Node:
+        if isinstance(ann, typing.TypeAliasType):
+            found = aliases.get(ann)
+            if found is None:
+                found = aliases[ann] = Node(LEAF, ann)
+                found.become(node(ann.__value__))
+            return found
+
+        for ty in type(ann).__mro__:
+            if ty in compiler.custom_compilers or ty in compiler._custom_checks:
+                return leaf(ann)
+
+        if (scalar := compiler._scalar_type(ann)) is not None:
+            found = Node(TYPE, ann, types=scalar, all_of=compiler._compile_bulk(scalar))
+            found.exact = frozenset({scalar})
+            return found
+
+        if isinstance(ann, types.GenericAlias | typing._GenericAlias) and not (
+            isinstance(
+                ann,
+                typing._LiteralGenericAlias
+                | typing._CallableGenericAlias
+                | typing._AnnotatedAlias,
+            )
+            or stream_origin(ann)
+        ):
+            origin, args = ann.__origin__, getattr(ann, "__args__", ())
+            if isinstance(origin, type) and args:
+                if issubclass(origin, dict) and len(args) == 2:
+                    return mapping(ann, *args)
+                elif issubclass(origin, list) and len(args) == 1:
+                    return sequence(ann, list, args[0])
+                elif issubclass(origin, set) and len(args) == 1:
+                    return sequence(ann, set, args[0])
+                elif issubclass(origin, tuple) and variadic_tuple(args):
+                    return sequence(ann, tuple, args[0])
+                elif issubclass(origin, tuple) and not skip_tuples:
+                    return Node(TUPLE, ann, items=tuple(node(a) for a in args))
+        elif isinstance(ann, list) and len(ann) == 1:
+            return sequence(ann, list, ann[0])
+        elif isinstance(ann, set) and len(ann) == 1:
+            return sequence(ann, set, next(iter(ann)))
+        elif isinstance(ann, tuple) and ann and not skip_tuples:
+            return Node(TUPLE, ann, items=tuple(node(a) for a in ann))
+        elif isinstance(ann, dict) and len(ann.get("arg_types") or ()) == 2:
+            return mapping(ann, *ann["arg_types"])
+        elif isinstance(ann, typing._TypedDictMeta) and not skip_dicts:
+            fields = {k: node(v) for k, v in ann.__annotations__.items()}
+            return Node(TYPEDDICT, ann, fields=fields)
+        elif isinstance(ann, types.UnionType | typing._UnionGenericAlias):
+            members = tuple(
+                (node(a), compiler._binds_generics(a)) for a in ann.__args__
+            )
+            found = Node(
+                UNION,
+                ann,
+                members=members,
+                candidates=UnionIndex(
+                    members, tuple(compiler._type_filter(a) for a in ann.__args__)
+                ),
+            )
+            # a scalar member accepting the value decides the Union, unless an earlier
+            # member could have bound generics to it first
+            if not any(transactional for _, transactional in members):
+                found.exact = frozenset().union(
+                    *(m.exact for m, _ in members if m.kind is TYPE)
+                )
+            return found
+
+        return leaf(ann)
+
+    return node(ann)
+
+
+def walk(root: Node, arg, binds) -> Failure | None:
+    """Check `arg` against the graph from `root`, without recursing on its nesting.
+
+    Only a Union that can't tell its members apart by the value's type walks each
+    candidate separately.
+    """
+    stack = [(root, arg, None)]
+    pop, push = stack.pop, stack.append
+
+    while stack:
+        node, arg, path = pop()
+        kind = node.kind
+
+        if kind is LEAF:
+            if (failure := node.check(arg, binds)) is not None:
+                return _at(failure, path)
+
+        elif kind is TYPE:
+            if not isinstance(arg, node.types):
+                return _at(_invalid(node.ann, arg), path)
+
+        elif kind is SEQUENCE:
+            container, elem = node.container, node.elem
+            if not isinstance(arg, container):
+                return _at(_not_a(arg, container), path)
+
+            if elem.kind is TYPE:
+                if not elem.all_of(arg):
+                    # find the failing element for the error
+                    for i, a in enumerate(arg):
+                        if not isinstance(a, elem.types):
+                            key = _MEMBER if container is set else i
+                            return _at(_invalid(elem.ann, a), (path, key))
+                continue
+
+            exact = elem.exact
+            if container is not set:
+                # pushed last to first so they're checked in order
+                for i in range(len(arg) - 1, -1, -1):
+                    if type(a := arg[i]) not in exact:
+                        push((elem, a, (path, i)))
+            else:
+                pending = [
+                    (elem, a, (path, _MEMBER)) for a in arg if type(a) not in exact
+                ]
+                pending.reverse()
+                stack.extend(pending)
+
+        elif kind is MAPPING:
+            if not isinstance(arg, dict):
+                return _at(_not_a(arg, dict), path)
+
+            key, value = node.key, node.value
+            key_exact, value_exact = key.exact, value.exact
+            for k, v in reversed(arg.items()):
+                if type(v) not in value_exact:
+                    push((value, v, (path, k)))
+                if type(k) not in key_exact:
+                    push((key, k, (path, _Key(k))))
+
+        elif kind is TUPLE:
+            if not isinstance(arg, tuple):
+                return _at(_not_a(arg, tuple), path)
+
+            items = node.items
+            # like the compiled check, tuples of another length aren't checked further
+            if len(arg) == len(items):
+                for i in range(len(items) - 1, -1, -1):
+                    if type(a := arg[i]) not in items[i].exact:
+                        push((items[i], a, (path, i)))
+
+        elif kind is TYPEDDICT:
+            fields = node.fields
+            for k, v in reversed(arg.items()):
+                push((fields[k], v, (path, k)))
+
+        else:
+            candidates = node.candidates(arg)
+            if len(candidates) == 1:
+                # no ambiguity, the member's own failure is the precise one
+                push((candidates[0][0], arg, path))
+                continue
+
+            for member, transactional in candidates:
+                # a member could bind and then fail, so roll back any bound remnants.
+                if transactional:
+                    snapshot = binds.snapshot()
+                if walk(member, arg, binds) is None:
+                    break
+                if transactional:
+                    binds.restore(snapshot)
+            else:
+                ann = node.ann
+                return _at(
+                    Failure(
+                        ValidationError, lambda: f"{arg=} failed to bind to {ann=}"
+                    ),
+                    path,
+                )
+
+
+def format_path(path) -> str:
+    """A path of the walk as `$[0]['key']`, dict keys show as `[<key 'key'>]`."""
+    keys = []
+    while path is not None:
+        path, key = path
+        keys.append(key)
+
+    parts = ["$"]
+    for key in reversed(keys):
+        if key is _MEMBER:
+            parts.append("[*]")
+        elif isinstance(key, _Key):
+            parts.append(f"[<key {key.key!r}>]")
+        else:
+            parts.append(f"[{key!r}]")
+    return "".join(parts)
+
+
+def _at(failure: Failure, path) -> Failure:
+    if path is None:
+        return failure
+
+    error = failure.exception()
+    error.add_note(f"at {format_path(path)}")
+    return Failure(error)
+
+
+def _invalid(ann, arg) -> Failure:
+    return Failure(InvalidType, lambda: f"{ann=} can not validate {arg=}")
+
+
+def _not_a(arg, container: type) -> Failure:
+    return Failure(InvalidType, lambda: f"{arg=} is not a {container.__name__}")
@@ -0,0 +1,388 @@
+"""Validate JSON while decoding it.
+
+```python
+from lilvali import ingest
+
+@validate
+@dataclass
+class Record:
+    id: int
+    tags: list[str]
+
+records = ingest.loads(payload, list[Record])
+counts = ingest.loads(payload, dict[str, list[int]])
+```
+
+`payload` is UTF-8 `bytes`, a buffer like `memoryview`, or a `str`. The outer levels of the
+document are read element by element, each element is decoded by the C scanner and checked
+right away, so the first invalid element raises before the rest is decoded. Dataclasses are
+built straight from their JSON objects, wherever they are nested. Failures note the path
+they happened at, like `at $[3]['tags']`.
+"""
+import dataclasses, json, types, typing
+from dataclasses import MISSING
+from json.decoder import WHITESPACE, scanstring
+from typing import Any, Callable
+
+
+from .errors import *
+from .binding.walk import format_path
+from .validate import ValidationBindChecker
+
+
+# A reader parses and checks the value starting at `idx`, returning it and where it ends.
+Reader = Callable[[str, int, Any, Any], tuple[Any, int]]
+
+_skip = WHITESPACE.match
+
+
+def _error(message: str, s: str, idx: int) -> json.JSONDecodeError:
+    return json.JSONDecodeError(message, s, idx)
+
+
+def _fail(error: Exception, path):
+    if path is not None:
+        error.add_note(f"at {format_path(path)}")
+    raise error
+
+
+def _read_object(s: str, idx: int, path, binds, scan_once, convert_member):
+    """Read the object whose `{` is at `idx` member by member, returning it and its end.
+
+    `convert_member(key, value, path, binds)` checks each decoded value, unless it's None.
+    """
+    if s[idx : idx + 1] != "{":
+        _fail(InvalidType(f"Expecting an object at char {idx}"), path)
+
+    result = {}
+    idx = _skip(s, idx + 1).end()
+    if s[idx : idx + 1] == "}":
+        return result, idx + 1
+
+    while True:
+        if s[idx : idx + 1] != '"':
+            raise _error("Expecting property name enclosed in double quotes", s, idx)
+        key, idx = scanstring(s, idx + 1)
+
+        idx = _skip(s, idx).end()
+        if s[idx : idx + 1] != ":":
+            raise _error("Expecting ':' delimiter", s, idx)
+
+        try:
+            value, idx = scan_once(s, _skip(s, idx + 1).end())
+        except StopIteration as e:
+            raise _error("Expecting value", s, e.value) from None
+        if convert_member is not None:
+            value = convert_member(key, value, (path, key), binds)
+        result[key] = value
+
+        idx = _skip(s, idx).end()
+        c = s[idx : idx + 1]
+        if c == "}":
+            return result, idx + 1
+        elif c != ",":
+            raise _error("Expecting ',' delimiter", s, idx)
+        idx = _skip(s, idx + 1).end()
+
+
+def _container(ann) -> tuple[type | None, tuple]:
+    """list or dict if `ann` is one of them, and its element annotations."""
+    if isinstance(ann, list) and len(ann) == 1:
+        return list, (ann[0],)
+    elif isinstance(ann, dict) and len(ann.get("arg_types") or ()) == 2:
+        return dict, tuple(ann["arg_types"])
+
+    origin, args = typing.get_origin(ann), typing.get_args(ann)
+    if origin is list and len(args) == 1 or origin is dict and len(args) == 2:
+        return origin, args
+    return None, ()
+
+
+def _children(ann) -> tuple:
+    """The annotations nested in `ann`."""
+    if isinstance(ann, typing._TypedDictMeta):
+        return tuple(ann.__annotations__.values())
+    elif isinstance(ann, (list, set, tuple)):
+        return tuple(ann)
+    elif isinstance(ann, dict):
+        return tuple(ann.get("arg_types") or ())
+    return typing.get_args(ann)
+
+
+class Loader:
+    """Decodes and validates JSON documents against `target`, reusable across documents.
+
+    Dataclasses decorated with `validate` are checked by their own `__init__`, the fields of
+    other dataclasses and everything else are checked against their annotations.
+    """
+
+    def __init__(self, target, config=None):
+        self.target = target
+        self.checker = ValidationBindChecker(config=config)
+        self.scan_once = json.JSONDecoder().scan_once
+        self.read = self._reader(target)
+
+    def __call__(self, data: bytes | memoryview | str):
+        s = data if isinstance(data, str) else str(data, "utf-8")
+        binds = self.checker.new_bindings()
+
+        idx = _skip(s, 0).end()
+        if idx == len(s):
+            raise _error("Expecting value", s, idx)
+        value, end = self.read(s, idx, None, binds)
+        end = _skip(s, end).end()
+        if end != len(s):
+            raise _error("Extra data", s, end)
+        return value
+
+    def _reader(self, ann) -> Reader:
+        """Reader of the whole document, its outer level is read element by element.
+
+        Unless the elements are scalars, those are better decoded and checked all at once.
+        """
+        scan_once = self.scan_once
+        origin, args = _container(ann)
+        if isinstance(ann, typing._TypedDictMeta):
+            origin, args = dict, tuple(ann.__annotations__.values())
+        elif isinstance(ann, type) and dataclasses.is_dataclass(ann):
+            origin = ann
+        elif not any(self._structured(a) for a in args) and all(
+            self.checker._scalar_type(a) is not None for a in args
+        ):
+            origin = None
+
+        if origin is list:
+            convert_elem = self._converter(args[0])
+
+            def read_list(s, idx, path, binds):
+                if s[idx : idx + 1] != "[":
+                    _fail(InvalidType(f"Expecting an array at char {idx}"), path)
+
+                values = []
+                idx = _skip(s, idx + 1).end()
+                if s[idx : idx + 1] == "]":
+                    return values, idx + 1
+
+                while True:
+                    try:
+                        value, idx = scan_once(s, idx)
+                    except StopIteration as e:
+                        raise _error("Expecting value", s, e.value) from None
+                    values.append(convert_elem(value, (path, len(values)), binds))
+
+                    idx = _skip(s, idx).end()
+                    c = s[idx : idx + 1]
+                    if c == "]":
+                        return values, idx + 1
+                    elif c != ",":
+                        raise _error("Expecting ',' delimiter", s, idx)
+                    idx = _skip(s, idx + 1).end()
+
+            return read_list
+
+        if origin is None:
+            convert = self._converter(ann)
+
+            def read_value(s, idx, path, binds):
+                try:
+                    value, end = scan_once(s, idx)
+                except StopIteration as e:
+                    raise _error("Expecting value", s, e.value) from None
+                return convert(value, path, binds), end
+
+            return read_value
+
+        convert = None
+        if origin is dict and not isinstance(ann, typing._TypedDictMeta):
+            convert_member = self._member_converter(*args)
+        else:
+            converters = (
+                self._field_converters(ann)
+                if origin is ann
+                else {k: self._converter(v) for k, v in ann.__annotations__.items()}
+            )
+            if origin is ann:
+                convert = self._converter(ann)
+            convert_member = None
+            if converters is not None:
+                name = ann.__name__
+
+                def convert_member(k, v, path, binds):
+                    if (c := converters.get(k)) is not None:
+                        return c(v, path, binds)
+                    elif convert is None:
+                        _fail(ValidationError(f"{k!r} is not a key of {name}"), path)
+                    # unknown fields are reported by the dataclass converter
+                    return v
+
+        def read_object(s, idx, path, binds):
+            value, end = _read_object(s, idx, path, binds, scan_once, convert_member)
+            if convert is not None:
+                value = convert(value, path, binds, converted=True)
+            return value, end
+
+        return read_object
+
+    def _member_converter(self, key, value):
+        """Converter of the items of a `dict[key, value]`, JSON keys are always strings."""
+        convert_value = self._converter(value)
+        if self.checker._scalar_type(key) is str:
+            return lambda k, v, path, binds: convert_value(v, path, binds)
+
+        check_key = self.checker.compile_parameter(key)
+
+        def convert_item(k, v, path, binds):
+            if (failure := check_key(k, binds)) is not None:
+                _fail(failure.exception(), path)
+            return convert_value(v, path, binds)
+
+        return convert_item
+
+    def _structured(self, ann) -> bool:
+        """True if decoded values of `ann` must be converted, they hold dataclasses."""
+        if isinstance(ann, type) and dataclasses.is_dataclass(ann):
+            return True
+        return any(self._structured(a) for a in _children(ann))
+
+    def _converter(self, ann) -> Callable[[Any, Any, Any], Any]:
+        """Converter of a decoded value of `ann`, checking it and building its dataclasses."""
+        if isinstance(ann, type) and dataclasses.is_dataclass(ann):
+            return self._dataclass_converter(ann)
+
+        origin, args = _container(ann)
+        if origin is list and self._structured(args[0]):
+            convert_elem = self._converter(args[0])
+
+            def convert_list(value, path, binds):
+                if not isinstance(value, list):
+                    _fail(InvalidType(f"{value=} is not a list"), path)
+                return [convert_elem(v, (path, i), binds) for i, v in enumerate(value)]
+
+            return convert_list
+
+        if origin is dict and self._structured(args[1]):
+            convert_item = self._member_converter(*args)
+
+            def convert_dict(value, path, binds):
+                if not isinstance(value, dict):
+                    _fail(InvalidType(f"{value=} is not a dict"), path)
+                return {
+                    k: convert_item(k, v, (path, k), binds) for k, v in value.items()
+                }
+
+            return convert_dict
+
+        union = isinstance(ann, types.UnionType | typing._UnionGenericAlias)
+        if union and self._structured(ann):
+            members = tuple(self._converter(a) for a in ann.__args__)
+
+            def convert_union(value, path, binds):
+                # members are tried in order, the first the value converts to wins
+                for convert in members:
+                    try:
+                        return convert(value, path, binds)
+                    except ValidationError:
+                        pass
+                _fail(ValidationError(f"{value=} failed to bind to {ann=}"), path)
+
+            return convert_union
+
+        if isinstance(ann, typing._TypedDictMeta) and self._structured(ann):
+            converters = {k: self._converter(v) for k, v in ann.__annotations__.items()}
+            name = ann.__name__
+
+            def convert_typeddict(value, path, binds):
+                if not isinstance(value, dict):
+                    _fail(InvalidType(f"{value=} is not a dict"), path)
+                if not converters.keys() >= value.keys():
+                    unknown = next(k for k in value if k not in converters)
+                    _fail(ValidationError(f"{unknown!r} is not a key of {name}"), path)
+                return {k: converters[k](v, (path, k), binds) for k, v in value.items()}
+
+            return convert_typeddict
+
+        check = self.checker.compile_parameter(ann)
+
+        def convert_checked(value, path, binds):
+            if (failure := check(value, binds)) is not None:
+                _fail(failure.exception(), path)
+            return value
+
+        return convert_checked
+
+    def _field_converters(self, cls: type) -> dict | None:
+        """Converters of the fields of a dataclass, None if its fields are taken as they are.
+
+        A validated dataclass checks its fields itself when it's built, so only fields
+        holding dataclasses to build are converted.
+        """
+        hints = typing.get_type_hints(cls)
+        fields = [f.name for f in dataclasses.fields(cls) if f.init]
+
+        if hasattr(cls.__init__, "generator"):
+            converters = {
+                f: self._converter(hints[f])
+                for f in fields
+                if self._structured(hints[f])
+            }
+            return converters or None
+        return {f: self._converter(hints[f]) for f in fields}
+
+    def _dataclass_converter(self, cls: type) -> Callable[..., Any]:
+        converters = self._field_converters(cls)
+        fields = {f.name: f for f in dataclasses.fields(cls) if f.init}
+        name = cls.__name__
+
+        def convert_dataclass(value, path, binds, converted=False):
+            if not isinstance(value, dict):
+                _fail(InvalidType(f"{value=} is not a {name} object"), path)
+
+            if converters is not None and not converted:
+                value = {
+                    k: v if (c := converters.get(k)) is None else c(v, (path, k), binds)
+                    for k, v in value.items()
+                }
+
+            try:
+                return cls(**value)
+            except ValidationError as e:
+                _fail(e, path)
+            except TypeError:
+                # tell unknown and missing fields apart from errors of the class itself
+                for k in value:
+                    if k not in fields:
+                        _fail(ValidationError(f"{k!r} is not a field of {name}"), path)
+                for k, f in fields.items():
+                    if k not in value and f.default is f.default_factory is MISSING:
+                        _fail(ValidationError(f"missing field {k!r} of {name}"), path)
+                raise
+
+        return convert_dataclass
+
+
+# Loaders of the targets passed to `loads` without a config.
+_loaders = {}
+
+# Bounds the targets `loads` keeps a loader for.
+_MAX_LOADERS = 256
+
+
+def loads(data: bytes | memoryview | str, target, config=None):
+    """Decode the JSON document `data` into a valid instance of the annotation `target`.
+
+    Raises the first ValidationError met, or json.JSONDecodeError if `data` isn't JSON.
+    Loaders are only reused without a config, keep a `Loader` to reuse one with a config.
+    """
+    if config is not None:
+        return Loader(target, config)(data)
+
+    try:
+        loader = _loaders.get(target)
+    except TypeError:
+        return Loader(target)(data)
+
+    if loader is None:
+        loader = Loader(target)
+        if len(_loaders) < _MAX_LOADERS:
+            _loaders[target] = loader
+    return loader(data)
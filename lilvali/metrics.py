@@ -0,0 +1,154 @@
+"""Per-function validation metrics.
+
+Functions validated with `config={"metrics": True}`, or all functions decorated after
+`enable()` (or with `LILVALI_METRICS=1` in the environment), count their calls, failures
+and time spent. Without metrics a validated call only pays for one attribute check.
+
+```python
+from lilvali import metrics
+
+metrics.enable()
+...
+print(metrics.format_stats(metrics.snapshot()))
+```
+
+Counters aren't locked, under heavy concurrency they are approximate.
+"""
+import json, os, runpy, sys, weakref
+from collections import Counter, deque
+from typing import Callable
+
+
+_enabled = os.environ.get("LILVALI_METRICS", "").lower() in ("1", "true")
+_registry = weakref.WeakSet()
+
+# Validation times kept per function for the percentiles.
+SAMPLES = 1024
+
+
+class FunctionMetrics:
+    """The counters of one validated function, times are in seconds."""
+
+    __slots__ = (
+        "name",
+        "calls",
+        "failures",
+        "validation_time",
+        "body_time",
+        "return_time",
+        "_samples",
+        "__weakref__",
+    )
+
+    def __init__(self, name: str):
+        self.name = name
+        self.reset()
+
+    def reset(self):
+        self.calls = 0
+        self.failures = Counter()
+        self.validation_time = self.body_time = self.return_time = 0.0
+        self._samples = deque(maxlen=SAMPLES)
+
+    def record(self, validation: float, body: float, ret: float):
+        """A successful call, with the time spent checking arguments, in the body and checking the result."""
+        self.calls += 1
+        self.validation_time += validation + ret
+        self.body_time += body
+        self.return_time += ret
+        self._samples.append(validation + ret)
+
+    def failed(self, error: Exception, validation: float):
+        self.calls += 1
+        self.failures[type(error).__name__] += 1
+        self.validation_time += validation
+        self._samples.append(validation)
+
+    def percentiles(self, qs=(50, 90, 99)) -> dict:
+        """Validation time percentiles over the last SAMPLES calls."""
+        samples = sorted(self._samples)
+        if not samples:
+            return {}
+        return {q: samples[min(len(samples) - 1, len(samples) * q // 100)] for q in qs}
+
+    def snapshot(self) -> dict:
+        return {
+            "calls": self.calls,
+            "failures": dict(self.failures),
+            "validation_time": self.validation_time,
+            "body_time": self.body_time,
+            "return_time": self.return_time,
+            "percentiles": {f"p{q}": t for q, t in self.percentiles().items()},
+        }
+
+
+def enable(on: bool = True):
+    """Record metrics for every function validated from now on."""
+    global _enabled
+    _enabled = on
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def register(func: Callable) -> FunctionMetrics:
+    module = getattr(func, "__module__", None)
+    qualname = getattr(func, "__qualname__", repr(func))
+    metrics = FunctionMetrics(f"{module}.{qualname}" if module else qualname)
+    _registry.add(metrics)
+    return metrics
+
+
+def unregister(metrics: FunctionMetrics):
+    _registry.discard(metrics)
+
+
+def snapshot() -> dict:
+    """The metrics of every live function recording them, by qualified name."""
+    result = {}
+    for metrics in sorted(_registry, key=lambda m: m.name):
+        name, n = metrics.name, 1
+        while name in result:
+            n += 1
+            name = f"{metrics.name}#{n}"
+        result[name] = metrics.snapshot()
+    return result
+
+
+def reset():
+    for metrics in list(_registry):
+        metrics.reset()
+
+
+def format_stats(stats: dict) -> str:
+    """A table of a `snapshot()`, the most expensive validation first."""
+    lines = [
+        f"{'function':<40} {'calls':>8} {'failed':>7} {'validate':>10} {'body':>10} {'p50':>9} {'p99':>9}"
+    ]
+    for name, s in sorted(stats.items(), key=lambda kv: -kv[1]["validation_time"]):
+        p = s["percentiles"]
+        lines.append(
+            f"{name:<40} {s['calls']:>8} {sum(s['failures'].values()):>7} "
+            f"{s['validation_time'] * 1e3:>8.2f}ms {s['body_time'] * 1e3:>8.2f}ms "
+            f"{p.get('p50', 0) * 1e6:>7.2f}us {p.get('p99', 0) * 1e6:>7.2f}us"
+        )
+    return "\n".join(lines)
+
+
+def main(args) -> int:
+    """Entry point of `lilvali stats`, runs a script with metrics on and prints them."""
+    enable()
+    sys.argv = [args.script, *args.args]
+    try:
+        # hold on to the script's globals, metrics only live as long as their functions
+        namespace = runpy.run_path(args.script, run_name="__main__")
+    finally:
+        stats = snapshot()
+        print(format_stats(stats))
+
+        if args.json:
+            with open(args.json, "w") as f:
+                json.dump(stats, f, indent=2)
+
+    return 0
@@ -0,0 +1,109 @@
+"""Structured instrumentation of validated calls.
+
+Whether a validated function is traced is decided when its plan is compiled. With no
+hook installed (and the `lilvali.trace` logger below DEBUG) the plan contains no tracing
+code at all, so there is nothing left to pay on the hot path.
+
+```python
+from lilvali import trace
+
+@trace.add_hook
+def on_event(event: trace.TraceEvent):
+    if event.kind == "fail":
+        print(event.func, event.param, event.payload["error"])
+```
+"""
+import logging, reprlib, weakref
+from typing import (
+    Any,
+    Callable,
+)
+
+
+log = logging.getLogger(__name__)
+
+_hooks: tuple = ()
+# Weak references to the subscribed callbacks, in order, each drops itself with its owner.
+_subscribers: dict = {}
+
+
+class TraceEvent:
+    """A validation event, its payload is only built if a hook asks for it."""
+
+    __slots__ = ("kind", "func", "param", "ann", "_payload")
+
+    def __init__(self, kind: str, func: str, param: str, ann: Any, payload):
+        self.kind = kind
+        self.func = func
+        self.param = param
+        self.ann = ann
+        self._payload = payload
+
+    @property
+    def payload(self) -> dict:
+        if callable(self._payload):
+            self._payload = self._payload()
+        return self._payload
+
+    def __repr__(self):
+        # bounded, payloads can be arbitrarily large or deep
+        payload = reprlib.repr(self.payload)
+        return (
+            f"TraceEvent({self.kind} {self.func}({self.param}: {self.ann!r}) {payload})"
+        )
+
+
+def add_hook(hook: Callable[[TraceEvent], None]):
+    """Install a hook called with every TraceEvent, can be used as a decorator."""
+    global _hooks
+    _hooks = (*_hooks, hook)
+    _notify()
+    return hook
+
+
+def remove_hook(hook: Callable[[TraceEvent], None]):
+    global _hooks
+    _hooks = tuple(h for h in _hooks if h is not hook)
+    _notify()
+
+
+def enabled() -> bool:
+    """True if compiled plans should include tracing."""
+    return bool(_hooks) or log.isEnabledFor(logging.DEBUG)
+
+
+def subscribe(callback: Callable[[], None]):
+    """Call the bound method `callback` whenever the hooks change."""
+    _subscribers[weakref.WeakMethod(callback, _unsubscribe)] = None
+
+
+def _unsubscribe(ref: weakref.WeakMethod):
+    _subscribers.pop(ref, None)
+
+
+def _notify():
+    for ref in list(_subscribers):
+        if (callback := ref()) is not None:
+            callback()
+
+
+def emit(event: TraceEvent):
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("%r", event)
+
+    for hook in _hooks:
+        hook(event)
+
+
+def traced(check, func: str, param: str, ann: Any):
+    """Wrap a compiled checker so that it emits `check` and `fail` events."""
+
+    def check_traced(arg, binds):
+        emit(TraceEvent("check", func, param, ann, lambda: {"arg": arg}))
+        failure = check(arg, binds)
+        if failure is not None:
+            payload = lambda: {"arg": arg, "error": failure.exception()}
+            emit(TraceEvent("fail", func, param, ann, payload))
+        return failure
+
+    return check_traced
@@ -1,12 +1,17 @@
 from .checker import ValidationBindChecker, ValidatorFunction
-from .validator import TypeValidator
-from .decorators import validate, validator
+from .validator import TypeValidator, LazyTypeValidator
+from .decorators import validate, validator, strip, stripped, defer, deferred
 
 
 __all__ = [
     "validate",
     "validator",
+    "strip",
+    "stripped",
+    "defer",
+    "deferred",
     "TypeValidator",
+    "LazyTypeValidator",
     "ValidatorFunction",
     "ValidationBindChecker",
 ]
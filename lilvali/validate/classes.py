@@ -0,0 +1,239 @@
+import inspect, logging
+from functools import update_wrapper
+from inspect import Parameter
+from time import perf_counter
+
+
+from .. import metrics, trace
+from ..errors import *
+from ..binding.compiler import run_validators
+from .checker import ValidationBindChecker, ValidatorFunction
+
+
+log = logging.getLogger(__name__)
+
+
+class InitGenerator:
+    """Generates a specialized, validating `__init__` for a class from source.
+
+    Like `dataclasses`, the checks are written out per parameter: plain classes become an
+    inline isinstance, other annotations call their compiled checker, and the class's
+    `_<field>` validators are called right after their field's check. The result is a
+    real function, so it binds to instances like any method.
+
+    Only the arguments a call passes are checked, like `TypeValidator`, so defaults and
+    dataclasses' default factories are never checked.
+    """
+
+    def __init__(self, cls: type, config=None):
+        self.cls = cls
+        self.init = cls.__init__
+        self.signature = inspect.signature(self.init)
+        self.annotations = inspect.getfullargspec(self.init).annotations
+        self.generics = getattr(self.init, "__type_params__", ())
+
+        self.field_validators = {
+            name: vf
+            for name in self.signature.parameters
+            if isinstance(vf := getattr(cls, f"_{name}", None), ValidatorFunction)
+        }
+
+        self.bind_checker = ValidationBindChecker(config=config)
+        self.metrics = None
+        self.namespace = {}
+        self.function = self._generate()
+        update_wrapper(self.function, self.init)
+        self.function.bind_checker = self.bind_checker
+        self.function.generator = self
+        self.function.metrics = self.metrics
+        self.function.checking_on = self.checking_on
+        self.function.checking_off = self.checking_off
+
+        self.bind_checker.subscribe(self.regenerate)
+        trace.subscribe(self.regenerate)
+
+    def regenerate(self):
+        """Recompile the checks in place, the installed `__init__` stays the same object."""
+        self.function.__code__ = self._generate().__code__
+        self.function.metrics = self.metrics
+
+    def checking_on(self):
+        """Turn type validation on."""
+        self.bind_checker.config.disabled = False
+
+    def checking_off(self):
+        """Turn type validation off."""
+        self.bind_checker.config.disabled = True
+
+    def _generate(self):
+        source, namespace = self._source()
+        log.debug("Generated __init__ for %r:\n%s", self.cls, source)
+
+        # the generated function's globals, it's updated in place on regeneration
+        self.namespace.clear()
+        self.namespace.update(namespace)
+        exec(source, self.namespace)
+        return self.namespace["__init__"]
+
+    def _update_metrics(self):
+        """Register or drop `self.metrics`, they can be turned on and off with the config."""
+        if self.bind_checker.config.metrics or metrics.enabled():
+            if self.metrics is None:
+                self.metrics = metrics.register(self.init)
+        elif self.metrics is not None:
+            metrics.unregister(self.metrics)
+            self.metrics = None
+
+    def _source(self) -> tuple[str, dict]:
+        checker = self.bind_checker
+        traced = trace.enabled()
+        qualname = f"{self.cls.__qualname__}.__init__"
+        self._update_metrics()
+
+        ns = {
+            "__init": self.init,
+            "__config": checker.config,
+            "__InvalidType": InvalidType,
+            "__run_validators": run_validators,
+            "__MISSING": _MISSING,
+        }
+        params, call, body, defaults = [], [], [], []
+
+        anns = {
+            n: a for n, a in self.annotations.items() if n != "return" and a is not None
+        }
+        binds = "None"
+        if any(checker._binds_generics(a) for a in anns.values()):
+            ns["__new_bindings"] = checker.new_bindings
+            checker.new_bindings(self.generics)
+            binds = "__binds"
+            body.append("__binds = __new_bindings()")
+
+        def check(value: str, name: str):
+            ann = anns.get(name)
+            if ann is not None:
+                ty = checker._scalar_type(ann)
+                if ty is not None and not traced:
+                    ns[f"__type_{name}"] = ty
+                    body.extend(
+                        [
+                            f"if not isinstance({value}, __type_{name}):",
+                            f"    raise __InvalidType(f'ann={{__type_{name}!r}} can not validate arg={{{value}!r}}')",
+                        ]
+                    )
+                else:
+                    compiled = checker.compile_parameter(ann)
+                    if traced:
+                        compiled = trace.traced(compiled, qualname, name, ann)
+                    ns[f"__check_{name}"] = compiled
+                    body.extend(
+                        [
+                            f"if (__failure := __check_{name}({value}, {binds})) is not None:",
+                            "    raise __failure.exception()",
+                        ]
+                    )
+
+                # field validators run like the custom validators of the field's type
+                if (vf := self.field_validators.get(name)) is not None:
+                    ns[f"__validators_{name}"], ns[f"__ann_{name}"] = (vf,), ann
+                    body.extend(
+                        [
+                            f"if (__failure := __run_validators(__validators_{name}, {value}, __ann_{name})) is not None:",
+                            "    raise __failure.exception()",
+                        ]
+                    )
+
+        streams = []
+        kwonly = False
+        for i, p in enumerate(self.signature.parameters.values()):
+            name = p.name
+            default = ""
+            if p.default is not Parameter.empty:
+                ns[f"__default_{name}"] = p.default
+                default = "=__MISSING"
+                defaults.extend(
+                    [f"if {name} is __MISSING:", f"    {name} = __default_{name}"]
+                )
+
+            if p.kind is Parameter.VAR_POSITIONAL:
+                kwonly = True
+                params.append(f"*{name}")
+                call.append(f"*{name}")
+                body.append(f"for __arg in {name}:")
+                start = len(body)
+                check("__arg", name)
+                body[start:] = ["    " + line for line in body[start:]] or ["    pass"]
+            elif p.kind is Parameter.VAR_KEYWORD:
+                params.append(f"**{name}")
+                call.append(f"**{name}")
+                body.append(f"for __arg in {name}.values():")
+                start = len(body)
+                check("__arg", name)
+                body[start:] = ["    " + line for line in body[start:]] or ["    pass"]
+            else:
+                if p.kind is Parameter.KEYWORD_ONLY and not kwonly:
+                    kwonly = True
+                    params.append("*")
+                params.append(f"{name}{default}")
+                call.append(f"{name}={name}" if kwonly else name)
+                # the first parameter is the instance
+                start = len(body)
+                if i:
+                    check(name, name)
+                if default and len(body) > start:
+                    body[start:] = [f"if {name} is not __MISSING:"] + [
+                        "    " + line for line in body[start:]
+                    ]
+
+                if name in anns and (wrap := checker.compile_stream(anns[name])):
+                    ns[f"__stream_{name}"] = wrap
+                    stream = f"{name} = __stream_{name}({name}, {binds})"
+                    if default:
+                        stream = f"if {name} is not __MISSING: {stream}"
+                    streams.append(stream)
+
+            if p.kind is Parameter.POSITIONAL_ONLY and (
+                i + 1 == len(self.signature.parameters)
+                or list(self.signature.parameters.values())[i + 1].kind
+                is not Parameter.POSITIONAL_ONLY
+            ):
+                params.append("/")
+
+        body.extend(streams)
+        init = f"__init({', '.join(call)})"
+
+        lines = [
+            f"def __init__({', '.join(params)}):",
+            "    if __config.disabled:",
+            *("        " + line for line in defaults),
+            f"        return {init}",
+        ]
+        if self.metrics is None:
+            lines += [
+                *("    " + line for line in body),
+                *("    " + line for line in defaults),
+                f"    {init}",
+            ]
+        else:
+            ns.update(
+                __metrics=self.metrics,
+                __perf_counter=perf_counter,
+                __ValidationError=ValidationError,
+            )
+            lines += [
+                "    __start = __perf_counter()",
+                "    try:",
+                *("        " + line for line in body or ["pass"]),
+                "    except __ValidationError as __e:",
+                "        __metrics.failed(__e, __perf_counter() - __start)",
+                "        raise",
+                "    __checked = __perf_counter()",
+                *("    " + line for line in defaults),
+                f"    {init}",
+                "    __metrics.record(__checked - __start, __perf_counter() - __checked, 0.0)",
+            ]
+        return "\n".join(lines) + "\n", ns
+
+
+# The default of the generated parameters, tells the arguments a call left out.
+_MISSING = object()
@@ -1,6 +1,6 @@
 #!/usr/bin/env python
-import inspect, logging
-from functools import partial, wraps
+import inspect, logging, os
+from functools import cache, partial, wraps
 from typing import (
     Callable,
     Optional,
@@ -12,10 +12,47 @@ from functools import wraps
 from ..errors import *
 from ..binding import BindCheckerConfig
 from .checker import ValidatorFunction
-from .validator import TypeValidator
+from .classes import InitGenerator
+from .validator import TypeValidator, LazyTypeValidator
 
 log = logging.getLogger(__name__)
 
+# In strip mode the decorators hand back what they decorate, so calls cost nothing.
+_stripped = os.environ.get("LILVALI_STRIP", "").lower() in ("1", "true")
+
+
+def strip(on: bool = True):
+    """Make `validate` and `validator` return what they decorate untouched from now on.
+
+    Only affects decorations made after the call, already validated code stays validated.
+    Stripped functions are the originals, so they don't have `checking_on()` and the like.
+    """
+    global _stripped
+    _stripped = on
+
+
+def stripped() -> bool:
+    return _stripped
+
+
+# In lazy mode validated functions are only built on their first call.
+_deferred = os.environ.get("LILVALI_LAZY", "").lower() in ("1", "true")
+
+
+def defer(on: bool = True):
+    """Make `validate` defer the work on functions to their first call from now on.
+
+    Decorating then only records the function, its signature, checker and plans are built
+    on the first call or attribute access, which also raises any error they run into.
+    Classes are still validated right away.
+    """
+    global _deferred
+    _deferred = on
+
+
+def deferred() -> bool:
+    return _deferred
+
 
 def validator(func: Callable = None, *, base: Optional[type] = None, **config):
     """Decorator to create custom validator functions for use in validated annotations.
@@ -30,6 +67,8 @@ def validator(func: Callable = None, *, base: Optional[type] = None, **config):
     """
     if func is None or not callable(func):
         return partial(validator, base=base, config=config)
+    elif _stripped:
+        return func
     else:
         return ValidatorFunction(func, base, config)
 
@@ -53,47 +92,41 @@ def validate(
         return b * a
     ```
     """
-    log.debug(f"{target=} {config=}")
+    log.debug("target=%r config=%r", target, config)
 
     def _validate_function(func, config):
-        return wraps(func)(TypeValidator(func, config=config))
+        if _deferred:
+            # the config is only made once the function is built
+            return wraps(func)(LazyTypeValidator(func, config=config))
+        return wraps(func)(TypeValidator(func, config=config()))
 
     def _validate_class(cls, config):
-        cls.__init__.validated_base_cls = cls
-
-        # Wrap __init__ for validation
-        V = _validate_function(cls.__init__, config)
-        cls.__init__ = V
-
-        # Inspect the __init__ method to find the fields
-        type_annotations = getattr(cls.__init__, "__annotations__", {})
-
-        for arg in type_annotations:
-            vf = getattr(cls, f"_{arg}", None)
-            if isinstance(vf, ValidatorFunction):
-                field_type = type_annotations.get(arg, None)
-                if field_type:
-                    V.bind_checker.register_custom_validator(field_type, vf)
-
+        # Replace __init__ with one generated to check its fields, including the
+        # `_<field>` validators defined on the class.
+        cls.__init__ = InitGenerator(cls, config=config()).function
         return cls
 
-    if isinstance(config, dict):
-        if not isinstance(config, BindCheckerConfig):
-            config = BindCheckerConfig(**config)
-    elif config is not None and not isinstance(config, BindCheckerConfig):
+    if config is not None and not isinstance(config, dict):
         raise TypeError(
             f"{config=} must be a dict or BindCheckerConfig, not {type(config)}"
         )
-    else:
-        config = BindCheckerConfig()
+
+    @cache
+    def shared_config() -> BindCheckerConfig:
+        """The config of everything this call decorates, made on first use."""
+        if isinstance(config, BindCheckerConfig):
+            return config
+        return BindCheckerConfig(**(config or {}))
 
     def decorator(func_or_cls):
-        if inspect.isclass(func_or_cls):
-            log.debug(f"Class {func_or_cls=}")
-            return _validate_class(func_or_cls, config)
+        if _stripped:
+            return func_or_cls
+        elif inspect.isclass(func_or_cls):
+            log.debug("Class func_or_cls=%r", func_or_cls)
+            return _validate_class(func_or_cls, shared_config)
         elif callable(func_or_cls):
-            log.debug(f"Function {func_or_cls=}")
-            return _validate_function(func_or_cls, config)
+            log.debug("Function func_or_cls=%r", func_or_cls)
+            return _validate_function(func_or_cls, shared_config)
         else:
             raise TypeError("Invalid target for validation")
 
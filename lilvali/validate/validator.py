@@ -1,10 +1,13 @@
-import inspect, logging
-from itertools import chain
+import inspect, logging, threading
+from time import perf_counter
 from typing import (
     Callable,
+    Iterable,
 )
 
 
+from .. import metrics, trace
+from ..errors import ValidationError
 from .checker import ValidationBindChecker
 
 
@@ -16,64 +19,308 @@ class TypeValidator:
 
     def __init__(self, func: type | Callable, config=None):
         self.func = func
-        if hasattr(func, "validated_base_cls"):
-            self._cls = func.validated_base_cls
-        else:
-            log.debug("NO CLASS!")
-            self._cls = None
-
         self.argspec, self.generics = inspect.getfullargspec(func), func.__type_params__
 
+        self._mark_kind(func)
+
         self.bind_checker = ValidationBindChecker(config=config)
+        self.metrics = None
+
+        self._compile_plans()
+        self.bind_checker.subscribe(self._compile_plans)
+        trace.subscribe(self._compile_plans)
+
+    def _mark_kind(self, func: Callable):
+        """Make `inspect` see the wrapper as a coroutine or async generator function like `func`."""
+        # arguments are checked when a coroutine is created, the result once it's awaited.
+        self.is_coroutine = inspect.iscoroutinefunction(func)
+        if self.is_coroutine:
+            inspect.markcoroutinefunction(self)
+        elif inspect.isasyncgenfunction(func):
+            # there is no marker for those, function-like objects are told apart by their code
+            self.__code__ = func.__code__
+            self.__defaults__, self.__kwdefaults__ = (
+                func.__defaults__,
+                func.__kwdefaults__,
+            )
+
+    def _compile_plans(self):
+        """Compile the argument and return annotations into an argument-binding plan.
+
+        Positional indices and keyword names map straight to their checker closures so
+        that a call only visits its annotated parameters.
+        """
+        spec = self.argspec
+        annotations = spec.annotations
+        compile, compile_bulk = (
+            self.bind_checker.compile_parameter,
+            self.bind_checker.compile_bulk,
+        )
+
+        plans = {
+            name: compile(ann) for name, ann in annotations.items() if ann is not None
+        }
+
+        # batches check whole columns at once where an annotation has a bulk fast path.
+        self._bulk_plan = {}
+        if not trace.enabled():
+            for name, ann in annotations.items():
+                if name != "return" and (bulk := compile_bulk(ann)) is not None:
+                    self._bulk_plan[name] = bulk
+
+        # calls only get bindings if some annotation could bind generics, the slots of
+        # the function's type params are reserved up front.
+        self._needs_binds = any(
+            self.bind_checker._binds_generics(ann)
+            for ann in annotations.values()
+            if ann is not None
+        )
+        self.bind_checker.new_bindings(self.generics)
+
+        # tracing is decided here, untraced plans carry no instrumentation at all.
+        if trace.enabled():
+            qualname = getattr(self.func, "__qualname__", repr(self.func))
+            plans = {
+                name: trace.traced(check, qualname, name, annotations[name])
+                for name, check in plans.items()
+            }
+
+        self._nparams = len(spec.args)
+        self._pos_plan = tuple(
+            (i, plans[name]) for i, name in enumerate(spec.args) if name in plans
+        )
+        self._varargs_plan = plans.get(spec.varargs)
+        # unannotated parameters map to None so they aren't mistaken for **kwargs
+        self._kw_plan = {name: plans.get(name) for name in spec.args + spec.kwonlyargs}
+        self._varkw_plan = plans.get(spec.varkw)
+
+        self._ret_plan = plans.pop("return", None)
+
+        # Iterators and generators are wrapped to be checked lazily as they're consumed.
+        streams = {
+            name: wrap
+            for name, ann in annotations.items()
+            if ann is not None
+            and (wrap := self.bind_checker.compile_stream(ann)) is not None
+        }
+        self._ret_stream = streams.pop("return", None)
+        self._streams = streams
+
+        # metrics can be turned on and off at runtime with the config.
+        if self.bind_checker.config.metrics or metrics.enabled():
+            if self.metrics is None:
+                self.metrics = metrics.register(self.func)
+        elif self.metrics is not None:
+            metrics.unregister(self.metrics)
+            self.metrics = None
 
     def __call__(self, *args, **kwargs):
         """Validating wrapper for the bound self.func"""
-        # if the function is a method, add the class to the args.
-        if "self" in self.argspec.args:
-            if self._cls is not None:
-                args = (self._cls, *args)
-
         # If disabled, just call the function being validated.
         if self.bind_checker.config.disabled:
             return self.func(*args, **kwargs)
 
-        # First refresh the BindChecker with new bindings on func call,
-        self.bind_checker.new_bindings(self.generics)
+        if self.metrics is not None:
+            return self._call_measured(args, kwargs)
 
-        fixed_args = zip(self.argspec.args, args)
-        var_args = (
-            (self.argspec.varargs, arg) for arg in args[len(self.argspec.args) :]
-        )
-        all_args = list(chain(fixed_args, var_args, kwargs.items()))
-
-        # then check all args against their type hints.
-        for name, arg in all_args:
-            ann = self.argspec.annotations.get(name)
-            if ann is not None:
-                # print(f"{name=} {ann=} {arg=}")
-                self.bind_checker.check(ann, arg)
-
-        # After ensuring all generic values can bind,
-        checked = self.bind_checker.checked
-        if all(checked):
-            # call the function being validated.
-            result = self.func(*args, **kwargs)
-
-            # If there is a return annotation
-            if "return" in self.argspec.annotations:
-                ret_ann = self.argspec.annotations["return"]
-                log.debug(
-                    "Return: annotations=%s result_type=%s return_spec=%s",
-                    self.argspec.annotations,
-                    type(result),
-                    ret_ann,
-                )
-
-                # check it.
-                if self.bind_checker.config.ret_validation and ret_ann is not None:
-                    self.bind_checker.check(ret_ann, result)
-            # Finally, return the results if nothing has gone wrong.
-            return result
+        args, kwargs, binds = self._check_args(args, kwargs)
+
+        # After ensuring all generic values can bind, call the function being validated.
+        result = self.func(*args, **kwargs)
+
+        # If there is a return annotation
+        if self._ret_plan is not None:
+            # check it.
+            if self.bind_checker.config.ret_validation:
+                return self._check_return(result, binds)
+        # Finally, return the results if nothing has gone wrong.
+        return result
+
+    def _check_args(self, args: tuple, kwargs: dict):
+        """Check all args against their compiled type hints, returning the call's bindings."""
+        # First create the generic bindings for this call only, so concurrent and
+        # reentrant calls never see each other's bindings.
+        binds = self.bind_checker.new_bindings() if self._needs_binds else None
+
+        nargs = len(args)
+        # Checks return their failures, this is the only place they become exceptions.
+        for i, check in self._pos_plan:
+            if i >= nargs:
+                break
+            if (failure := check(args[i], binds)) is not None:
+                raise failure.exception()
+
+        if (check := self._varargs_plan) is not None:
+            for i in range(self._nparams, nargs):
+                if (failure := check(args[i], binds)) is not None:
+                    raise failure.exception()
+
+        if kwargs:
+            kw_plan, varkw_plan = self._kw_plan, self._varkw_plan
+            for name, arg in kwargs.items():
+                check = kw_plan.get(name, varkw_plan)
+                if check is not None and (failure := check(arg, binds)) is not None:
+                    raise failure.exception()
+
+        if self._streams:
+            args, kwargs = self._wrap_streams(args, kwargs, binds)
+
+        return args, kwargs, binds
+
+    def _check_return(self, result, binds):
+        """Check the result against the return annotation, returning what to return."""
+        if self.is_coroutine:
+            return self._checked_result(result, binds)
+        return self._check_returned(result, binds)
+
+    def _check_returned(self, result, binds):
+        """Check a value the function returned, coroutines' once they're awaited."""
+        if (failure := self._ret_plan(result, binds)) is not None:
+            raise failure.exception()
+        if self._ret_stream is not None:
+            result = self._ret_stream(result, binds)
+        return result
+
+    def _call_measured(self, args: tuple, kwargs: dict):
+        """`__call__` recording its timings and failures in `self.metrics`."""
+        metrics = self.metrics
+        start = perf_counter()
+        try:
+            args, kwargs, binds = self._check_args(args, kwargs)
+        except ValidationError as e:
+            metrics.failed(e, perf_counter() - start)
+            raise
+
+        checked = perf_counter()
+        if self.is_coroutine:
+            # the body only runs once the coroutine is awaited, it's measured from there
+            coro = self.func(*args, **kwargs)
+            return self._checked_result(coro, binds, (metrics, start, checked))
+
+        result = self.func(*args, **kwargs)
+        returned = perf_counter()
+
+        if self._ret_plan is not None and self.bind_checker.config.ret_validation:
+            try:
+                result = self._check_return(result, binds)
+            except ValidationError as e:
+                metrics.failed(e, checked - start + perf_counter() - returned)
+                raise
+
+        metrics.record(checked - start, returned - checked, perf_counter() - returned)
+        return result
+
+    async def _checked_result(self, coro, binds, measured: tuple = None):
+        """Await a coroutine of the validated function and check its result.
+
+        Measured calls pass their metrics, when they started and when their arguments were
+        checked, the call is recorded once the coroutine returns.
+        """
+        result = await coro
+        if measured is None:
+            return self._check_returned(result, binds)
+
+        metrics, start, checked = measured
+        returned = perf_counter()
+        if self._ret_plan is not None and self.bind_checker.config.ret_validation:
+            try:
+                result = self._check_returned(result, binds)
+            except ValidationError as e:
+                metrics.failed(e, checked - start + perf_counter() - returned)
+                raise
+
+        metrics.record(checked - start, returned - checked, perf_counter() - returned)
+        return result
+
+    def _wrap_streams(self, args: tuple, kwargs: dict, binds):
+        """Replace stream arguments with wrappers checking them as they're consumed."""
+        spec, streams = self.argspec, self._streams
+
+        args = list(args)
+        for i, arg in enumerate(args):
+            name = spec.args[i] if i < self._nparams else spec.varargs
+            if (wrap := streams.get(name)) is not None:
+                args[i] = wrap(arg, binds)
+
+        for name, arg in kwargs.items():
+            param = name if name in self._kw_plan else spec.varkw
+            if (wrap := streams.get(param)) is not None:
+                kwargs[name] = wrap(arg, binds)
+
+        return args, kwargs
+
+    def validate_batch(self, rows: Iterable, errors: bool = False) -> list:
+        """Check the arguments of many calls at once, without calling the function.
+
+        Each row is a tuple of positional arguments or a dict of keyword arguments. The
+        rows are checked column by column, so a column of scalars is checked in one pass.
+        Returns a pass/fail mask, or with `errors` each row's first ValidationError or None.
+        """
+        rows = list(rows)
+        failures = [None] * len(rows)
+
+        if not self.bind_checker.config.disabled and rows:
+            if self._needs_binds:
+                binds = [self.bind_checker.new_bindings() for _ in rows]
+            else:
+                binds = [None] * len(rows)
+
+            positional, keyword = [], {}
+            for r, row in enumerate(rows):
+                if isinstance(row, dict):
+                    for name, arg in row.items():
+                        keyword.setdefault(name, ([], []))
+                        keyword[name][0].append(r)
+                        keyword[name][1].append(arg)
+                else:
+                    positional.append((r, row))
+
+            self._check_positional_columns(positional, binds, failures)
+
+            kw_plan, varkw_plan = self._kw_plan, self._varkw_plan
+            for name, (index, values) in keyword.items():
+                check = kw_plan.get(name, varkw_plan)
+                if check is not None:
+                    bulk_name = name if name in kw_plan else self.argspec.varkw
+                    self._check_column(check, bulk_name, index, values, binds, failures)
+
+        if errors:
+            return [None if f is None else f.exception() for f in failures]
+        return [f is None for f in failures]
+
+    def _check_positional_columns(self, positional, binds, failures):
+        if not positional:
+            return
+
+        spec = self.argspec
+        shortest = min(len(row) for _, row in positional)
+        for i, check in self._pos_plan:
+            if i < shortest:
+                index = [r for r, _ in positional]
+                values = [row[i] for _, row in positional]
+            else:
+                index = [r for r, row in positional if len(row) > i]
+                values = [row[i] for _, row in positional if len(row) > i]
+            self._check_column(check, spec.args[i], index, values, binds, failures)
+
+        if (check := self._varargs_plan) is not None:
+            n = self._nparams
+            index = [r for r, row in positional for _ in row[n:]]
+            values = [arg for _, row in positional for arg in row[n:]]
+            self._check_column(check, spec.varargs, index, values, binds, failures)
+
+    def _check_column(self, check, name, index, values, binds, failures):
+        """Check one parameter's values, recording the first failure of each row."""
+        if not values:
+            return
+
+        bulk = self._bulk_plan.get(name)
+        if bulk is not None and bulk(values):
+            return
+
+        for r, arg in zip(index, values):
+            if failures[r] is None:
+                failures[r] = check(arg, binds[r])
 
     def checking_on(self):
         """Turn type validation on."""
@@ -82,3 +329,51 @@ class TypeValidator:
     def checking_off(self):
         """Turn type validation off."""
         self.bind_checker.config.disabled = True
+
+
+# Builds are rare and quick, one lock for all of them saves making one per function.
+_build_lock = threading.RLock()
+
+
+class LazyTypeValidator(TypeValidator):
+    """A TypeValidator only built on its first call or attribute access, see `defer`.
+
+    Building takes a lock and happens once, the instance then becomes a TypeValidator so
+    later calls don't pay anything for having been lazy. A build that raised is retried.
+    """
+
+    def __init__(self, func: Callable, config=None):
+        # `config` can also be a function making the config, only called by the build
+        self.func, self._config, self._building = func, config, False
+
+        # decided up front, so callers probing for coroutines don't trigger the build
+        self._mark_kind(func)
+
+    def _build(self):
+        with _build_lock:
+            if self.__class__ is not LazyTypeValidator or self._building:
+                return
+
+            self._building = True
+            try:
+                config = self._config() if callable(self._config) else self._config
+                TypeValidator.__init__(self, self.func, config)
+                # published last, only a fully built instance is called without the lock
+                self.__class__ = TypeValidator
+            finally:
+                self._building = False
+
+    def __call__(self, *args, **kwargs):
+        self._build()
+        return TypeValidator.__call__(self, *args, **kwargs)
+
+    def __getattr__(self, name: str):
+        # only reached for attributes the build sets, dunders and markers are just probes
+        if name.startswith("__") or name == "_is_coroutine_marker":
+            raise AttributeError(name)
+
+        self._build()
+        if self.__class__ is LazyTypeValidator:
+            # read by the build itself before it's set
+            raise AttributeError(name)
+        return getattr(self, name)
@@ -1,18 +1,17 @@
-import random
+import asyncio, os, random, sys, time, timeit
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 from cProfile import Profile
 from pstats import SortKey, Stats
 
-from lilvali import validate, validator
+from lilvali import validate, validator, trace
 from lilvali.errors import *
 
 
 def prof_tests_main():
     # Discover and run tests
     loader = unittest.TestLoader()
-    suite = loader.discover(
-        start_dir="path_to_your_tests_directory"
-    )  # Adjust the path as needed
+    suite = loader.discover(start_dir=os.path.dirname(os.path.abspath(__file__)))
     runner = unittest.TextTestRunner()
     runner.run(suite)
 
@@ -35,7 +34,95 @@ def prof_main():
         )
 
 
+def bench_threads(calls=200_000, max_threads=8):
+    """Throughput of a generic validated function across thread counts.
+
+    Bindings are per call, so this needs no locks. On a free-threaded build (3.13t)
+    throughput should scale with the thread count.
+    """
+
+    @validate
+    def f[T: (int, float)](x: T, y: list[T]) -> T:
+        return x
+
+    ys = {int: [1] * 16, float: [1.0] * 16}
+
+    def work(n):
+        for i in range(n):
+            x = i if i & 1 else float(i)
+            assert f(x, ys[type(x)]) == x
+
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"{sys.version.split()[0]} gil={'on' if gil else 'off'} {calls=}")
+
+    threads = 1
+    while threads <= max_threads:
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            start = time.perf_counter()
+            list(pool.map(work, [calls // threads] * threads))
+            elapsed = time.perf_counter() - start
+        print(f"threads={threads:<3} {calls / elapsed:>12,.0f} calls/s")
+        threads *= 2
+
+
+def bench_tracing(number=20_000):
+    """Per-call cost of a large-payload call, bare, without tracing and with a no-op hook."""
+
+    def f(x: int, y: list[int], z: dict[str, list[int]]) -> int:
+        return x
+
+    ys, zs = list(range(1000)), {str(i): [i] for i in range(100)}
+
+    def timed(fn):
+        return min(timeit.repeat(lambda: fn(1, ys, zs), number=number, repeat=3))
+
+    base = timed(f)
+    print(f"{'undecorated':<12} {base / number * 1e6:8.2f}us")
+
+    def report(name, t):
+        print(f"{name:<12} {t / number * 1e6:8.2f}us {t / base:6.1f}x")
+
+    # installing a hook recompiles the plan with instrumentation, removing it strips it.
+    validated = validate(f)
+    report("untraced", timed(validated))
+    hook = trace.add_hook(lambda event: None)
+    report("traced", timed(validated))
+    trace.remove_hook(hook)
+
+
+def bench_async(awaits=100_000):
+    """Per-await overhead of a validated coroutine function on an asyncio event loop."""
+
+    async def f(x: int, y: list[int]) -> int:
+        return x
+
+    ys = list(range(16))
+
+    async def run(fn):
+        start = time.perf_counter()
+        for i in range(awaits):
+            await fn(i, ys)
+        return time.perf_counter() - start
+
+    base = min(asyncio.run(run(f)) for _ in range(3))
+    print(f"{'undecorated':<12} {base / awaits * 1e6:8.2f}us")
+
+    validated = validate(f)
+    t = min(asyncio.run(run(validated)) for _ in range(3))
+    print(
+        f"{'validated':<12} {t / awaits * 1e6:8.2f}us {t / base:6.1f}x "
+        f"(+{(t - base) / awaits * 1e6:.2f}us per await)"
+    )
+
+
 def main():
+    if sys.argv[1:2] == ["threads"]:
+        return bench_threads()
+    if sys.argv[1:2] == ["tracing"]:
+        return bench_tracing()
+    if sys.argv[1:2] == ["async"]:
+        return bench_async()
+
     profiler = Profile()
 
     profiler.runcall(prof_main)
@@ -0,0 +1,92 @@
+import asyncio, inspect, unittest
+
+import lilvali
+from collections.abc import AsyncGenerator, AsyncIterator
+from contextlib import asynccontextmanager
+
+from lilvali import validate
+from lilvali.errors import *
+
+
+class TestAsync(unittest.IsolatedAsyncioTestCase):
+    async def test_coroutine_function(self):
+        @validate
+        async def double(x: int) -> int:
+            await asyncio.sleep(0)
+            return x * 2
+
+        self.assertTrue(inspect.iscoroutinefunction(double))
+        self.assertTrue(asyncio.iscoroutinefunction(double))
+        self.assertEqual(await double(2), 4)
+
+        # arguments are rejected before anything is scheduled
+        with self.assertRaises(ValidationError):
+            double("2")
+
+        # the awaited result is checked, not the coroutine object
+        @validate
+        async def bad_result() -> int:
+            return "nope"
+
+        with self.assertRaises(ValidationError):
+            await bad_result()
+
+    async def test_async_generator(self):
+        @validate
+        async def count(n: int) -> AsyncGenerator[int, None]:
+            for i in range(n):
+                yield i
+            yield "done"
+
+        seen = []
+        with self.assertRaises(ValidationError):
+            async for i in count(3):
+                seen.append(i)
+        self.assertEqual(seen, [0, 1, 2])
+
+    async def test_async_iterator_argument(self):
+        async def numbers():
+            yield 1
+            yield "2"
+
+        @validate
+        async def total(xs: AsyncIterator[int]) -> int:
+            return sum([x async for x in xs])
+
+        with self.assertRaises(ValidationError):
+            await total(numbers())
+        with self.assertRaises(InvalidType):
+            await total([1, 2])
+
+    async def test_async_generator_as_iterator(self):
+        closed = []
+
+        @validate
+        async def resource(n: int) -> AsyncIterator[int]:
+            try:
+                yield n
+            finally:
+                closed.append(n)
+
+        self.assertTrue(inspect.isasyncgenfunction(resource))
+        self.assertFalse(inspect.iscoroutinefunction(resource))
+
+        managed = asynccontextmanager(resource)
+        async with managed(1) as r:
+            self.assertEqual(r, 1)
+        # exceptions in the block are thrown into the generator, not lost
+        with self.assertRaises(KeyError):
+            async with managed(2):
+                raise KeyError("in the block")
+        self.assertEqual(closed, [1, 2])
+
+    async def test_lazy_async_generator(self):
+        self.addCleanup(lilvali.defer, lilvali.deferred())
+        lilvali.defer()
+
+        @validate
+        async def numbers() -> AsyncIterator[int]:
+            yield 1
+
+        self.assertTrue(inspect.isasyncgenfunction(numbers))
+        self.assertEqual([n async for n in numbers()], [1])
@@ -0,0 +1,70 @@
+import unittest
+
+from lilvali import validate, validator
+from lilvali.errors import *
+
+
+class TestValidateBatch(unittest.TestCase):
+    def test_mask(self):
+        calls = []
+
+        @validate
+        def func(a: int, b: list[str], *rest: float, **extra: bool):
+            calls.append(a)
+
+        rows = [
+            (1, ["x"]),
+            ("1", ["x"]),
+            (2, ["x", 3]),
+            (3, [], 1.0, 2.0),
+            (4, [], 1.0, "2"),
+            {"a": 5, "b": ["y"], "flag": True},
+            {"b": ["y"], "a": 6, "flag": 1},
+            {"a": 7, "b": []},
+        ]
+        self.assertEqual(
+            func.validate_batch(rows),
+            [True, False, False, True, False, True, False, True],
+        )
+        self.assertEqual(calls, [])
+
+        # every row's verdict matches the one a call would have reached
+        for row, ok in zip(rows, func.validate_batch(rows)):
+            with self.subTest(row=row):
+                if ok:
+                    func(**row) if isinstance(row, dict) else func(*row)
+                else:
+                    with self.assertRaises(ValidationError):
+                        func(**row) if isinstance(row, dict) else func(*row)
+
+    def test_errors(self):
+        @validate
+        def func(a: int, b: str):
+            pass
+
+        errors = func.validate_batch([(1, "a"), (1, 2), ("a", 2)], errors=True)
+        self.assertIsNone(errors[0])
+        self.assertIsInstance(errors[1], InvalidType)
+        self.assertIn("arg=2", str(errors[1]))
+        # the first failing column is reported
+        self.assertIn("arg='a'", str(errors[2]))
+
+    def test_generics_per_row(self):
+        @validate
+        def func[T](a: T, b: T):
+            pass
+
+        self.assertEqual(
+            func.validate_batch([(1, 2), (1, "2"), ("1", "2")]), [True, False, True]
+        )
+
+    def test_custom_validators(self):
+        @validator
+        def positive(value):
+            return value > 0
+
+        @validate
+        def func(a: positive):
+            pass
+
+        self.assertEqual(func.validate_batch([(1,), (-1,), (2,)]), [True, False, True])
@@ -0,0 +1,46 @@
+import json, os, tempfile, unittest
+from contextlib import redirect_stdout
+from io import StringIO
+
+from lilvali import bench
+from lilvali.__main__ import main
+
+
+class TestBench(unittest.TestCase):
+    def test_run(self):
+        report = bench.run(["scalar", "dataclass"], number=5, repeat=1)
+        self.assertEqual(list(report["results"]), ["scalar", "dataclass"])
+        for result in report["results"].values():
+            self.assertGreater(result["validated"], 0)
+            self.assertAlmostEqual(
+                result["overhead"], result["validated"] / result["plain"]
+            )
+
+    def test_compare(self):
+        def report(overhead):
+            return {"results": {"a": {"overhead": overhead}}}
+
+        self.assertEqual(bench.compare(report(11.0), report(10.0)), {})
+        self.assertEqual(bench.compare(report(13.0), report(10.0)), {"a": (10.0, 13.0)})
+        self.assertEqual(bench.compare(report(13.0), {"results": {}}), {})
+
+    def test_cli(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "bench.json")
+            argv = ["bench", "scalar", "--number", "5", "--repeat", "1"]
+
+            with redirect_stdout(StringIO()):
+                self.assertEqual(main(argv + ["--json", path]), 0)
+            with open(path) as f:
+                self.assertIn("scalar", json.load(f)["results"])
+
+            with redirect_stdout(StringIO()):
+                self.assertEqual(
+                    main(argv + ["--baseline", path, "--tolerance", "1e9"]), 0
+                )
+                self.assertEqual(main(["bench", "nope"]), 2)
+
+    def test_bare_command(self):
+        with redirect_stdout(StringIO()) as out:
+            self.assertEqual(main([]), 0)
+        self.assertIn("bench", out.getvalue())
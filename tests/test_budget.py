@@ -0,0 +1,63 @@
+import unittest
+
+from lilvali import validate, validator
+from lilvali.errors import *
+
+
+class TestElementBudget(unittest.TestCase):
+    def setUp(self):
+        self.seen = 0
+
+        @validator
+        def counted(arg):
+            self.seen += 1
+            return isinstance(arg, int)
+
+        self.counted = counted
+
+    def test_max_elements(self):
+        @validate(config={"max_elements": 100})
+        def func(a: list[self.counted]):
+            return len(a)
+
+        self.assertEqual(func(list(range(100_000))), 100_000)
+        self.assertLessEqual(self.seen, 100)
+
+        # systematically wrong payloads are still caught
+        with self.assertRaises(ValidationError):
+            func(["a"] * 100_000)
+
+    def test_sample_rate(self):
+        for mode in ("stride", "random"):
+            self.seen = 0
+
+            @validate(config={"sample_rate": 0.01, "sample_mode": mode})
+            def func(a: dict[str, self.counted], b: set[int]):
+                return len(a)
+
+            self.assertEqual(func({str(i): i for i in range(10_000)}, {1, 2}), 10_000)
+            self.assertLessEqual(self.seen, 101)
+
+            with self.assertRaises(ValidationError):
+                func({str(i): str(i) for i in range(10_000)}, {1, 2})
+            with self.assertRaises(ValidationError):
+                func({}, {str(i) for i in range(10_000)})
+
+    def test_time_budget(self):
+        @validate(config={"time_budget": 0.0})
+        def func(a: list[self.counted]):
+            return len(a)
+
+        self.assertEqual(func(list(range(1_000_000))), 1_000_000)
+        self.assertLess(self.seen, 2_000)
+
+        # small containers are still fully checked within the budget
+        with self.assertRaises(ValidationError):
+            func([1, 2, "3"])
+
+    def test_bad_sample_mode(self):
+        with self.assertRaises(ValueError):
+
+            @validate(config={"sample_mode": "bogus", "max_elements": 1})
+            def func(a: list[int]):  # pragma: no cover
+                return a
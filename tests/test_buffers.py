@@ -0,0 +1,175 @@
+import math, unittest
+from array import array
+from collections.abc import Buffer
+from typing import Annotated
+
+from lilvali import validate, Format, Shape, Range
+from lilvali.binding import buffers
+from lilvali.errors import *
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def grid(rows: int, cols: int, fmt: str = "d") -> memoryview:
+    size = array(fmt).itemsize
+    return (
+        memoryview(array(fmt, bytes(size * rows * cols)))
+        .cast("B")
+        .cast(fmt, (rows, cols))
+    )
+
+
+class TestBuffers(unittest.TestCase):
+    def test_format_and_shape(self):
+        @validate
+        def centroid(points: Annotated[memoryview, Format("d"), Shape(..., 3)]):
+            return points.shape
+
+        self.assertEqual(centroid(grid(4, 3)), (4, 3))
+        self.assertEqual(centroid(memoryview(array("d", [1.0, 2.0, 3.0]))), (3,))
+
+        with self.assertRaisesRegex(InvalidType, "format f"):
+            centroid(grid(4, 3, "f"))
+        with self.assertRaisesRegex(InvalidType, r"shape \(3, 4\)"):
+            centroid(grid(3, 4))
+        with self.assertRaises(InvalidType):
+            centroid(b"abc")
+
+    def test_any_buffer(self):
+        @validate
+        def pixels(data: Annotated[Buffer, Format("B", "b"), Shape(None)]):
+            return len(data)
+
+        for data in (b"abc", bytearray(3), memoryview(b"abc"), array("b", [1, 2, 3])):
+            with self.subTest(data=data):
+                self.assertEqual(pixels(data), 3)
+
+        with self.assertRaises(InvalidType):
+            pixels(array("i", [1]))
+        with self.assertRaises(InvalidType):
+            pixels(grid(2, 2, "B"))
+        with self.assertRaises(ValidationError):
+            pixels([1, 2, 3])
+
+    def test_shapes(self):
+        for dims, valid, invalid in (
+            ((..., 3), [(3,), (10, 3), (2, 5, 3)], [(), (3, 4), (4,)]),
+            ((None, 2), [(0, 2), (9, 2)], [(2,), (2, 2, 2), (2, 3)]),
+            ((2, ..., None, 4), [(2, 1, 4), (2, 9, 9, 1, 4)], [(2, 4), (3, 1, 4)]),
+            ((), [()], [(1,)]),
+        ):
+            shape = Shape(*dims)
+            for s in valid:
+                self.assertIsNone(shape.failure(b"", "B", s), f"{shape} {s}")
+            for s in invalid:
+                self.assertIsNotNone(shape.failure(b"", "B", s), f"{shape} {s}")
+
+        for dims in ((-1,), (..., ...), ("3",)):
+            with self.assertRaises(ValueError):
+                Shape(*dims)
+
+    def test_range(self):
+        @validate
+        def weights(w: Annotated[Buffer, Range(0, 1)]):
+            return w
+
+        weights(array("d", [0.0, 0.5, 1.0]))
+        weights(array("d"))
+        weights(grid(3, 2))
+        weights(bytes([0, 1]))
+
+        for w in (
+            array("d", [0.5, 1.5]),
+            array("b", [-1]),
+            array("d", [0.5, math.nan]),
+        ):
+            with self.subTest(w=w):
+                with self.assertRaises(ValidationError):
+                    weights(w)
+
+        # not contiguous, its elements are gathered
+        strided = memoryview(array("d", [0.0, 2.0] * 4))[::2]
+        weights(strided)
+        with self.assertRaises(ValidationError):
+            weights(memoryview(array("d", [0.0, 2.0] * 4))[1::2])
+
+    def test_other_metadata(self):
+        @validate
+        def ident(a: Annotated[int, "an id"], b: Annotated[list[int], "ids"] = ()):
+            return a
+
+        self.assertEqual(ident(1, [2]), 1)
+        with self.assertRaises(InvalidType):
+            ident("1")
+        with self.assertRaises(ValidationError):
+            ident(1, ["2"])
+
+    def test_engines(self):
+        ann = list[Annotated[bytes, Shape(2)]] | None
+
+        @validate
+        def plain(a: ann):
+            return a
+
+        @validate(config={"iterative": True})
+        def iterative(a: ann):
+            return a
+
+        for func in (plain, iterative):
+            with self.subTest(func=func):
+                func([b"ab", b"cd"])
+                with self.assertRaises(ValidationError):
+                    func([b"ab", b"c"])
+
+    def test_equality(self):
+        self.assertEqual(Format("d"), Format("d"))
+        self.assertNotEqual(Format("d"), Format("f"))
+        self.assertEqual(hash(Shape(..., 3)), hash(Shape(..., 3)))
+        self.assertEqual(repr(Shape(..., 3)), "Shape(..., 3)")
+        self.assertEqual(Annotated[bytes, Range(0, 1)], Annotated[bytes, Range(0, 1)])
+
+
+@unittest.skipIf(np is None, "NumPy isn't installed")
+class TestArrays(unittest.TestCase):
+    def test_dtype_and_shape(self):
+        @validate
+        def blend(
+            image: Annotated[np.ndarray, Format("float32"), Shape(None, None, 3)]
+        ):
+            return image.shape
+
+        self.assertEqual(blend(np.zeros((4, 5, 3), np.float32)), (4, 5, 3))
+        with self.assertRaises(InvalidType):
+            blend(np.zeros((4, 5, 3), np.float64))
+        with self.assertRaises(InvalidType):
+            blend(np.zeros((4, 5), np.float32))
+
+        self.assertIsNone(
+            buffers.buffer_failure((Format(np.int64, "d"),), np.zeros(2, np.int64))
+        )
+
+    def test_vectorized_range(self):
+        @validate
+        def probabilities(p: Annotated[np.ndarray, Format("d"), Range(0, 1)]):
+            return p
+
+        probabilities(np.linspace(0, 1, 1000))
+        probabilities(np.zeros((0, 3)))
+        with self.assertRaises(ValidationError):
+            probabilities(np.array([0.5, 1.5]))
+        with self.assertRaises(ValidationError):
+            probabilities(np.array([0.5, np.nan]))
+
+        # buffers are viewed as arrays, not copied
+        ranged = Annotated[memoryview, Range(0, 10)]
+
+        @validate
+        def view(a: ranged):
+            return a
+
+        view(memoryview(np.arange(10.0)))
+        with self.assertRaises(ValidationError):
+            view(memoryview(np.arange(20.0)).cast("B").cast("d", (4, 5)))
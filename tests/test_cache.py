@@ -0,0 +1,178 @@
+import unittest
+from collections.abc import Sequence, Sized
+from typing import NewType
+
+from lilvali import validate, validator
+from lilvali.binding.cache import VerdictCache, abc_membership, value_key
+from lilvali.errors import *
+
+
+class TestVerdictCache(unittest.TestCase):
+    def test_lru(self):
+        cache = VerdictCache(maxsize=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        self.assertEqual(cache.get("a"), 1)
+
+        # "b" is now the least recently used
+        cache.put("c", 3)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), 3)
+        self.assertEqual(
+            cache.stats(),
+            {"hits": 2, "misses": 1, "evictions": 1, "size": 2, "maxsize": 2},
+        )
+
+    def test_abc_annotations(self):
+        @validate
+        def func(a: Sized):
+            return a
+
+        verdicts = func.bind_checker.verdicts
+        self.assertEqual(func([1]), [1])
+        self.assertEqual(func([1, 2]), [1, 2])
+        self.assertEqual((verdicts.hits, verdicts.misses), (1, 1))
+        with self.assertRaises(InvalidType):
+            func(1)
+
+        # registering a virtual subclass changes the answer, the cache must notice
+        class Thing:
+            pass
+
+        with self.assertRaises(InvalidType):
+            func(Thing())
+        Sized.register(Thing)
+        self.assertIsInstance(func(Thing()), Thing)
+
+    def test_reference_check_invalidation(self):
+        @validate
+        def func(a: NewType("Id", int)):
+            return a
+
+        checker = func.bind_checker
+        checker.check(int, 1)
+        checker.check(int, 2)
+        self.assertEqual(checker.verdicts.stats()["size"], 1)
+        self.assertEqual(checker.verdicts.hits, 1)
+
+        checker.register_custom_validator(int, lambda v: v > 0)
+        self.assertEqual(checker.verdicts.stats()["size"], 0)
+        with self.assertRaises(ValidationError):
+            checker.check(int, -1)
+        with self.assertRaises(ValidationError):
+            func(-1)
+
+        func.bind_checker.config.verdict_cache_size = 0
+        checker.check(int, 1)
+        self.assertEqual(checker.verdicts.stats()["size"], 0)
+
+
+class TestAbcMembership(unittest.TestCase):
+    def test_members_by_class(self):
+        class Items:
+            def __len__(self):
+                return 0
+
+            def __getitem__(self, i):
+                raise IndexError(i)
+
+        membership = abc_membership(Sequence)
+        self.assertIs(membership, abc_membership(Sequence))
+
+        self.assertTrue(membership([1]))
+        self.assertTrue(membership((1,)))
+        self.assertFalse(membership({1}))
+        self.assertIs(membership.members[list], True)
+        self.assertIs(membership.members[set], False)
+
+        @validate
+        def func(a: Sequence[int]):
+            return a
+
+        self.assertEqual(func([1]), [1])
+        with self.assertRaises(InvalidType):
+            func(Items())
+
+        # registering a virtual subclass drops the classes known not to be members
+        Sequence.register(Items)
+        self.assertIsInstance(func(Items()), Items)
+        self.assertIs(membership.members[Items], True)
+        self.assertIs(membership.members[list], True)
+
+    def test_union_candidates(self):
+        class Items:
+            def __len__(self):
+                return 0
+
+            def __getitem__(self, i):
+                raise IndexError(i)
+
+        @validate
+        def plain(a: Sequence[int] | None):
+            return a
+
+        @validate(config={"iterative": True})
+        def iterative(a: Sequence[int] | None):
+            return a
+
+        for func in (plain, iterative):
+            with self.assertRaises(ValidationError):
+                func(Items())
+
+        # the members an argument's class could bind to are looked up again
+        Sequence.register(Items)
+        for func in (plain, iterative):
+            with self.subTest(func=func):
+                self.assertIsInstance(func(Items()), Items)
+                self.assertIsNone(func(None))
+
+
+class TestValueCache(unittest.TestCase):
+    def test_value_key(self):
+        self.assertNotEqual(value_key(1), value_key(True))
+        self.assertNotEqual(value_key((1, "a")), value_key((True, "a")))
+        self.assertEqual(value_key(frozenset({1, 2})), value_key(frozenset({2, 1})))
+        for unkeyed in (1.0, [1], (1, [2]), object()):
+            self.assertIsNone(value_key(unkeyed))
+
+    def test_repeated_values(self):
+        calls = []
+
+        @validator
+        def known(arg):
+            calls.append(arg)
+            return arg in ("a", "b")
+
+        @validate(config={"value_cache_size": 2})
+        def func(key: known, ids: tuple[int, int] | None = None):
+            return key
+
+        values = func.bind_checker.values
+        for _ in range(3):
+            self.assertEqual(func("a", (1, 2)), "a")
+        self.assertEqual(calls, ["a"])
+        self.assertEqual((values.hits, values.misses), (4, 2))
+
+        # failures are checked every time
+        for _ in range(2):
+            with self.assertRaises(ValidationError):
+                func("c")
+        self.assertEqual(calls, ["a", "c", "c"])
+
+        func("b")
+        self.assertEqual(values.stats()["evictions"], 1)
+
+        func.bind_checker.config.value_cache_size = 0
+        func("a")
+        self.assertEqual(calls[-1], "a")
+        self.assertEqual(values.stats()["size"], 0)
+
+    def test_generics_not_cached(self):
+        @validate(config={"value_cache_size": 16})
+        def func[T](a: T, b: T) -> T:
+            return a
+
+        self.assertEqual(func(1, 2), 1)
+        with self.assertRaises(BindingError):
+            func(1, "2")
+        self.assertEqual(func.bind_checker.values.stats()["size"], 0)
@@ -64,6 +64,93 @@ class TestValidateTypes(unittest.TestCase):
     def test_not_dataclass(self):
         self.assertEqual(NotADC(1, "hello").x, 1)
 
+    def test_generated_init(self):
+        a, b = SomeClass(1), SomeClass(2)
+        # the generated __init__ binds to the instance, not the class
+        self.assertEqual((a.x, b.x), (1, 2))
+        self.assertNotIn("x", vars(SomeClass))
+        self.assertEqual(NotADC(1, "hello").y, "hello")
+        with self.assertRaises(ValidationError):
+            NotADC(1, "herro")
+
+        @validate
+        class Options:
+            def __init__(self, name: str, /, *tags: str, limit: int = 1, **extra: bool):
+                self.name, self.tags, self.limit, self.extra = name, tags, limit, extra
+
+        o = Options("a", "b", "c", limit=2, flag=True)
+        self.assertEqual(
+            (o.name, o.tags, o.limit, o.extra), ("a", ("b", "c"), 2, {"flag": True})
+        )
+        for args, kwargs in (
+            ((1,), {}),
+            (("a", 2), {}),
+            (("a",), {"limit": "2"}),
+            (("a",), {"flag": 1}),
+        ):
+            with self.subTest(args=args, kwargs=kwargs):
+                with self.assertRaises(ValidationError):
+                    Options(*args, **kwargs)
+
+    def test_generated_init_recompiles(self):
+        @validate
+        @dataclass
+        class Point:
+            x: int
+            y: int
+
+        init = Point.__init__
+        Point.__init__.bind_checker.register_custom_validator(int, lambda v: v >= 0)
+        self.assertIs(Point.__init__, init)
+        self.assertEqual(Point(1, 2).y, 2)
+        with self.assertRaises(ValidationError):
+            Point(1, -2)
+
+        Point.__init__.bind_checker.config.disabled = True
+        self.assertEqual(Point(1, -2).y, -2)
+
+    def test_defaults_are_not_checked(self):
+        @validate
+        @dataclass
+        class Record:
+            id: int
+            tags: list[str] = field(default_factory=list)
+
+        self.assertEqual(Record(1).tags, [])
+        self.assertEqual(Record(1, ["a"]).tags, ["a"])
+        with self.assertRaises(ValidationError):
+            Record(1, [2])
+
+        @validate
+        class Node:
+            def __init__(self, x: int = None, *, y: str = None):
+                self.x, self.y = x, y
+
+        self.assertIsNone(Node().x)
+        self.assertEqual(Node(1, y="y").y, "y")
+        with self.assertRaises(InvalidType):
+            Node("1")
+        with self.assertRaises(InvalidType):
+            Node(y=2)
+
+    def test_toggles_and_metrics(self):
+        @validate(config={"metrics": True})
+        class Point:
+            def __init__(self, x: int):
+                self.x = x
+
+        Point(1)
+        with self.assertRaises(InvalidType):
+            Point("1")
+        stats = Point.__init__.metrics.snapshot()
+        self.assertEqual((stats["calls"], stats["failures"]), (2, {"InvalidType": 1}))
+
+        Point.__init__.checking_off()
+        self.assertEqual(Point("1").x, "1")
+        Point.__init__.checking_on()
+        with self.assertRaises(InvalidType):
+            Point("1")
+
 
 def main():
     import pdb
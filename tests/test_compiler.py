@@ -0,0 +1,281 @@
+""" unittest to check that compiled checker plans behave exactly like the reference `check` overloads."""
+import unittest
+from array import array
+from collections import deque
+from collections.abc import (
+    Collection,
+    Container,
+    Iterable,
+    Iterator,
+    Mapping,
+    MutableSequence,
+    Sequence,
+)
+from typing import (
+    Annotated,
+    Any,
+    Callable,
+    List,
+    Literal,
+    Mapping as TypingMapping,
+    NewType,
+    Optional,
+    TypedDict,
+    TypeVar,
+    TypeVarTuple,
+    Union,
+)
+
+from lilvali import validate, validator, Format, Shape, Range
+from lilvali.binding import BindCheckerConfig, Failure, raise_failure
+from lilvali.validate import ValidationBindChecker
+from lilvali.errors import *
+
+
+T = TypeVar("T")
+N = TypeVar("N", int, float)
+UserId = NewType("UserId", int)
+
+
+type Tree = list[Tree] | int
+
+
+class Person(TypedDict):
+    name: str
+    age: int
+
+
+def typed_cb(a: int) -> str:
+    return str(a)
+
+
+is_even = validator(lambda arg: arg % 2 == 0)
+has_c_or_int = validator(lambda arg: "c" in arg, base=int)
+
+ANNOTATIONS = [
+    int,
+    str,
+    float,
+    bool,
+    type,
+    UserId,
+    Any,
+    Optional[int],
+    Union[int, str],
+    int | list[int],
+    int | str | bytes | None | list[int] | dict[str, int],
+    dict[T, int] | dict[str, str],
+    list[T] | T,
+    list[int],
+    List[List[int]],
+    list[T],
+    set[int],
+    set[N],
+    dict[str, int],
+    dict[T, N],
+    tuple[int, str],
+    tuple[int, ...],
+    tuple[T, ...],
+    Sequence[int],
+    Sequence[T],
+    MutableSequence[int],
+    Collection[list[int]],
+    Container[int],
+    Mapping[str, int],
+    TypingMapping[T, N],
+    frozenset[int],
+    deque[N],
+    List,
+    (T, N),
+    [T],
+    Person,
+    Tree,
+    dict[str, Tree] | None,
+    Literal["a", 1],
+    Callable[[int], str],
+    Iterable[int],
+    Iterator[T],
+    N,
+    T,
+    is_even,
+    has_c_or_int,
+    is_even & has_c_or_int,
+    Annotated[int, "meta"],
+    Annotated[list[T], "meta"],
+    Annotated[bytes | memoryview, Format("B"), Shape(2)],
+    Annotated[object, Format("d"), Range(0, 1)],
+]
+
+VALUES = [
+    1,
+    -2,
+    1.5,
+    "a",
+    "c",
+    True,
+    None,
+    int,
+    [1, 2],
+    [1, "a"],
+    [[1], [2, 3]],
+    [[1], ["a"]],
+    [[[1]], 2, [[["a"]]]],
+    {1, 2},
+    {1, 2.0},
+    frozenset({1, 2}),
+    deque([1, 2.0]),
+    range(3),
+    {"a": 1},
+    {"a": 1.0},
+    {1: 2, 3: 4.0},
+    {"name": "x", "age": 3},
+    {"name": "x", "age": "3"},
+    (1, "a"),
+    (1, 2),
+    (1, 2, 3),
+    b"ab",
+    memoryview(array("d", [0.5, 1.5])),
+    iter([1, "a"]),
+    typed_cb,
+    lambda x: x,
+]
+
+
+def outcome(fn):
+    try:
+        fn()
+    except Exception as e:
+        return type(e), str(e)
+    return None
+
+
+class TestCompiledPlans(unittest.TestCase):
+    def assertSameAsReference(self, checker, ann, value):
+        ref_binds = checker.new_bindings()
+        expected = outcome(lambda: checker.check(ann, value, ref_binds))
+
+        plan, binds = checker.compile(ann), checker.new_bindings()
+        actual = outcome(lambda: raise_failure(plan(value, binds)))
+
+        ref_binds, binds = ref_binds.bound(), binds.bound()
+
+        self.assertEqual(actual, expected, f"{ann=} {value=}")
+        self.assertEqual(binds, ref_binds, f"{ann=} {value=}")
+
+    def test_matches_reference(self):
+        for config in (
+            BindCheckerConfig(),
+            BindCheckerConfig(strict=False, implied_lambdas=True),
+            BindCheckerConfig(performance=True),
+            BindCheckerConfig(ignore_generics=True, use_custom_validators=False),
+        ):
+            checker = ValidationBindChecker(config=config)
+            checker.register_custom_validator(int, lambda v: v >= 0)
+
+            for ann in ANNOTATIONS:
+                for value in VALUES:
+                    with self.subTest(config=config, ann=ann, value=value):
+                        self.assertSameAsReference(checker, ann, value)
+
+    def test_failures_are_returned(self):
+        checker = ValidationBindChecker()
+        plan = checker.compile(int | list[str] | Literal["x"])
+
+        self.assertIsNone(plan([], checker.new_bindings()))
+        failure = plan(["a", 1], checker.new_bindings())
+        self.assertIsInstance(failure, Failure)
+        self.assertIsInstance(failure.exception(), ValidationError)
+
+        # exceptions raised by user validators are kept as they are
+        error = ValidationError("nope")
+
+        @validator
+        def refuse(value):
+            raise error
+
+        checker.register_custom_validator(str, refuse)
+        self.assertIs(checker.compile(str)("a", None).exception(), error)
+
+    def test_recompiles_on_new_rules(self):
+        @validate
+        def func(a: int) -> int:
+            return a
+
+        self.assertEqual(func(-1), -1)
+
+        func.bind_checker.register_custom_validator(int, lambda v: v >= 0)
+        with self.assertRaises(ValidationError):
+            func(-1)
+
+        @validate
+        def func2(a: list[int]):
+            return a
+
+        with self.assertRaises(ValidationError):
+            func2([1, "a"])
+
+        func2.bind_checker.config.no_list_check = True
+        self.assertEqual(func2([1, "a"]), [1, "a"])
+
+    def test_legacy_handlers(self):
+        class Above:
+            def __init__(self, bound):
+                self.bound = bound
+
+        def above(checker, ann, arg):
+            if arg <= ann.bound:
+                raise ValidationError(f"{arg} is not above {ann.bound}")
+
+        checker = ValidationBindChecker()
+        checker.register_validator(Above, above)
+        checker.check(Above(0), 1)
+        with self.assertRaises(ValidationError):
+            checker.check(Above(0), -1)
+        self.assertIsNone(checker.compile(Above(0))(1, checker.new_bindings()))
+        self.assertIsNotNone(checker.compile(Above(0))(-1, checker.new_bindings()))
+
+    def test_slots_allocated_at_compile_time(self):
+        Ts = TypeVarTuple("Ts")
+        checker = ValidationBindChecker()
+        checker.compile(tuple[*Ts])
+        checker.compile(Annotated[list[Tree | T], "nodes"])
+        self.assertIn(Ts, checker.generic_slots)
+        self.assertIn(T, checker.generic_slots)
+        slots = dict(checker.generic_slots)
+
+        checker.compile(tuple[*Ts])(("a", 1), checker.new_bindings())
+        self.assertEqual(checker.generic_slots, slots)
+
+
+class TestBulkChecks(unittest.TestCase):
+    def test_scalar_containers(self):
+        class MyInt(int):
+            pass
+
+        @validate
+        def func(a: list[int], b: dict[str, float], c: set[UserId]):
+            return len(a)
+
+        payload = list(range(10_000)) + [True, MyInt(3)]
+        self.assertEqual(func(payload, {"a": 1.0}, {1, 2}), 10_002)
+
+        # the bulk pass fails, the per-element check reports the offender
+        with self.assertRaisesRegex(InvalidType, "arg='bad'"):
+            func(payload + ["bad"], {}, set())
+        with self.assertRaisesRegex(InvalidType, "arg=1"):
+            func([], {"a": 1.0, "b": 1}, set())
+        with self.assertRaisesRegex(InvalidType, "arg=2"):
+            func([], {2: 1.0}, set())
+        with self.assertRaisesRegex(InvalidType, "arg=1.5"):
+            func([], {}, {1, 1.5})
+
+    def test_custom_validators_disable_bulk(self):
+        seen = []
+
+        @validate
+        def func(a: list[int]):
+            return a
+
+        func.bind_checker.register_custom_validator(int, seen.append)
+        func([1, 2, 3])
+        self.assertEqual(seen, [1, 2, 3])
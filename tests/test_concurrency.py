@@ -0,0 +1,35 @@
+""" unittest to check that generic bindings are per call, so threads and recursion don't share them."""
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from lilvali import validate
+from lilvali.errors import *
+
+
+class TestBindingContexts(unittest.TestCase):
+    def test_reentrant_call(self):
+        @validate
+        def nest[T](a: T, depth: int) -> T:
+            if depth:
+                # binds T to str for the inner call only
+                nest(str(a), depth - 1)
+            return a
+
+        self.assertEqual(nest(1, 3), 1)
+        self.assertEqual(nest(1.0, 1), 1.0)
+
+    def test_threaded_calls(self):
+        @validate
+        def same[T](a: T, b: list[T]) -> T:
+            return a
+
+        def call(i):
+            # alternate the type T binds to between calls
+            value = i if i % 2 else float(i)
+            return same(value, [value] * 8) == value
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            self.assertTrue(all(pool.map(call, range(2000))))
+
+        with self.assertRaises(ValidationError):
+            same(1, [1.0])
@@ -0,0 +1,136 @@
+import json, unittest
+from unittest import mock
+from dataclasses import dataclass, field
+from typing import Optional, TypedDict
+
+from lilvali import ingest, validate
+from lilvali.errors import *
+
+
+@validate
+@dataclass
+class Tag:
+    name: str
+    weight: float = 1.0
+
+
+@validate
+@dataclass
+class Record:
+    id: int
+    tags: list[Tag]
+    main: Tag | None = None
+
+
+@dataclass
+class Plain:
+    id: int
+    tags: list[str] = field(default_factory=list)
+
+
+@validate
+@dataclass
+class Parent:
+    name: str
+    child: Optional[Tag] = None
+
+
+class Point(TypedDict):
+    x: int
+    y: int
+
+
+class TestIngest(unittest.TestCase):
+    def test_dataclasses(self):
+        payload = json.dumps(
+            [{"id": 1, "tags": [{"name": "a", "weight": 0.5}, {"name": "b"}]}]
+        ).encode()
+
+        records = ingest.loads(memoryview(payload), list[Record])
+        self.assertEqual(records, [Record(1, [Tag("a", 0.5), Tag("b")])])
+
+        record = ingest.loads('{"id": 2, "tags": []}', Record)
+        self.assertEqual(record, Record(2, []))
+
+        # dataclasses without `validate` have their fields checked against their hints
+        self.assertEqual(ingest.loads(b'{"id": 3}', Plain), Plain(3))
+        with self.assertRaises(InvalidType):
+            ingest.loads(b'{"id": 3, "tags": [1]}', Plain)
+
+    def test_containers(self):
+        self.assertEqual(
+            ingest.loads(b'{"a": [1, 2], "b": []}', dict[str, list[int]]),
+            {"a": [1, 2], "b": []},
+        )
+        self.assertEqual(
+            ingest.loads(b' [{"x": 1, "y": 2}] ', list[Point]), [{"x": 1, "y": 2}]
+        )
+        self.assertEqual(ingest.loads(b"[1, 2, 3]", list[int]), [1, 2, 3])
+
+        with self.assertRaises(InvalidType):
+            ingest.loads(b'[{"x": 1, "y": "2"}]', list[Point])
+        with self.assertRaisesRegex(ValidationError, "'z' is not a key of Point"):
+            ingest.loads(b'{"x": 1, "z": 2}', Point)
+        with self.assertRaises(InvalidType):
+            ingest.loads(b"[1, 2, 3.0]", list[int])
+
+    def test_unions(self):
+        self.assertEqual(
+            ingest.loads(b'{"name": "p", "child": {"name": "c"}}', Parent),
+            Parent("p", Tag("c")),
+        )
+        self.assertEqual(ingest.loads(b'{"name": "p"}', Parent), Parent("p"))
+        self.assertEqual(
+            ingest.loads(b'{"name": "p", "child": null}', Parent), Parent("p")
+        )
+        with self.assertRaisesRegex(ValidationError, "failed to bind"):
+            ingest.loads(b'{"name": "p", "child": {"name": 1}}', Parent)
+
+        records = b'[{"id": 1, "tags": [{"name": "a"}]}]'
+        self.assertEqual(
+            ingest.loads(records, list[Record] | None), [Record(1, [Tag("a")])]
+        )
+        self.assertIsNone(ingest.loads(b"null", list[Record] | None))
+        with self.assertRaises(ValidationError):
+            ingest.loads(b'[{"id": "1", "tags": []}]', list[Record] | None)
+
+    def test_failure_path(self):
+        payload = b'[{"id": 1, "tags": []}, {"id": 2, "tags": [{"name": 0}]}, oops'
+        # the invalid record raises before the broken rest of the document is reached
+        with self.assertRaises(InvalidType) as e:
+            ingest.loads(payload, list[Record])
+        self.assertEqual(e.exception.__notes__, ["at $[1]['tags'][0]"])
+
+        with self.assertRaises(InvalidType) as e:
+            ingest.loads(b'{"a": [1], "b": [1, "2"]}', dict[str, list[int]])
+        self.assertEqual(e.exception.__notes__, ["at $['b']"])
+
+        with self.assertRaisesRegex(ValidationError, "missing field 'id'"):
+            ingest.loads(b'[{"tags": []}]', list[Record])
+        with self.assertRaisesRegex(ValidationError, "'nope' is not a field"):
+            ingest.loads(b'{"id": 1, "tags": [], "nope": 1}', Record)
+
+    def test_malformed(self):
+        for payload in (b"[1, 2", b'{"id" 1}', b"[1] 2", b"", b"[1,]"):
+            with self.subTest(payload=payload):
+                with self.assertRaises(json.JSONDecodeError):
+                    ingest.loads(payload, list[int] | dict[str, int])
+
+        record = b'{"id": 1, "tags": []}'
+        for payload in (
+            b"[" + record,
+            b"[" + record + b"] x",
+            b"[" + record + b",]",
+            b" ",
+        ):
+            with self.subTest(payload=payload):
+                with self.assertRaises(json.JSONDecodeError):
+                    ingest.loads(payload, list[Record])
+
+    def test_loaders_are_bounded(self):
+        ingest.loads(b"[1]", list[int])
+        self.assertIn(list[int], ingest._loaders)
+
+        with mock.patch.object(ingest, "_MAX_LOADERS", len(ingest._loaders)):
+            self.assertEqual(ingest.loads(b"[1.5]", list[float]), [1.5])
+        self.assertNotIn(list[float], ingest._loaders)
@@ -0,0 +1,112 @@
+import asyncio, inspect, os, subprocess, sys, threading, unittest
+from unittest import mock
+
+import lilvali
+from lilvali import validate, bench
+from lilvali.errors import *
+from lilvali.validate.validator import LazyTypeValidator, TypeValidator
+
+# the module, `lilvali.validate.validator` is shadowed by the decorator
+validator_module = sys.modules[TypeValidator.__module__]
+
+
+class TestLazy(unittest.TestCase):
+    def setUp(self):
+        self.addCleanup(lilvali.defer, lilvali.deferred())
+        lilvali.defer()
+
+    def test_built_on_first_call(self):
+        @validate
+        def func[T](a: T, b: T) -> T:
+            return a
+
+        self.assertIs(type(func), LazyTypeValidator)
+        self.assertNotIn("bind_checker", vars(func))
+        self.assertEqual(func.__name__, "func")
+
+        self.assertEqual(func(1, 2), 1)
+        self.assertIs(type(func), TypeValidator)
+        with self.assertRaises(ValidationError):
+            func(1, "2")
+
+        @validate(config={"strict": False})
+        def other(a: int):
+            return a
+
+        # attributes set by the build build it as well
+        self.assertFalse(other.bind_checker.config.strict)
+        self.assertIs(type(other), TypeValidator)
+
+    def test_probes_dont_build(self):
+        @validate
+        def func(a: int):
+            return a
+
+        @validate
+        async def coro(a: int):
+            return a
+
+        self.assertFalse(inspect.iscoroutinefunction(func))
+        self.assertTrue(inspect.iscoroutinefunction(coro))
+        self.assertFalse(hasattr(func, "__missing__"))
+        self.assertIs(type(func), LazyTypeValidator)
+        self.assertIs(type(coro), LazyTypeValidator)
+
+        self.assertEqual(asyncio.run(coro(1)), 1)
+        with self.assertRaises(ValidationError):
+            asyncio.run(coro("1"))
+
+    def test_failed_build_is_retried(self):
+        @validate(config={"sample_mode": "bogus", "max_elements": 1})
+        def func(a: list[int]):  # pragma: no cover
+            return a
+
+        for _ in range(2):
+            with self.assertRaises(ValueError):
+                func([1])
+        self.assertIs(type(func), LazyTypeValidator)
+
+    def test_concurrent_first_calls(self):
+        @validate
+        def func(a: int, b: list[str]) -> int:
+            return a
+
+        checkers = []
+        real = validator_module.ValidationBindChecker
+
+        def counted(*args, **kwargs):
+            checkers.append(real(*args, **kwargs))
+            return checkers[-1]
+
+        barrier, results = threading.Barrier(8), []
+
+        def call(i):
+            barrier.wait()
+            results.append(func(i, ["b"]))
+
+        with mock.patch.object(validator_module, "ValidationBindChecker", counted):
+            threads = [threading.Thread(target=call, args=(i,)) for i in range(8)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        self.assertEqual(sorted(results), list(range(8)))
+        self.assertEqual(len(checkers), 1)
+        self.assertIs(func.bind_checker, checkers[0])
+
+    def test_environment(self):
+        code = "import lilvali; print(lilvali.deferred())"
+        env = {**os.environ, "LILVALI_LAZY": "1"}
+        out = subprocess.run(
+            [sys.executable, "-c", code], env=env, capture_output=True, text=True
+        )
+        self.assertEqual(out.stdout.strip(), "True")
+
+    def test_bench_scenario(self):
+        lilvali.defer(False)
+        plain, lazy, args = bench._import(10, lazy=True)()
+        plain(*args)
+        lazy(*args)
+        self.assertFalse(lilvali.deferred())
+        self.assertIn("import[10000,lazy]", bench.SCENARIOS)
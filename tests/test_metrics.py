@@ -0,0 +1,89 @@
+import asyncio, json, os, tempfile, unittest
+from contextlib import redirect_stdout
+from io import StringIO
+
+from lilvali import metrics, validate
+from lilvali.__main__ import main
+from lilvali.errors import *
+
+
+class TestMetrics(unittest.TestCase):
+    def test_counters(self):
+        @validate(config={"metrics": True})
+        def func(a: int) -> int:
+            return a
+
+        self.assertEqual(func(1), 1)
+        with self.assertRaises(InvalidType):
+            func("1")
+
+        stats = func.metrics.snapshot()
+        self.assertEqual(stats["calls"], 2)
+        self.assertEqual(stats["failures"], {"InvalidType": 1})
+        self.assertGreater(stats["validation_time"], 0)
+        self.assertGreater(stats["body_time"], 0)
+        self.assertEqual(set(stats["percentiles"]), {"p50", "p90", "p99"})
+        self.assertIn(func.metrics.name, metrics.snapshot())
+
+    def test_coroutines(self):
+        @validate(config={"metrics": True})
+        async def fetch(a: int) -> str:
+            await asyncio.sleep(0.05)
+            return a
+
+        self.assertEqual(fetch.metrics.calls, 0)
+        with self.assertRaises(InvalidType):
+            asyncio.run(fetch(1))
+        with self.assertRaises(InvalidType):
+            asyncio.run(fetch("1"))
+
+        stats = fetch.metrics.snapshot()
+        self.assertEqual(stats["calls"], 2)
+        self.assertEqual(stats["failures"], {"InvalidType": 2})
+
+        @validate(config={"metrics": True})
+        async def wait(a: int):
+            await asyncio.sleep(0.05)
+            return a
+
+        self.assertEqual(asyncio.run(wait(1)), 1)
+        self.assertEqual(wait.metrics.calls, 1)
+        self.assertGreaterEqual(wait.metrics.body_time, 0.04)
+
+    def test_off_by_default(self):
+        @validate
+        def func(a: int):
+            return a
+
+        self.assertIsNone(func.metrics)
+
+        func.bind_checker.config.metrics = True
+        func(1)
+        self.assertEqual(func.metrics.calls, 1)
+
+        func.bind_checker.config.metrics = False
+        self.assertIsNone(func.metrics)
+
+    def test_stats_command(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            script = os.path.join(tmp, "script.py")
+            with open(script, "w") as f:
+                f.write(
+                    "from lilvali import validate\n"
+                    "@validate\n"
+                    "def work(a: int) -> int:\n"
+                    "    return a\n"
+                    "for i in range(10):\n"
+                    "    work(i)\n"
+                )
+
+            path = os.path.join(tmp, "stats.json")
+            try:
+                with redirect_stdout(StringIO()) as out:
+                    self.assertEqual(main(["stats", "--json", path, script]), 0)
+            finally:
+                metrics.enable(False)
+
+            self.assertIn("__main__.work", out.getvalue())
+            with open(path) as f:
+                self.assertEqual(json.load(f)["__main__.work"]["calls"], 10)
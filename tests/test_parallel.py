@@ -0,0 +1,74 @@
+import threading, unittest
+from typing import TypedDict
+
+from lilvali import validate, validator
+from lilvali.errors import *
+
+
+class Record(TypedDict):
+    name: str
+    tags: list[str]
+
+
+CONFIG = {"parallel_threshold": 100, "parallel_workers": 2}
+
+
+class TestParallel(unittest.TestCase):
+    def test_records(self):
+        @validate(config=CONFIG)
+        def ingest(records: list[Record], index: dict[str, Record]) -> int:
+            return len(records)
+
+        records = [{"name": str(i), "tags": ["a"]} for i in range(1000)]
+        self.assertIsNotNone(ingest.bind_checker.compile(list[Record]))
+        self.assertEqual(ingest(records, {r["name"]: r for r in records}), 1000)
+
+        records[700] = {"name": 700, "tags": []}
+        with self.assertRaises(ValidationError) as ctx:
+            ingest(records, {})
+        self.assertIn("first failing element at index 700", ctx.exception.__notes__)
+
+        # small containers are checked in process
+        with self.assertRaises(ValidationError):
+            ingest(records[700:701], {})
+
+    def test_generic_bindings_merge(self):
+        @validate(config=CONFIG)
+        def pairs[T](first: T, rest: list[list[T]]) -> T:
+            return first
+
+        self.assertEqual(pairs(1, [[i] for i in range(500)]), 1)
+        with self.assertRaises(BindingError):
+            pairs("1", [[i] for i in range(500)])
+
+        mixed = [[i] for i in range(250)] + [[str(i)] for i in range(250)]
+        with self.assertRaises(BindingError):
+            pairs(1, mixed)
+
+    def test_unpicklable_falls_back(self):
+        is_even = validator(lambda arg: arg % 2 == 0)
+
+        @validate(config=CONFIG)
+        def evens(xs: list[is_even]):
+            return len(xs)
+
+        self.assertEqual(evens(list(range(0, 400, 2))), 200)
+        with self.assertRaises(ValidationError):
+            evens(list(range(400)))
+
+    def test_unpicklable_values(self):
+        @validate(config={**CONFIG, "parallel_threshold": 10})
+        def guarded(
+            items: list[dict[str, object]], by_name: dict[str, dict[str, object]]
+        ):
+            return len(items)
+
+        items = [{"lock": threading.Lock()} for _ in range(50)]
+        # the locks can't be sent to a worker, they're checked in process
+        self.assertEqual(guarded(items, {str(i): d for i, d in enumerate(items)}), 50)
+
+        items[30] = {1: threading.Lock()}
+        with self.assertRaises(ValidationError):
+            guarded(items, {})
+        with self.assertRaises(ValidationError):
+            guarded([], {str(i): d for i, d in enumerate(items)})
@@ -0,0 +1,122 @@
+import tracemalloc, unittest
+from collections.abc import Generator, Iterable, Iterator
+from contextlib import contextmanager
+
+from lilvali import validate
+from lilvali.errors import *
+
+
+class TestStreams(unittest.TestCase):
+    def test_iterator_argument(self):
+        @validate
+        def total(xs: Iterator[int]) -> int:
+            return sum(xs)
+
+        self.assertEqual(total(iter(range(10))), 45)
+        with self.assertRaises(InvalidType):
+            total([1, 2])
+
+        # elements are only checked as they're consumed
+        consumed = []
+
+        def gen():
+            for x in (1, 2, "3", 4):
+                consumed.append(x)
+                yield x
+
+        with self.assertRaises(ValidationError):
+            total(gen())
+        self.assertEqual(consumed, [1, 2, "3"])
+
+    def test_iterable_argument(self):
+        @validate
+        def first(xs: Iterable[str]) -> str:
+            return next(iter(xs))
+
+        # collections are checked eagerly and passed as they are
+        self.assertEqual(first(["a", "b"]), "a")
+        with self.assertRaises(ValidationError):
+            first(["a", 1])
+        self.assertEqual(first(c for c in "ab"), "a")
+        with self.assertRaises(ValidationError):
+            first(iter([1]))
+
+    def test_generator_return(self):
+        @validate
+        def echo() -> Generator[int, int | None, str]:
+            received = yield 1
+            while received is not None:
+                received = yield received
+            return "done"
+
+        gen = echo()
+        self.assertEqual(next(gen), 1)
+        self.assertEqual(gen.send(2), 2)
+        with self.assertRaises(ValidationError):
+            gen.send("3")
+        with self.assertRaises(StopIteration) as stop:
+            gen.send(None)
+        self.assertEqual(stop.exception.value, "done")
+
+        @validate
+        def bad_return() -> Generator[int, None, str]:
+            yield 1
+            return 2
+
+        gen = bad_return()
+        next(gen)
+        with self.assertRaises(ValidationError):
+            next(gen)
+
+    def test_generator_as_iterator(self):
+        closed = []
+
+        @contextmanager
+        @validate
+        def resource(n: int) -> Iterator[int]:
+            try:
+                yield n
+            finally:
+                closed.append(n)
+
+        with resource(1) as r:
+            self.assertEqual(r, 1)
+        # exceptions in the block are thrown into the generator, not lost
+        with self.assertRaises(KeyError):
+            with resource(2):
+                raise KeyError("in the block")
+        self.assertEqual(closed, [1, 2])
+
+        @validate
+        def numbers() -> Iterator[int]:
+            yield 1
+            yield "2"
+
+        gen = numbers()
+        self.assertEqual(next(gen), 1)
+        gen.close()
+        with self.assertRaises(ValidationError):
+            list(numbers())
+
+    def test_generic_stream(self):
+        @validate
+        def pairs[T](first: T, rest: Iterator[T]) -> list:
+            return [first, *rest]
+
+        self.assertEqual(pairs(1, iter([2, 3])), [1, 2, 3])
+        with self.assertRaises(BindingError):
+            pairs(1, iter([2, "3"]))
+
+    def test_constant_memory(self):
+        @validate
+        def count[T](xs: Iterator[T]) -> int:
+            return sum(1 for _ in xs)
+
+        count(iter(range(1000)))
+        tracemalloc.start()
+        try:
+            count(iter(range(200_000)))
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self.assertLess(peak, 100_000)
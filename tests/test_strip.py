@@ -0,0 +1,56 @@
+import os, subprocess, sys, unittest
+from dataclasses import dataclass
+
+import lilvali
+from lilvali import validate, validator, bench
+
+
+class TestStrip(unittest.TestCase):
+    def setUp(self):
+        lilvali.strip()
+        self.addCleanup(lilvali.strip, False)
+
+    def test_returns_originals(self):
+        def func(a: int) -> int:
+            return a
+
+        @dataclass
+        class Point:
+            x: int
+
+        init = Point.__init__
+        is_even = lambda arg: arg % 2 == 0
+
+        self.assertIs(validate(func), func)
+        self.assertIs(validate(config={"strict": False})(func), func)
+        self.assertIs(validate(Point), Point)
+        self.assertIs(Point.__init__, init)
+        self.assertIs(validator(is_even), is_even)
+        self.assertIs(validator(base=int)(is_even), is_even)
+
+        self.assertEqual(func("not checked"), "not checked")
+
+    def test_only_later_decorations(self):
+        lilvali.strip(False)
+
+        @validate
+        def func(a: int) -> int:
+            return a
+
+        lilvali.strip()
+        self.assertIsInstance(func, lilvali.TypeValidator)
+        with self.assertRaises(lilvali.errors.ValidationError):
+            func("1")
+
+    def test_environment(self):
+        code = "import lilvali; print(lilvali.stripped())"
+        env = {**os.environ, "LILVALI_STRIP": "1"}
+        out = subprocess.run(
+            [sys.executable, "-c", code], env=env, capture_output=True, text=True
+        )
+        self.assertEqual(out.stdout.strip(), "True")
+
+    def test_bench_scenario(self):
+        plain, stripped, _ = bench.SCENARIOS["stripped"]()
+        self.assertIsNot(stripped, plain)
+        self.assertNotIsInstance(stripped, lilvali.TypeValidator)
@@ -0,0 +1,62 @@
+import gc, unittest
+from dataclasses import dataclass
+
+from lilvali import validate, trace
+from lilvali.errors import *
+
+
+class TestTraceHooks(unittest.TestCase):
+    def test_hooks(self):
+        events = []
+        hook = trace.add_hook(events.append)
+
+        try:
+
+            @validate
+            def func(a: int, b: list[int]) -> int:
+                return a
+
+            self.assertEqual(func(1, [2]), 1)
+            self.assertEqual(
+                [(e.kind, e.param) for e in events],
+                [("check", "a"), ("check", "b"), ("check", "return")],
+            )
+            self.assertEqual(events[1].payload, {"arg": [2]})
+
+            events.clear()
+            with self.assertRaises(ValidationError):
+                func(1, ["2"])
+            self.assertEqual(events[-1].kind, "fail")
+            self.assertIsInstance(events[-1].payload["error"], ValidationError)
+        finally:
+            trace.remove_hook(hook)
+
+        # removing the last hook recompiles the plan without any instrumentation
+        events.clear()
+        self.assertEqual(func(1, [2]), 1)
+        self.assertEqual(events, [])
+        if not trace.enabled():
+            self.assertNotEqual(func._pos_plan[0][1].__name__, "check_traced")
+
+    def test_subscribers_are_dropped(self):
+        gc.collect()
+        before = len(trace._subscribers)
+
+        def make(i):
+            @validate
+            def func(a: int):
+                return a
+
+            @validate
+            @dataclass
+            class Point:
+                x: int
+
+            return func, Point
+
+        validated = [make(i) for i in range(100)]
+        self.assertEqual(len(trace._subscribers), before + 200)
+
+        del validated
+        gc.collect()
+        self.assertEqual(len(trace._subscribers), before)
@@ -1,6 +1,11 @@
+import gc
 import logging
 import os
 import unittest
+import weakref
+from collections import OrderedDict, deque
+from collections.abc import Mapping, Sequence, Set
+from types import MappingProxyType
 
 
 from lilvali.validate import validate, validator
@@ -63,6 +68,22 @@ class TestValidationFunctions(unittest.TestCase):
         with self.assertRaises(ValidationError):
             func(1, 2, "3")
 
+    def test_keyword_arguments(self):
+        @validate
+        def func(a: int, b, *args: int, c: str, d=None, **kwargs: float):
+            return a, b, args, c, d, kwargs
+
+        self.assertEqual(
+            func(1, "x", 2, c="c", e=1.0), (1, "x", (2,), "c", None, {"e": 1.0})
+        )
+        self.assertEqual(func(b=[], a=1, c="c", d=2)[:2], (1, []))
+        with self.assertRaises(ValidationError):
+            func(1, 2, c=3)
+        with self.assertRaises(ValidationError):
+            func(a="1", b=2, c="c")
+        with self.assertRaises(ValidationError):
+            func(1, 2, c="c", e="not a float")
+
     def test_default_arg_func(self):
         @validate
         def default_arg_func[T, U: (int, float)](a: T, b: U = 10) -> U:
@@ -184,6 +205,124 @@ class TestValidationFunctions(unittest.TestCase):
         with self.assertRaises(ValidationError):
             generic_union(10.0)
 
+    def test_generic_union_rollback(self):
+        @validate
+        def rollback[T](a: dict[T, int] | dict[str, str], b: T) -> T:
+            return b
+
+        # the first member binds T to str before failing, that must not leak into b
+        self.assertEqual(rollback({"k": "v"}, 1), 1)
+        self.assertEqual(rollback({"k": 1}, "b"), "b")
+        with self.assertRaises(ValidationError):
+            rollback({"k": 1}, 1)
+
+        @validate
+        def wide(a: int | str | bytes | None | list[int] | dict[str, int]):
+            return a
+
+        for value in (1, "a", b"a", None, [1], {"a": 1}):
+            self.assertEqual(wide(value), value)
+        for value in (1.0, ["a"], {"a": "b"}, {1, 2}):
+            with self.assertRaises(ValidationError):
+                wide(value)
+
+    def test_bindings_hold_types_only(self):
+        class Payload:
+            pass
+
+        @validate
+        def same[T](a: T, b: T) -> T:
+            return a
+
+        payload = Payload()
+        ref = weakref.ref(payload)
+        self.assertIs(same(payload, Payload()), payload)
+        with self.assertRaises(BindingError):
+            same(payload, 1)
+
+        binds = same.bind_checker.new_bindings()
+        self.assertIsNone(binds.bind(same.generics[0], payload))
+        self.assertEqual(binds.bound(), {same.generics[0]: Payload})
+
+        del payload
+        gc.collect()
+        self.assertIsNone(ref())
+
+        @validate
+        def plain(a: int, b: list[str]) -> int:
+            return a
+
+        # nothing can bind, so calls don't get bindings at all
+        self.assertFalse(plain._needs_binds)
+        self.assertTrue(same._needs_binds)
+        self.assertEqual(plain(1, ["a"]), 1)
+
+    def test_abstract_collections(self):
+        @validate
+        def func[T](a: Sequence[T], b: Mapping[str, float], c: Set[int]) -> T:
+            return a[0]
+
+        self.assertEqual(func((1, 2), {"a": 1.0}, frozenset({1})), 1)
+        self.assertEqual(func("ab", MappingProxyType({}), {1: 2}.keys()), "a")
+        self.assertEqual(func(range(1), OrderedDict(a=1.0), {1}), 0)
+        for args in (
+            ([1, "a"], {}, set()),
+            ({1}, {}, set()),
+            ([1], {"a": 1}, set()),
+            ([1], [("a", 1.0)], set()),
+            ([1], {}, [1]),
+        ):
+            with self.assertRaises(ValidationError):
+                func(*args)
+
+        @validate
+        def concrete(a: frozenset[int], b: deque[str]):
+            return a
+
+        self.assertEqual(concrete(frozenset({1}), deque("ab")), {1})
+        for args in (({1}, deque()), (frozenset(), ["a"]), (frozenset(), deque([1]))):
+            with self.assertRaises(ValidationError):
+                concrete(*args)
+
+        # the parameters of user generics aren't known to be elements, like these keys
+        class Registry[V](Mapping[str, V]):
+            def __init__(self, entries):
+                self.entries = entries
+
+            def __getitem__(self, key):
+                return self.entries[key]
+
+            def __iter__(self):
+                return iter(self.entries)
+
+            def __len__(self):
+                return len(self.entries)
+
+        @validate
+        def use(r: Registry[int]):
+            return r
+
+        @validate(config={"iterative": True})
+        def use_iteratively(r: Registry[int]):
+            return r
+
+        for func in (use, use_iteratively):
+            with self.subTest(func=func):
+                self.assertIsInstance(func(Registry({"a": 1})), Registry)
+                with self.assertRaises(ValidationError):
+                    func({"a": 1})
+
+    def test_variadic_tuple(self):
+        @validate
+        def func[T](a: tuple[T, ...], b: tuple[int, ...] = ()) -> T:
+            return a[-1]
+
+        self.assertEqual(func((1, 2, 3)), 3)
+        self.assertEqual(func(("a",), (1, 2)), "a")
+        for args in (((1, "a"),), ([1],), ((1,), (1, "b"))):
+            with self.assertRaises(ValidationError):
+                func(*args)
+
     def test_generic_union_with_constraints(self):
         @validate
         def add[T: (int, float)](x: int, y: T) -> int | float:
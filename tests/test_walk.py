@@ -0,0 +1,96 @@
+import unittest
+
+from lilvali import validate
+from lilvali.binding import BindCheckerConfig
+from lilvali.validate import ValidationBindChecker
+from lilvali.errors import *
+
+from test_compiler import ANNOTATIONS, VALUES
+
+
+type JSON = dict[str, JSON] | list[JSON] | str | int | float | bool | None
+
+
+def verdict(fn):
+    try:
+        failure = fn()
+    except ValidationError:
+        return "fail"
+    except Exception as e:
+        return type(e)
+    return "pass" if failure is None else "fail"
+
+
+class TestWalk(unittest.TestCase):
+    def test_matches_compiled(self):
+        for config in (
+            BindCheckerConfig(),
+            BindCheckerConfig(strict=False, implied_lambdas=True),
+            BindCheckerConfig(performance=True),
+        ):
+            checker = ValidationBindChecker(config=config)
+            checker.register_custom_validator(int, lambda v: v >= 0)
+
+            for ann in ANNOTATIONS:
+                compiled, walked = checker.compile(ann), checker.compile_walk(ann)
+                for value in VALUES:
+                    with self.subTest(config=config, ann=ann, value=value):
+                        binds, walk_binds = (
+                            checker.new_bindings(),
+                            checker.new_bindings(),
+                        )
+                        self.assertEqual(
+                            verdict(lambda: walked(value, walk_binds)),
+                            verdict(lambda: compiled(value, binds)),
+                        )
+                        self.assertEqual(walk_binds.bound(), binds.bound())
+
+    def test_deep_documents(self):
+        def func(doc: JSON):
+            return doc
+
+        iterative = validate(func, config={"iterative": True})
+        recursive = validate(func)
+
+        doc = 1
+        for i in range(10_000):
+            doc = [doc] if i % 2 else {"k": doc}
+        self.assertIs(iterative(doc), doc)
+        with self.assertRaises(RecursionError):
+            recursive(doc)
+
+    def test_failure_path(self):
+        @validate(config={"iterative": True})
+        def func(doc: JSON, pairs: dict[str, list[tuple[int, str]]]):
+            return doc
+
+        with self.assertRaises(ValidationError) as e:
+            func({"a": [1, {"b": [object()]}]}, {})
+        self.assertEqual(e.exception.__notes__, ["at $['a'][1]['b'][0]"])
+
+        with self.assertRaises(InvalidType) as e:
+            func(None, {"x": [(1, "a"), (2, 3)]})
+        self.assertEqual(e.exception.__notes__, ["at $['x'][1][1]"])
+
+        with self.assertRaises(InvalidType) as e:
+            func(None, {1: []})
+        self.assertEqual(e.exception.__notes__, ["at $[<key 1>]"])
+
+        @validate(config={"iterative": True})
+        def rows(a: list[tuple[int, ...]]):
+            return a
+
+        with self.assertRaises(InvalidType) as e:
+            rows([(1, 2), (3, 4, "5")])
+        self.assertEqual(e.exception.__notes__, ["at $[1][2]"])
+
+    def test_generics(self):
+        @validate(config={"iterative": True})
+        def func[T](a: list[dict[str, T]], b: T) -> T:
+            return b
+
+        self.assertEqual(func([{"a": 1}, {"b": 2}], 3), 3)
+        with self.assertRaises(BindingError):
+            func([{"a": 1}, {"b": "2"}], 3)
+        with self.assertRaises(BindingError):
+            func([{"a": 1}], "3")